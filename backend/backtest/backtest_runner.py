@@ -28,6 +28,7 @@ import math
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from backend.data.models import Bar
+from backend.data.frame import BarFrame
 from backend.topology.engine import TopologyEngine
 from backend.predictive.engine import PredictiveEngine
 from backend.signals.engine import SignalsEngine
@@ -379,9 +380,13 @@ class BacktestRunner:
         # Dimensiunea ferestrei minime pentru a începe
         min_window = max(self.config.topology_window, self.config.predictive_window)
         
+        # Conversie columnară o singură dată; ferestrele sunt view-uri în ea,
+        # deci engine-urile nu mai refac BarFrame din List[Bar] la fiecare bară
+        frame = BarFrame.from_bars(bars)
+        
         for i in range(min_window, len(bars)):
             # Fereastră de date
-            window = bars[max(0, i - min_window):i + 1]
+            window = frame.window(max(0, i - min_window), i + 1)
             current_bar = bars[i]
             
             # Calculează snapshot-uri
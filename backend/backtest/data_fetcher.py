@@ -24,7 +24,7 @@ import json
 from pathlib import Path
 
 
-@dataclass
+@dataclass(slots=True)
 class OHLCVBar:
     """Structura bare OHLCV cu delta"""
     timestamp: datetime
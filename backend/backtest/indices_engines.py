@@ -17,12 +17,15 @@ from datetime import datetime, time
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+
 # Importă modelele existente
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from backend.data.models import Bar
+from backend.topology._kernel import rotation_energy_kernel, composite_scores
 from backend.topology.models import TopologySnapshot, VortexMarker
 from backend.predictive.models import PredictiveSnapshot
 from backend.signals.models import Signal
@@ -164,86 +167,38 @@ class IndicesTopologyEngine:
                 vortexes=[]
             )
         
-        returns = []
-        flows = []
-        
-        for i in range(len(bars)):
-            if i == 0:
-                ret = 0.0
-            else:
-                prev_close = bars[i - 1].close
-                ret = 0.0 if prev_close == 0 else (bars[i].close - prev_close) / abs(prev_close)
-            returns.append(ret)
-            
-            if bars[i].volume and bars[i].volume > 0 and bars[i].delta is not None:
-                flow = bars[i].delta / bars[i].volume
-            else:
-                flow = 0.0
-            flows.append(flow)
-        
-        def norm(v):
-            return math.sqrt(v[0] * v[0] + v[1] * v[1])
-        
-        rotations = []
-        energies = []
-        composite_scores = []
-        
-        for k in range(1, len(bars) - 1):
-            v_prev = (returns[k - 1], flows[k - 1])
-            v_next = (returns[k + 1], flows[k + 1])
-            
-            cross = v_prev[0] * v_next[1] - v_prev[1] * v_next[0]
-            denom = norm(v_prev) * norm(v_next)
-            
-            if denom < 1e-9:
-                rot_norm = 0.0
-            else:
-                rot_norm = cross / denom
-            
-            rotations.append(rot_norm)
-            
-            energy_k = abs(returns[k]) * (bars[k].volume or 0.0)
-            energies.append(energy_k)
-            
-            median_energy = sorted(energies)[len(energies)//2] if energies else 1.0
-            if median_energy > 0:
-                normalized_energy = math.sqrt(energy_k / median_energy)
-            else:
-                normalized_energy = 0.0
-            composite_score = abs(rot_norm) * normalized_energy
-            composite_scores.append(composite_score)
+        n = len(bars)
+        closes = np.fromiter((b.close for b in bars), dtype=np.float64, count=n)
+        volumes = np.fromiter((b.volume or 0.0 for b in bars), dtype=np.float64, count=n)
+        deltas = np.fromiter((b.delta or 0.0 for b in bars), dtype=np.float64, count=n)
+        rotations, energies = rotation_energy_kernel(closes, volumes, deltas)
+        m = len(rotations)
         
-        if not rotations:
-            return TopologySnapshot(
-                symbol=symbol,
-                timestamp=bars[-1].timestamp,
-                coherence=0.0,
-                energy=0.0,
-                vortexes=[]
-            )
+        # Aceeași normalizare ca TopologyEngine: mediana energiei pe toată fereastra
+        scores = composite_scores(rotations, energies)
         
-        coherence = sum(abs(r) for r in rotations) / len(rotations)
+        coherence = float(np.abs(rotations).sum()) / m
         
-        sorted_energies = sorted(energies)
-        thr_index = int(self.energy_percentile * len(sorted_energies))
-        thr_index = max(0, min(thr_index, len(sorted_energies) - 1))
-        energy_threshold = sorted_energies[thr_index]
+        thr_index = int(self.energy_percentile * m)
+        thr_index = max(0, min(thr_index, m - 1))
+        energy_threshold = np.partition(energies, thr_index)[thr_index]
         
         vortex_markers = []
-        for k_idx, k in enumerate(range(1, len(bars) - 1)):
-            # Prag mai mic pentru indici
-            if composite_scores[k_idx] >= self.composite_threshold and energies[k_idx] >= energy_threshold:
-                direction = "clockwise" if rotations[k_idx] < 0 else "counterclockwise"
-                marker = VortexMarker(
-                    index=k,
-                    timestamp=bars[k].timestamp,
-                    price=bars[k].close,
-                    strength=abs(rotations[k_idx]),
-                    direction=direction
-                )
-                vortex_markers.append(marker)
+        # Prag mai mic pentru indici
+        vortex_mask = (scores >= self.composite_threshold) & (energies >= energy_threshold)
+        for k_idx in np.flatnonzero(vortex_mask):
+            k = int(k_idx) + 1
+            direction = "clockwise" if rotations[k_idx] < 0 else "counterclockwise"
+            marker = VortexMarker(
+                index=k,
+                timestamp=bars[k].timestamp,
+                price=bars[k].close,
+                strength=float(abs(rotations[k_idx])),
+                direction=direction
+            )
+            vortex_markers.append(marker)
         
-        snapshot_energy = energies[-1] if energies else 0.0
+        snapshot_energy = float(energies[-1])
         
         return TopologySnapshot(
             symbol=symbol,
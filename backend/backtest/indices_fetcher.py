@@ -31,7 +31,7 @@ from pathlib import Path
 import pandas as pd
 
 
-@dataclass
+@dataclass(slots=True)
 class OHLCVBar:
     """Structura bare OHLCV"""
     timestamp: datetime
@@ -0,0 +1,163 @@
+"""
+BarFrame - reprezentare columnară (SoA) a unei ferestre de bare.
+
+Engine-urile citesc coloane NumPy contigue în loc să parcurgă List[Bar]
+atribut cu atribut. Conversia din List[Bar] se face o singură dată, la intrare.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List, Union
+
+import numpy as np
+
+from backend.data.models import Bar
+
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
+
+
+def _epoch_ns(ts: datetime) -> int:
+    """Epoch în nanosecunde (aritmetică întreagă; datetime naiv = UTC)"""
+    epoch = _EPOCH if ts.tzinfo is None else _EPOCH_UTC
+    return (ts - epoch) // _ONE_US * 1000
+
+
+def _column(bars: List[Bar], attr: str) -> np.ndarray:
+    """Coloană float64 dintr-un atribut opțional al barelor (None -> NaN)"""
+    values = (getattr(b, attr) for b in bars)
+    return np.fromiter(
+        (np.nan if v is None else v for v in values), dtype=np.float64, count=len(bars)
+    )
+
+
+@dataclass
+class BarFrame:
+    """Fereastră de bare ca array-uri paralele; câmpurile opționale lipsă sunt NaN"""
+    timestamps: List[datetime]
+    ts: np.ndarray              # int64 epoch-ns, pentru comparații vectorizate
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    buy_volume: np.ndarray
+    sell_volume: np.ndarray
+    delta: np.ndarray
+    effective_delta: np.ndarray
+
+    @classmethod
+    def from_bars(cls, bars: List[Bar]) -> "BarFrame":
+        timestamps = [b.timestamp for b in bars]
+        return cls(
+            timestamps=timestamps,
+            ts=np.fromiter(map(_epoch_ns, timestamps), dtype=np.int64, count=len(bars)),
+            open=_column(bars, "open"),
+            high=_column(bars, "high"),
+            low=_column(bars, "low"),
+            close=_column(bars, "close"),
+            volume=_column(bars, "volume"),
+            buy_volume=_column(bars, "buy_volume"),
+            sell_volume=_column(bars, "sell_volume"),
+            delta=_column(bars, "delta"),
+            effective_delta=_column(bars, "effective_delta"),
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def tail(self, count: int) -> "BarFrame":
+        """Ultimele `count` bare (view-uri, fără copiere)"""
+        return self.window(max(0, len(self) - count), len(self))
+
+    def window(self, start: int, stop: int) -> "BarFrame":
+        """Barele [start, stop) (view-uri, fără copiere)"""
+        return BarFrame(
+            timestamps=self.timestamps[start:stop],
+            ts=self.ts[start:stop],
+            open=self.open[start:stop],
+            high=self.high[start:stop],
+            low=self.low[start:stop],
+            close=self.close[start:stop],
+            volume=self.volume[start:stop],
+            buy_volume=self.buy_volume[start:stop],
+            sell_volume=self.sell_volume[start:stop],
+            delta=self.delta[start:stop],
+            effective_delta=self.effective_delta[start:stop],
+        )
+
+
+class BarRing:
+    """
+    Buffer circular columnar cu capacitate fixă pentru barele live.
+
+    append scrie scalari în coloane prealocate (fără obiecte per bară);
+    frame(n) întoarce ultimele n bare, în ordine, ca BarFrame (copie).
+    """
+    _FIELDS = ("open", "high", "low", "close", "volume", "buy_volume", "sell_volume")
+
+    def __init__(self, capacity: int = 200):
+        self.capacity = capacity
+        self._columns = {name: np.empty(capacity) for name in self._FIELDS}
+        self._ts = np.empty(capacity, dtype=np.int64)
+        self._timestamps = np.empty(capacity, dtype=object)
+        self._idx = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: datetime, open: float, high: float, low: float, close: float,
+               volume: float, buy_volume: float, sell_volume: float) -> None:
+        idx = self._idx
+        columns = self._columns
+        columns["open"][idx] = open
+        columns["high"][idx] = high
+        columns["low"][idx] = low
+        columns["close"][idx] = close
+        columns["volume"][idx] = volume
+        columns["buy_volume"][idx] = buy_volume
+        columns["sell_volume"][idx] = sell_volume
+        self._ts[idx] = _epoch_ns(timestamp)
+        self._timestamps[idx] = timestamp
+        self._idx = (idx + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def frame(self, count: int) -> BarFrame:
+        """Ultimele `count` bare; delta lipsește (NaN), effective_delta = buy - sell"""
+        count = min(count, self._count)
+        order = np.arange(self._idx - count, self._idx) % self.capacity
+        columns = {name: column[order] for name, column in self._columns.items()}
+        return BarFrame(
+            timestamps=self._timestamps[order].tolist(),
+            ts=self._ts[order],
+            delta=np.full(count, np.nan),
+            effective_delta=columns["buy_volume"] - columns["sell_volume"],
+            **columns,
+        )
+
+    def bars(self, count: int) -> List[Bar]:
+        """Ultimele `count` bare ca List[Bar] - doar pentru apelanții care cer modele"""
+        frame = self.frame(count)
+        return [
+            Bar(
+                timestamp=frame.timestamps[i],
+                open=frame.open[i],
+                high=frame.high[i],
+                low=frame.low[i],
+                close=frame.close[i],
+                volume=frame.volume[i],
+                buy_volume=frame.buy_volume[i],
+                sell_volume=frame.sell_volume[i],
+            )
+            for i in range(len(frame))
+        ]
+
+
+def as_frame(bars: Union[List[Bar], BarFrame]) -> BarFrame:
+    """Adaptor pentru apelanții care încă trimit List[Bar]"""
+    if isinstance(bars, BarFrame):
+        return bars
+    return BarFrame.from_bars(bars)
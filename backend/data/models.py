@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from datetime import datetime
 from typing import Optional
 
@@ -13,10 +13,26 @@ class Bar(BaseModel):
     sell_volume: Optional[float] = None
     delta: Optional[float] = None
     atr: Optional[float] = None
+    # delta dacă există, altfel buy_volume - sell_volume, altfel 0 (calculat la construcție)
+    effective_delta: float = 0.0
+
+    @model_validator(mode='after')
+    def _resolve_effective_delta(self):
+        self._update_effective_delta()
+        return self
+
+    def _update_effective_delta(self):
+        if self.delta is not None:
+            self.effective_delta = self.delta
+        elif self.buy_volume is not None and self.sell_volume is not None:
+            self.effective_delta = self.buy_volume - self.sell_volume
+        else:
+            self.effective_delta = 0.0
 
     def compute_delta(self):
         if self.buy_volume is not None and self.sell_volume is not None:
             self.delta = self.buy_volume - self.sell_volume
+            self._update_effective_delta()
 
 class ReplayInfo(BaseModel):
     symbol: str
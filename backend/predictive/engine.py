@@ -1,11 +1,26 @@
-import math
-import random
-from typing import List
+import zlib
+from typing import Dict, List, Union
 from datetime import datetime
 
+import numpy as np
+
 from backend.data.models import Bar
+from backend.data.frame import BarFrame, as_frame
 from backend.predictive.models import PredictiveSnapshot
 
+# Un generator PCG64 per simbol, partajat în tot procesul.
+# Seed derivat stabil din simbol => simulări reproductibile între rulări.
+_rngs: Dict[str, np.random.Generator] = {}
+
+
+def _get_rng(symbol: str) -> np.random.Generator:
+    rng = _rngs.get(symbol)
+    if rng is None:
+        rng = np.random.default_rng(zlib.crc32(symbol.encode("utf-8")))
+        _rngs[symbol] = rng
+    return rng
+
+
 class PredictiveEngine:
     def __init__(
         self,
@@ -20,116 +35,99 @@ class PredictiveEngine:
         self.num_scenarios = num_scenarios
         self.breakout_atr_mult = breakout_atr_mult
         self.collapse_atr_mult = collapse_atr_mult
-
-    def compute(self, symbol: str, bars: List[Bar]) -> PredictiveSnapshot:
-        if len(bars) < 2:
-            default_price = bars[-1].close if bars else 0.0
+        self._zero_cone = [0.0] * horizon_bars
+
+    def _flat_cone(self, price: float) -> List[float]:
+        """Con plat pentru cazurile degenerate (reutilizat când prețul e 0)"""
+        if price == 0.0 and len(self._zero_cone) == self.horizon_bars:
+            return self._zero_cone
+        return [price] * self.horizon_bars
+
+    def compute(self, symbol: str, bars: Union[List[Bar], BarFrame]) -> PredictiveSnapshot:
+        frame = as_frame(bars)
+        n = len(frame)
+        if n < 2:
+            default_price = float(frame.close[-1]) if n else 0.0
+            cone = self._flat_cone(default_price)
             return PredictiveSnapshot(
                 symbol=symbol,
-                timestamp=bars[-1].timestamp if bars else datetime.now(),
+                timestamp=frame.timestamps[-1] if n else datetime.now(),
                 horizon_bars=self.horizon_bars,
                 num_scenarios=self.num_scenarios,
                 IFI=0.0,
                 breakout_probability_up=0.0,
                 breakout_probability_down=0.0,
                 energy_collapse_risk=0.0,
-                cone_upper=[default_price] * self.horizon_bars,
-                cone_lower=[default_price] * self.horizon_bars
+                cone_upper=cone,
+                cone_lower=cone
             )
 
-        closes = [b.close for b in bars if b.close is not None]
+        closes = frame.close[~np.isnan(frame.close)]
         if len(closes) < 2:
-            default_price = closes[0] if closes else 0.0
+            default_price = float(closes[0]) if len(closes) else 0.0
+            cone = self._flat_cone(default_price)
             return PredictiveSnapshot(
                 symbol=symbol,
-                timestamp=bars[-1].timestamp,
+                timestamp=frame.timestamps[-1],
                 horizon_bars=self.horizon_bars,
                 num_scenarios=self.num_scenarios,
                 IFI=0.0,
                 breakout_probability_up=0.0,
                 breakout_probability_down=0.0,
                 energy_collapse_risk=0.0,
-                cone_upper=[default_price] * self.horizon_bars,
-                cone_lower=[default_price] * self.horizon_bars
+                cone_upper=cone,
+                cone_lower=cone
             )
 
-        returns = []
-        for i in range(1, len(closes)):
-            prev = closes[i - 1]
-            curr = closes[i]
-            ret = 0.0 if prev == 0 else (curr - prev) / abs(prev)
-            returns.append(ret)
-
-        if not returns:
-            sigma = 0.0
-        else:
-            mean_ret = sum(returns) / len(returns)
-            var = sum((r - mean_ret) ** 2 for r in returns) / max(1, len(returns) - 1)
-            sigma = math.sqrt(var)
-
-        N_atr = min(20, len(bars))
-        recent = bars[-N_atr:]
-        true_ranges = [(b.high - b.low) for b in recent]
-        avg_tr = sum(true_ranges) / len(true_ranges) if true_ranges else 0.0
+        prev = closes[:-1]
+        safe_prev = np.where(prev != 0, np.abs(prev), 1.0)
+        returns = np.where(prev != 0, (closes[1:] - prev) / safe_prev, 0.0)
+        sigma = float(returns.std(ddof=1 if len(returns) > 1 else 0))
+
+        N_atr = min(20, n)
+        recent_highs = frame.high[-N_atr:]
+        recent_lows = frame.low[-N_atr:]
+        avg_tr = float((recent_highs - recent_lows).mean())
         atr = avg_tr or 1e-6
 
-        recent_high = max(b.high for b in recent)
-        recent_low = min(b.low for b in recent)
+        recent_high = float(recent_highs.max())
+        recent_low = float(recent_lows.min())
 
         breakout_up_level = recent_high + self.breakout_atr_mult * atr
         breakout_down_level = recent_low - self.breakout_atr_mult * atr
 
-        last_price = closes[-1]
-
-        paths = []
-        for s in range(self.num_scenarios):
-            price = last_price
-            path = []
-            for h in range(self.horizon_bars):
-                eps = random.gauss(0.0, 1.0)
-                step_ret = sigma * eps
-                price = price * (1.0 + step_ret)
-                path.append(price)
-            paths.append(path)
-
-        cone_upper = []
-        cone_lower = []
-        std_values = []
-
-        for h in range(self.horizon_bars):
-            step_values = [path[h] for path in paths]
-            mean_h = sum(step_values) / len(step_values)
-            var_h = sum((v - mean_h) ** 2 for v in step_values) / max(1, len(step_values) - 1)
-            std_h = math.sqrt(var_h)
-            std_values.append(std_h)
-
-            upper_h = mean_h + std_h
-            lower_h = mean_h - std_h
-            cone_upper.append(upper_h)
-            cone_lower.append(lower_h)
-
-        count_breakout_up = 0
-        count_breakout_down = 0
-        for path in paths:
-            if any(p >= breakout_up_level for p in path):
-                count_breakout_up += 1
-            if any(p <= breakout_down_level for p in path):
-                count_breakout_down += 1
+        last_price = float(closes[-1])
+
+        # Antithetic variates: fiecare secvență de șocuri eps este folosită
+        # și cu semn inversat (-eps), deci generăm doar jumătate din scenarii
+        rng = _get_rng(symbol)
+        num_base = (self.num_scenarios + 1) // 2
+        shocks = rng.standard_normal((num_base, self.horizon_bars))
+        eps = np.concatenate([shocks, -shocks], axis=0)[:self.num_scenarios]
+        paths = last_price * np.cumprod(1.0 + sigma * eps, axis=1)
+
+        mean_h = paths.mean(axis=0)
+        std_h = paths.std(axis=0, ddof=1 if self.num_scenarios > 1 else 0)
+        cone_upper = (mean_h + std_h).tolist()
+        cone_lower = (mean_h - std_h).tolist()
+
+        count_breakout_up = int((paths >= breakout_up_level).any(axis=1).sum())
+        count_breakout_down = int((paths <= breakout_down_level).any(axis=1).sum())
 
         breakout_probability_up = count_breakout_up / self.num_scenarios
         breakout_probability_down = count_breakout_down / self.num_scenarios
 
         collapse_band = self.collapse_atr_mult * atr
-        count_collapse = sum(1 for path in paths if abs(path[-1] - last_price) <= collapse_band)
+        count_collapse = int((np.abs(paths[:, -1] - last_price) <= collapse_band).sum())
         energy_collapse_risk = count_collapse / self.num_scenarios
 
-        avg_std = sum(std_values) / len(std_values) if std_values else 0.0
+        avg_std = float(std_h.mean()) if std_h.size else 0.0
         vol_ratio = avg_std / (abs(last_price) + 1e-9)
         IFI = max(0.0, min(100.0, vol_ratio * 10000.0))
 
         return PredictiveSnapshot(
             symbol=symbol,
-            timestamp=bars[-1].timestamp,
+            timestamp=frame.timestamps[-1],
             horizon_bars=self.horizon_bars,
             num_scenarios=self.num_scenarios,
             IFI=IFI,
@@ -0,0 +1,42 @@
+"""
+Console Log - logging non-blocant pentru event loop
+====================================================
+
+Scrierea efectivă pe stdout se face dintr-un singur thread (QueueListener);
+din event loop un log este doar un enqueue. Format '%(message)s', nivel din
+LOG_LEVEL (implicit INFO) - output identic cu vechile print-uri.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from typing import Optional
+
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+def _get_queue_handler() -> logging.handlers.QueueHandler:
+    """Handler-ul partajat; listener-ul pornește la prima utilizare"""
+    global _queue_handler
+    if _queue_handler is None:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, handler)
+        listener.start()
+        atexit.register(listener.stop)
+        _queue_handler = logging.handlers.QueueHandler(log_queue)
+    return _queue_handler
+
+
+def install_queue_logging(logger: logging.Logger) -> logging.Logger:
+    """Atașează handler-ul de coadă, doar dacă aplicația nu a configurat deja logger-ul"""
+    if logger.handlers:
+        return logger
+    logger.addHandler(_get_queue_handler())
+    logger.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+    logger.propagate = False
+    return logger
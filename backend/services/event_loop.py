@@ -0,0 +1,20 @@
+"""
+Event Loop - policy-ul de event loop pentru entry point-urile CLI
+=================================================================
+
+uvloop (libuv) când e instalat, altfel asyncio standard. Se apelează doar din
+blocul `__main__`, imediat înainte de asyncio.run - importul unui modul nu
+schimbă policy-ul procesului (ex. backend.main sub uvicorn).
+"""
+
+import asyncio
+
+
+def install_uvloop() -> bool:
+    """Setează policy-ul uvloop dacă e disponibil; True dacă a fost instalat"""
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
@@ -0,0 +1,68 @@
+"""
+JSON Codec - orjson când e instalat, altfel json din stdlib
+===========================================================
+
+O singură interfață pentru modulele backend și scripturile de test:
+`loads` acceptă bytes sau str; `dumps` întoarce bytes UTF-8, `dumps_str` un str.
+Ambele căi produc același format: compact (sau indentat cu 2 spații), UTF-8
+nescăpat, iar dataclass-urile, datetime-urile și valorile NumPy se serializează
+și fără orjson. `default` e apelat doar pentru restul tipurilor (ex. modele pydantic).
+"""
+
+import json
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+Default = Optional[Callable[[Any], Any]]
+
+
+def _stdlib_default(obj: Any, default: Default) -> Any:
+    """Tipurile pe care orjson le serializează nativ, plus `default` al apelantului"""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        # Copie superficială - câmpurile imbricate trec tot prin default
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if default is not None:
+        return default(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+    loads = orjson.loads
+
+    def dumps(obj: Any, *, default: Default = None, indent: bool = False, newline: bool = False) -> bytes:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, default=default, option=option)
+except ImportError:
+    ORJSON_AVAILABLE = False
+    loads = json.loads
+
+    def dumps(obj: Any, *, default: Default = None, indent: bool = False, newline: bool = False) -> bytes:
+        text = json.dumps(
+            obj,
+            indent=2 if indent else None,
+            separators=None if indent else (',', ':'),
+            ensure_ascii=False,
+            default=lambda o: _stdlib_default(o, default),
+        )
+        return (text + '\n' if newline else text).encode('utf-8')
+
+
+def dumps_str(obj: Any, *, default: Default = None, indent: bool = False) -> str:
+    """dumps() ca str (ex. payload-uri WebSocket, parametri de request)"""
+    return dumps(obj, default=default, indent=indent).decode('utf-8')
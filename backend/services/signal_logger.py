@@ -4,13 +4,15 @@ Signal Logger Service - Persistent signal logging with JSONL storage
 import asyncio
 import json
 import os
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields
 from datetime import datetime, date
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 
+from backend.services import json_codec
 
-@dataclass
+
+@dataclass(slots=True)
 class SignalEvent:
     """Represents a single signal event"""
     id: str                              # Unique signal ID (uuid)
@@ -29,13 +31,43 @@ class SignalEvent:
     meta: Dict[str, Any] = field(default_factory=dict)  # Additional metadata
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Shallow copy - asdict() would deep-copy meta on every log call
+        return {name: getattr(self, name) for name in _SIGNAL_EVENT_FIELDS}
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "SignalEvent":
         return cls(**data)
 
 
+_SIGNAL_EVENT_FIELDS = tuple(f.name for f in fields(SignalEvent))
+
+
+def _tail_lines(path: Path, n: int, block_size: int = 65536) -> List[str]:
+    """Return the last n non-empty lines of a file, reading backwards in blocks"""
+    if n <= 0:
+        return []
+
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b""
+        lines: List[bytes] = []
+        while pos > 0:
+            read_size = min(block_size, pos)
+            pos -= read_size
+            f.seek(pos)
+            data = f.read(read_size) + data
+
+            chunks = data.split(b"\n")
+            # First chunk may be a partial line unless we reached start of file
+            complete = chunks if pos == 0 else chunks[1:]
+            lines = [c.strip() for c in complete if c.strip()]
+            if len(lines) >= n:
+                break
+
+    return [line.decode("utf-8") for line in lines[-n:]]
+
+
 class SignalLogger:
     """Thread-safe signal logger with JSONL persistence"""
 
@@ -58,20 +90,12 @@ class SignalLogger:
             return 0
 
         try:
-            # Read all lines first
-            all_lines = []
-            with open(self.signals_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        all_lines.append(line)
-
-            # Take only last N
-            recent_lines = all_lines[-limit:] if len(all_lines) > limit else all_lines
+            # Read only the last N lines, backwards from end of file
+            recent_lines = _tail_lines(self.signals_file, limit)
 
             for line in recent_lines:
                 try:
-                    data = json.loads(line)
+                    data = json_codec.loads(line)
                     signal = SignalEvent.from_dict(data)
                     self._signals.append(signal)
                     self._last_signal_by_symbol[signal.symbol] = signal
@@ -97,8 +121,8 @@ class SignalLogger:
                     self._signals = self._signals[-3000:]
 
                 # Append to JSONL file
-                with open(self.signals_file, "a", encoding="utf-8") as f:
-                    f.write(json.dumps(event.to_dict()) + "\n")
+                with open(self.signals_file, "ab") as f:
+                    f.write(json_codec.dumps(event, newline=True))
 
                 print(f"[SignalLogger] {event.signal_type} {event.symbol} | {event.decision} | {event.reason[:50]}")
                 return True
@@ -214,9 +238,8 @@ class SignalLogger:
                     self._last_signal_by_symbol = {}
 
                 # Rewrite file
-                with open(self.signals_file, "w", encoding="utf-8") as f:
-                    for signal in self._signals:
-                        f.write(json.dumps(signal.to_dict()) + "\n")
+                with open(self.signals_file, "wb") as f:
+                    f.writelines(json_codec.dumps(signal, newline=True) for signal in self._signals)
 
                 print(f"[SignalLogger] Reset signals" + (f" for {symbol}" if symbol else ""))
                 return True
@@ -4,13 +4,13 @@ Trade Logger Service - Persistent trade logging with JSONL storage
 import asyncio
 import json
 import os
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields
 from datetime import datetime, date
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeEvent:
     """Represents a single trade event"""
     id: str                          # Unique trade ID
@@ -29,13 +29,17 @@ class TradeEvent:
     meta: Dict[str, Any] = field(default_factory=dict)  # Additional metadata
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Shallow copy - asdict() would deep-copy meta on every log call
+        return {name: getattr(self, name) for name in _TRADE_EVENT_FIELDS}
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "TradeEvent":
         return cls(**data)
 
 
+_TRADE_EVENT_FIELDS = tuple(f.name for f in fields(TradeEvent))
+
+
 class TradeLogger:
     """Thread-safe trade logger with JSONL persistence"""
 
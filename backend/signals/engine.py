@@ -1,10 +1,12 @@
-from typing import List, Dict, Optional
-from collections import deque
+from typing import List, Dict, Optional, Tuple, Union
+
+import numpy as np
 
 from backend.topology.models import TopologySnapshot
 from backend.predictive.models import PredictiveSnapshot
 from backend.signals.models import Signal, SignalType
 from backend.data.models import Bar
+from backend.data.frame import BarFrame, as_frame
 
 
 class SignalsEngine:
@@ -24,17 +26,44 @@ class SignalsEngine:
         self.min_delta_strength = min_delta_strength
         self.block_contratrend = block_contratrend
         self._last_IFI: Dict[str, float] = {}
-        self._bars_history: Dict[str, deque] = {}  # Istoricul barelor per simbol
+        # Ring buffer per simbol cu delta/volume ale ultimelor N bare (sloturi goale = 0)
+        self._delta_ring: Dict[str, np.ndarray] = {}
+        self._vol_ring: Dict[str, np.ndarray] = {}
+        self._count: Dict[str, int] = {}
+        self._write_idx: Dict[str, int] = {}
+
+    def _get_rings(self, symbol: str):
+        if symbol not in self._delta_ring:
+            self._delta_ring[symbol] = np.zeros(self.delta_lookback)
+            self._vol_ring[symbol] = np.zeros(self.delta_lookback)
+            self._count[symbol] = 0
+            self._write_idx[symbol] = 0
+        return self._delta_ring[symbol], self._vol_ring[symbol]
+
+    def update_bars(self, symbol: str, bars: Union[List[Bar], BarFrame]):
+        """Backfill: înlocuiește istoricul cu ultimele N bare (pentru calcul delta trend)"""
+        if not isinstance(bars, BarFrame):
+            bars = bars[-self.delta_lookback:]
+        frame = as_frame(bars).tail(self.delta_lookback)
+
+        count = len(frame)
 
-    def update_bars(self, symbol: str, bars: List[Bar]):
-        """Actualizează istoricul barelor pentru calcul delta trend"""
-        if symbol not in self._bars_history:
-            self._bars_history[symbol] = deque(maxlen=self.delta_lookback)
+        delta_ring, vol_ring = self._get_rings(symbol)
+        delta_ring.fill(0.0)
+        vol_ring.fill(0.0)
+        delta_ring[:count] = frame.effective_delta
+        vol_ring[:count] = np.nan_to_num(frame.volume, nan=0.0)
+        self._count[symbol] = count
+        self._write_idx[symbol] = count % self.delta_lookback
 
-        # Adaugă barele noi (sau înlocuiește cu ultimele)
-        self._bars_history[symbol].clear()
-        for bar in bars[-self.delta_lookback:]:
-            self._bars_history[symbol].append(bar)
+    def append_bar(self, symbol: str, bar: Bar):
+        """Streaming: adaugă o singură bară nouă, suprascriind cea mai veche - O(1)"""
+        delta_ring, vol_ring = self._get_rings(symbol)
+        idx = self._write_idx[symbol]
+        delta_ring[idx] = bar.effective_delta
+        vol_ring[idx] = bar.volume or 0.0
+        self._write_idx[symbol] = (idx + 1) % self.delta_lookback
+        self._count[symbol] = min(self._count[symbol] + 1, self.delta_lookback)
 
     def _compute_delta_trend(self, symbol: str) -> tuple:
         """
@@ -45,23 +74,12 @@ class SignalsEngine:
             trend_direction: 'BULLISH', 'BEARISH', sau 'NEUTRAL'
             trend_strength: 0.0 - 1.0 (cât de puternic este trendul)
         """
-        if symbol not in self._bars_history or len(self._bars_history[symbol]) < 3:
+        if self._count.get(symbol, 0) < 3:
             return 'NEUTRAL', 0.0
 
-        bars = list(self._bars_history[symbol])
-
-        # Calculează delta cumulativ și volume total
-        cumulative_delta = 0.0
-        total_volume = 0.0
-
-        for bar in bars:
-            if bar.delta is not None:
-                cumulative_delta += bar.delta
-            elif bar.buy_volume is not None and bar.sell_volume is not None:
-                cumulative_delta += (bar.buy_volume - bar.sell_volume)
-
-            if bar.volume:
-                total_volume += bar.volume
+        # Delta cumulativ și volume total (sloturile nefolosite sunt 0)
+        cumulative_delta = float(self._delta_ring[symbol].sum())
+        total_volume = float(self._vol_ring[symbol].sum())
 
         if total_volume == 0:
             return 'NEUTRAL', 0.0
@@ -79,17 +97,73 @@ class SignalsEngine:
         else:
             return 'NEUTRAL', trend_strength
 
+    # (etichetă bp, trend care confirmă, trend contrar) per direcție
+    _DIRECTIONS = {
+        "LONG": ("bp_up", 'BULLISH', 'BEARISH'),
+        "SHORT": ("bp_down", 'BEARISH', 'BULLISH'),
+    }
+
+    def _evaluate_direction(
+        self,
+        side: str,
+        bp: float,
+        threshold: float,
+        delta_trend: str,
+        delta_strength: float,
+    ) -> Optional[Tuple[float, str]]:
+        """Confidence + descriere pentru LONG/SHORT; None dacă delta e prea slab"""
+        # Verifică delta strength minim pentru semnal valid
+        if delta_trend != 'NEUTRAL' and delta_strength < self.min_delta_strength:
+            return None
+
+        label, confirming, opposing = self._DIRECTIONS[side]
+        base_confidence = 0.5 + (bp - threshold)
+
+        if delta_trend == confirming:
+            # Delta confirmă direcția - boost confidence
+            confidence = min(1.0, base_confidence + delta_strength * 0.25)
+            description = f"{side}: {label}={bp:.0%}, IFI rising, Delta {confirming} ({delta_strength:.0%})"
+        elif delta_trend == opposing:
+            # Delta contratrend - penalizare severă
+            confidence = max(0.0, base_confidence - delta_strength * 0.5)
+            description = f"{side} WEAK: {label}={bp:.0%}, but Delta {opposing} ({delta_strength:.0%})"
+        else:
+            confidence = base_confidence
+            description = f"{side}: {label}={bp:.0%}, IFI rising, Delta neutral"
+        return confidence, description
+
+    @staticmethod
+    def _neutral_signal(
+        symbol: str,
+        predictive: PredictiveSnapshot,
+        delta_trend: str,
+        delta_strength: float,
+    ) -> Signal:
+        max_bp = max(predictive.breakout_probability_up, predictive.breakout_probability_down)
+        return Signal.model_construct(
+            symbol=symbol,
+            timestamp=predictive.timestamp,
+            type="flow_neutral_watch",
+            confidence=max(0.0, min(1.0, 1.0 - max_bp)),
+            breakout_probability=max_bp,
+            IFI=predictive.IFI,
+            energy_collapse_risk=predictive.energy_collapse_risk,
+            description=f"Neutral. Delta trend: {delta_trend} ({delta_strength:.0%})",
+        )
+
     def compute(
         self,
         symbol: str,
         topology: TopologySnapshot,
         predictive: PredictiveSnapshot,
-        bars: Optional[List[Bar]] = None,  # Opțional: pentru delta trend
+        bars: Optional[Union[List[Bar], BarFrame]] = None,  # Opțional: backfill pentru delta trend
     ) -> List[Signal]:
+        # Valorile vin din snapshot-uri deja validate - Signal.model_construct
+        # evită re-validarea Pydantic la fiecare semnal emis
         signals: List[Signal] = []
 
         # Update bars history dacă sunt furnizate
-        if bars:
+        if bars is not None and len(bars) > 0:
             self.update_bars(symbol, bars)
 
         IFI = predictive.IFI
@@ -102,37 +176,31 @@ class SignalsEngine:
         IFI_rising = last_IFI is not None and IFI > last_IFI
         self._last_IFI[symbol] = IFI
 
-        # Calculează delta trend
+        # Calculează delta trend (necesar și pentru descrierea semnalului neutral)
         delta_trend, delta_strength = self._compute_delta_trend(symbol)
 
-        # BLOCARE CONTRATREND: Nu genera LONG când delta e puternic BEARISH
-        if self.block_contratrend and delta_trend == 'BEARISH' and delta_strength >= 0.5:
+        # Blocare contratrend: delta puternic în direcția opusă
+        block = self.block_contratrend and delta_strength >= 0.5
+
+        # Fără IFI în creștere nu poate apărea nici LONG, nici SHORT
+        if not IFI_rising:
+            if block and delta_trend == 'BULLISH':
+                return signals
+            signals.append(self._neutral_signal(symbol, predictive, delta_trend, delta_strength))
+            return signals
+
+        # LONG signal: bp_up + IFI_rising + delta trend BULLISH (sau NEUTRAL)
+        if block and delta_trend == 'BEARISH':
             # Skip LONG signal - piața merge în direcția opusă
             pass
-        # LONG signal: bp_up + IFI_rising + delta trend BULLISH (sau NEUTRAL)
-        elif bp_up >= self.breakout_threshold_long and IFI_rising:
-            # Verifică delta strength minim pentru semnal valid
-            if delta_trend != 'NEUTRAL' and delta_strength < self.min_delta_strength:
-                # Delta prea slab - semnal incert, skip
-                pass
-            else:
-                base_confidence = 0.5 + (bp_up - self.breakout_threshold_long)
-
-                # Ajustează confidence bazat pe delta trend
-                if delta_trend == 'BULLISH':
-                    # Delta confirmă direcția - boost confidence
-                    confidence = min(1.0, base_confidence + delta_strength * 0.25)
-                    description = f"LONG: bp_up={bp_up:.0%}, IFI rising, Delta BULLISH ({delta_strength:.0%})"
-                elif delta_trend == 'BEARISH':
-                    # Delta contratrend - penalizare severă
-                    confidence = max(0.0, base_confidence - delta_strength * 0.5)
-                    description = f"LONG WEAK: bp_up={bp_up:.0%}, but Delta BEARISH ({delta_strength:.0%})"
-                else:
-                    confidence = base_confidence
-                    description = f"LONG: bp_up={bp_up:.0%}, IFI rising, Delta neutral"
-
+        elif bp_up >= self.breakout_threshold_long:
+            evaluated = self._evaluate_direction(
+                "LONG", bp_up, self.breakout_threshold_long, delta_trend, delta_strength
+            )
+            if evaluated is not None:
+                confidence, description = evaluated
                 signals.append(
-                    Signal(
+                    Signal.model_construct(
                         symbol=symbol,
                         timestamp=timestamp,
                         type="predictive_breakout_long",
@@ -144,35 +212,19 @@ class SignalsEngine:
                     )
                 )
 
-        # BLOCARE CONTRATREND: Nu genera SHORT când delta e puternic BULLISH
-        if self.block_contratrend and delta_trend == 'BULLISH' and delta_strength >= 0.5:
-            # Skip SHORT signal - piața merge în direcția opusă
-            pass
         # SHORT signal: bp_down + IFI_rising + delta trend BEARISH (sau NEUTRAL)
         # Folosim threshold mai mare pentru SHORT (65% vs 60%) bazat pe backtest
-        elif bp_down >= self.breakout_threshold_short and IFI_rising:
-            # Verifică delta strength minim pentru semnal valid
-            if delta_trend != 'NEUTRAL' and delta_strength < self.min_delta_strength:
-                # Delta prea slab - semnal incert, skip
-                pass
-            else:
-                base_confidence = 0.5 + (bp_down - self.breakout_threshold_short)
-
-                # Ajustează confidence bazat pe delta trend
-                if delta_trend == 'BEARISH':
-                    # Delta confirmă direcția - boost confidence
-                    confidence = min(1.0, base_confidence + delta_strength * 0.25)
-                    description = f"SHORT: bp_down={bp_down:.0%}, IFI rising, Delta BEARISH ({delta_strength:.0%})"
-                elif delta_trend == 'BULLISH':
-                    # Delta contratrend - penalizare severă
-                    confidence = max(0.0, base_confidence - delta_strength * 0.5)
-                    description = f"SHORT WEAK: bp_down={bp_down:.0%}, but Delta BULLISH ({delta_strength:.0%})"
-                else:
-                    confidence = base_confidence
-                    description = f"SHORT: bp_down={bp_down:.0%}, IFI rising, Delta neutral"
-
+        if block and delta_trend == 'BULLISH':
+            # Skip SHORT signal - piața merge în direcția opusă
+            pass
+        elif bp_down >= self.breakout_threshold_short:
+            evaluated = self._evaluate_direction(
+                "SHORT", bp_down, self.breakout_threshold_short, delta_trend, delta_strength
+            )
+            if evaluated is not None:
+                confidence, description = evaluated
                 signals.append(
-                    Signal(
+                    Signal.model_construct(
                         symbol=symbol,
                         timestamp=timestamp,
                         type="predictive_breakout_short",
@@ -185,21 +237,97 @@ class SignalsEngine:
                 )
 
         else:
-            max_bp = max(bp_up, bp_down)
-            confidence = max(0.0, min(1.0, 1.0 - max_bp))
-
-            signals.append(
-                Signal(
-                    symbol=symbol,
-                    timestamp=timestamp,
-                    type="flow_neutral_watch",
-                    confidence=confidence,
-                    breakout_probability=max_bp,
-                    IFI=IFI,
-                    energy_collapse_risk=ecr,
-                    description=f"Neutral. Delta trend: {delta_trend} ({delta_strength:.0%})",
+            signals.append(self._neutral_signal(symbol, predictive, delta_trend, delta_strength))
+
+        return signals
+
+    def compute_many(
+        self,
+        items: List[Tuple[str, TopologySnapshot, PredictiveSnapshot, Optional[Union[List[Bar], BarFrame]]]],
+    ) -> List[Signal]:
+        """
+        Echivalent cu compute() apelat pe rând pentru fiecare (symbol, topology,
+        predictive, bars), dar cu deciziile LONG/SHORT/neutral calculate vectorizat.
+        Simbolurile trebuie să fie unice în `items`.
+        """
+        if not items:
+            return []
+
+        symbols = [item[0] for item in items]
+        predictives = [item[2] for item in items]
+        count = len(items)
+
+        for symbol, _, _, bars in items:
+            if bars is not None and len(bars) > 0:
+                self.update_bars(symbol, bars)
+
+        IFI = np.fromiter((p.IFI for p in predictives), dtype=np.float64, count=count)
+        bp_up = np.fromiter((p.breakout_probability_up for p in predictives), dtype=np.float64, count=count)
+        bp_down = np.fromiter((p.breakout_probability_down for p in predictives), dtype=np.float64, count=count)
+
+        # NaN pentru simbolurile fără IFI anterior => comparația dă False
+        last_IFI = np.array([self._last_IFI.get(s, np.nan) for s in symbols], dtype=np.float64)
+        IFI_rising = IFI > last_IFI
+        self._last_IFI.update(zip(symbols, IFI.tolist()))
+
+        trends = [self._compute_delta_trend(s) for s in symbols]
+        strength = np.fromiter((t[1] for t in trends), dtype=np.float64, count=count)
+        bullish = np.array([t[0] == 'BULLISH' for t in trends])
+        bearish = np.array([t[0] == 'BEARISH' for t in trends])
+
+        block = (strength >= 0.5) if self.block_contratrend else np.zeros(count, dtype=bool)
+        long_mask = ~(block & bearish) & (bp_up >= self.breakout_threshold_long) & IFI_rising
+        short_open = ~(block & bullish)
+        short_mask = short_open & (bp_down >= self.breakout_threshold_short) & IFI_rising
+        neutral_mask = short_open & ~short_mask
+
+        signals: List[Signal] = []
+        for i in np.flatnonzero(long_mask | short_mask | neutral_mask):
+            symbol = symbols[i]
+            predictive = predictives[i]
+            delta_trend, delta_strength = trends[i]
+
+            if long_mask[i]:
+                evaluated = self._evaluate_direction(
+                    "LONG", predictive.breakout_probability_up, self.breakout_threshold_long,
+                    delta_trend, delta_strength,
                 )
-            )
+                if evaluated is not None:
+                    confidence, description = evaluated
+                    signals.append(
+                        Signal.model_construct(
+                            symbol=symbol,
+                            timestamp=predictive.timestamp,
+                            type="predictive_breakout_long",
+                            confidence=confidence,
+                            breakout_probability=predictive.breakout_probability_up,
+                            IFI=predictive.IFI,
+                            energy_collapse_risk=predictive.energy_collapse_risk,
+                            description=description,
+                        )
+                    )
+
+            if short_mask[i]:
+                evaluated = self._evaluate_direction(
+                    "SHORT", predictive.breakout_probability_down, self.breakout_threshold_short,
+                    delta_trend, delta_strength,
+                )
+                if evaluated is not None:
+                    confidence, description = evaluated
+                    signals.append(
+                        Signal.model_construct(
+                            symbol=symbol,
+                            timestamp=predictive.timestamp,
+                            type="predictive_breakout_short",
+                            confidence=confidence,
+                            breakout_probability=predictive.breakout_probability_down,
+                            IFI=predictive.IFI,
+                            energy_collapse_risk=predictive.energy_collapse_risk,
+                            description=description,
+                        )
+                    )
+            elif neutral_mask[i]:
+                signals.append(self._neutral_signal(symbol, predictive, delta_trend, delta_strength))
 
         return signals
 
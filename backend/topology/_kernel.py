@@ -0,0 +1,135 @@
+"""
+Kernel numeric pentru TopologyEngine
+=====================================
+
+Calculează rotations și energies dintr-o fereastră de bare (close/volume/delta
+ca array-uri float64), plus composite scores normalizate la mediana energiei.
+topology_sweep evaluează coherence/energy pentru toate ferestrele unui backtest
+dintr-o singură trecere (paralel pe ferestre sub Numba).
+
+Compilat cu Numba (@njit) când pachetul este instalat; altfel se folosește
+implementarea vectorizată NumPy, cu rezultate identice.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _rotation_energy_numpy(
+    closes: np.ndarray, volumes: np.ndarray, deltas: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    n = len(closes)
+
+    # Returns: (close[i] - close[i-1]) / |close[i-1]|, 0 pentru prima bară
+    prev = closes[:-1]
+    safe_prev = np.where(prev != 0, np.abs(prev), 1.0)
+    returns = np.zeros(n)
+    returns[1:] = np.where(prev != 0, (closes[1:] - prev) / safe_prev, 0.0)
+
+    # Flows: delta / volume (0 dacă lipsește delta sau volumul)
+    flows = np.zeros(n)
+    np.divide(deltas, volumes, out=flows, where=volumes > 0)
+
+    # Rotation între v_prev = (ret, flow)[k-1] și v_next = (ret, flow)[k+1]
+    rp, rn = returns[:-2], returns[2:]
+    fp, fn = flows[:-2], flows[2:]
+    # |v_prev| * |v_next| = sqrt(a * b): un singur sqrt, doar unde produsul e nenul
+    cross = rp * fn - fp * rn
+    ab = (rp * rp + fp * fp) * (rn * rn + fn * fn)
+    ok = ab >= 1e-18
+    denom = np.sqrt(ab, out=np.ones_like(ab), where=ok)
+    rotations = np.where(ok, cross / denom, 0.0)
+
+    energies = np.abs(returns[1:-1]) * volumes[1:-1]
+
+    return rotations, energies
+
+
+def _topology_sweep_numpy(
+    closes: np.ndarray, volumes: np.ndarray, deltas: np.ndarray, window: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    n = len(closes)
+    coherence = np.full(n, np.nan)
+    energy = np.full(n, np.nan)
+    for t in range(window - 1, n):
+        start = t - window + 1
+        rotations, energies = _rotation_energy_numpy(
+            closes[start:t + 1], volumes[start:t + 1], deltas[start:t + 1]
+        )
+        coherence[t] = np.abs(rotations).sum() / len(rotations)
+        energy[t] = energies[-1]
+    return coherence, energy
+
+
+def composite_scores(rotations: np.ndarray, energies: np.ndarray) -> np.ndarray:
+    """Composite score: |rotation| * sqrt(energy / median_energy) pe toată fereastra"""
+    mid = len(energies) // 2
+    median_energy = np.partition(energies, mid)[mid]
+    if median_energy > 0:
+        normalized_energy = np.sqrt(energies / median_energy)
+    else:
+        normalized_energy = np.zeros_like(energies)
+    return np.abs(rotations) * normalized_energy
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True)
+    def _rotation_energy_jit(closes, volumes, deltas):
+        n = closes.shape[0]
+        m = n - 2
+        rotations = np.empty(m)
+        energies = np.empty(m)
+
+        # (return, flow) pentru barele k-1 și k, actualizate pe măsură ce avansăm
+        r_prev = 0.0
+        f_prev = deltas[0] / volumes[0] if volumes[0] > 0 else 0.0
+        c0 = closes[0]
+        r_curr = 0.0 if c0 == 0 else (closes[1] - c0) / abs(c0)
+        f_curr = deltas[1] / volumes[1] if volumes[1] > 0 else 0.0
+
+        for k in range(1, n - 1):
+            c = closes[k]
+            r_next = 0.0 if c == 0 else (closes[k + 1] - c) / abs(c)
+            f_next = deltas[k + 1] / volumes[k + 1] if volumes[k + 1] > 0 else 0.0
+
+            cross = r_prev * f_next - f_prev * r_next
+            ab = (r_prev * r_prev + f_prev * f_prev) * (r_next * r_next + f_next * f_next)
+            rotations[k - 1] = cross / np.sqrt(ab) if ab >= 1e-18 else 0.0
+            energies[k - 1] = abs(r_curr) * volumes[k]
+
+            r_prev, f_prev = r_curr, f_curr
+            r_curr, f_curr = r_next, f_next
+
+        return rotations, energies
+
+    @njit(parallel=True, cache=True)
+    def _topology_sweep_jit(closes, volumes, deltas, window):
+        n = closes.shape[0]
+        coherence = np.full(n, np.nan)
+        energy = np.full(n, np.nan)
+        for t in prange(window - 1, n):
+            start = t - window + 1
+            rotations, energies = _rotation_energy_jit(
+                closes[start:t + 1], volumes[start:t + 1], deltas[start:t + 1]
+            )
+            coherence[t] = np.abs(rotations).sum() / rotations.shape[0]
+            energy[t] = energies[-1]
+        return coherence, energy
+
+    rotation_energy_kernel = _rotation_energy_jit
+    topology_sweep = _topology_sweep_jit
+
+    # Compilare la import - evită latența primului apel pe bara live
+    rotation_energy_kernel(np.ones(3), np.ones(3), np.zeros(3))
+    topology_sweep(np.ones(4), np.ones(4), np.zeros(4), 3)
+else:
+    rotation_energy_kernel = _rotation_energy_numpy
+    topology_sweep = _topology_sweep_numpy
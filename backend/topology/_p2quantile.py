@@ -0,0 +1,82 @@
+"""
+Estimator P² (Jain & Chlamtac, 1985) pentru o cuantilă a unui flux
+===================================================================
+
+Menține 5 markeri (înălțimi + poziții) și îi ajustează parabolic la fiecare
+observație nouă: memorie O(1), actualizare O(1), fără a păstra eșantioanele.
+
+Estimarea acoperă tot fluxul văzut de la ultimul reset, nu o fereastră
+glisantă - pentru praguri pe fereastră exactă vezi TopologyEngine(exact_threshold=True).
+"""
+
+from typing import List
+
+
+class P2Quantile:
+    def __init__(self, p: float):
+        if not 0.0 < p < 1.0:
+            raise ValueError(f"p must be in (0, 1), got {p}")
+        self.p = p
+        self.count = 0
+        self._q: List[float] = []                          # înălțimile markerilor
+        self._n = [0, 1, 2, 3, 4]                          # pozițiile efective
+        self._desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def update(self, x: float) -> None:
+        x = float(x)
+        self.count += 1
+        q = self._q
+
+        # Primele 5 observații inițializează markerii
+        if self.count <= 5:
+            q.append(x)
+            if self.count == 5:
+                q.sort()
+            return
+
+        # Celula k în care cade x (extinde extremele dacă e cazul)
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        n = self._n
+        for i in range(k + 1, 5):
+            n[i] += 1
+        desired = self._desired
+        for i in range(5):
+            desired[i] += self._increments[i]
+
+        # Ajustează markerii interiori spre pozițiile dorite
+        for i in range(1, 4):
+            d = desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not q[i - 1] < candidate < q[i + 1]:
+                    candidate = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                q[i] = candidate
+                n[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q, n = self._q, self._n
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def estimate(self) -> float:
+        if self.count == 0:
+            return 0.0
+        if self.count < 5:
+            # Eșantion mic: cuantilă exactă, aceeași convenție de index ca engine-ul
+            ordered = sorted(self._q)
+            return ordered[min(int(self.p * len(ordered)), len(ordered) - 1)]
+        return self._q[2]
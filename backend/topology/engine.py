@@ -1,7 +1,13 @@
-import math
-from typing import List
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from backend.topology._kernel import rotation_energy_kernel, composite_scores, topology_sweep
+from backend.topology._p2quantile import P2Quantile
 from backend.topology.models import TopologySnapshot, VortexMarker
 from backend.data.models import Bar
+from backend.data.frame import BarFrame, as_frame
 
 # ANGLE_THRESHOLD_DEG: Minimum directional change to detect vortex
 # Pure angular deflection between consecutive (return, flow) vectors
@@ -9,111 +15,248 @@ from backend.data.models import Bar
 # Threshold of 10° captures meaningful directional changes
 ANGLE_THRESHOLD_DEG = 10.0
 
+
+@dataclass
+class _WindowState:
+    """Fereastra anterioară a unui simbol, pentru actualizare incrementală"""
+    ts: np.ndarray              # int64 epoch-ns
+    closes: np.ndarray
+    volumes: np.ndarray
+    deltas: np.ndarray
+    rotations: np.ndarray
+    energies: np.ndarray
+    sum_abs_rot: float
+
+
 class TopologyEngine:
-    def __init__(self, window_size: int = 100):
+    def __init__(self, window_size: int = 100, exact_threshold: bool = True):
         self.window_size = window_size
+        # False: pragul de energie vine din estimatorul P² (O(1) per bară nouă,
+        # aproximativ, pe tot fluxul) în loc de percentila exactă a ferestrei
+        self.exact_threshold = exact_threshold
+        self._state: Dict[str, _WindowState] = {}
+        self._p70: Dict[str, P2Quantile] = {}
+        # Ultimul snapshot per slot (simbol sau stream), indexat după conținutul ferestrei
+        self._cache: Dict[str, Tuple[tuple, TopologySnapshot]] = {}
 
-    def compute(self, symbol: str, bars: List[Bar]) -> TopologySnapshot:
-        if len(bars) < 3:
-            return TopologySnapshot(
-                symbol=symbol,
-                timestamp=bars[-1].timestamp if bars else None,
-                coherence=0.0,
-                energy=0.0,
-                vortexes=[]
+    def reset(self, symbol: Optional[str] = None) -> None:
+        """
+        Uită starea incrementală, estimatorul P² și snapshot-ul - pentru un slot
+        (simbolul sau `stream`-ul dat la compute) sau pentru toate
+        """
+        if symbol is None:
+            self._state.clear()
+            self._p70.clear()
+            self._cache.clear()
+            return
+        self._state.pop(symbol, None)
+        self._p70.pop(symbol, None)
+        self._cache.pop(symbol, None)
+
+    @staticmethod
+    def _find_shift(
+        state: Optional[_WindowState],
+        ts: np.ndarray,
+        closes: np.ndarray,
+        volumes: np.ndarray,
+        deltas: np.ndarray,
+    ) -> Optional[int]:
+        """
+        Câte bare au ieșit din fereastră față de apelul anterior.
+        None dacă noua fereastră nu continuă fereastra anterioară.
+        """
+        if state is None:
+            return None
+        matches = np.flatnonzero(state.ts == ts[0])
+        if len(matches) == 0:
+            return None
+        shift = int(matches[0])
+
+        overlap = len(state.ts) - shift
+        if overlap < 4 or overlap > len(ts):
+            return None
+        if not (
+            np.array_equal(ts[:overlap], state.ts[shift:])
+            and np.array_equal(closes[:overlap], state.closes[shift:])
+            and np.array_equal(volumes[:overlap], state.volumes[shift:])
+            and np.array_equal(deltas[:overlap], state.deltas[shift:])
+        ):
+            return None
+        return shift
+
+    def _rotations_energies(
+        self,
+        slot: str,
+        ts: np.ndarray,
+        closes: np.ndarray,
+        volumes: np.ndarray,
+        deltas: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, float]:
+        """
+        Rotations/energies pentru fereastră, refolosind valorile din apelul anterior.
+
+        Doar barele noi de la capăt (și rotația primei bare, care depinde de
+        începutul ferestrei) sunt recalculate; suma |rotation| se actualizează
+        prin scăderea contribuțiilor evacuate și adunarea celor noi.
+        """
+        state = self._state.get(slot)
+        shift = self._find_shift(state, ts, closes, volumes, deltas)
+
+        if shift is None:
+            rotations, energies = rotation_energy_kernel(closes, volumes, deltas)
+            sum_abs_rot = float(np.abs(rotations).sum())
+            new_energies = energies
+            if not self.exact_threshold:
+                self._p70[slot] = P2Quantile(0.7)
+        else:
+            overlap = len(state.ts) - shift
+            start = overlap - 3
+            head_rot, _ = rotation_energy_kernel(closes[:3], volumes[:3], deltas[:3])
+            tail_rot, tail_energy = rotation_energy_kernel(
+                closes[start:], volumes[start:], deltas[start:]
+            )
+            tail_rot = tail_rot[1:]
+
+            rotations = np.concatenate((head_rot, state.rotations[shift + 1:], tail_rot))
+            new_energies = tail_energy[1:]
+            energies = np.concatenate((state.energies[shift:], new_energies))
+            sum_abs_rot = (
+                state.sum_abs_rot
+                - float(np.abs(state.rotations[:shift + 1]).sum())
+                + abs(float(head_rot[0]))
+                + float(np.abs(tail_rot).sum())
             )
 
-        returns = []
-        flows = []
-
-        for i in range(len(bars)):
-            if i == 0:
-                ret = 0.0
-            else:
-                prev_close = bars[i - 1].close
-                ret = 0.0 if prev_close == 0 else (bars[i].close - prev_close) / abs(prev_close)
-            returns.append(ret)
-
-            if bars[i].volume and bars[i].volume > 0 and bars[i].delta is not None:
-                flow = bars[i].delta / bars[i].volume
-            else:
-                flow = 0.0
-            flows.append(flow)
-
-        def norm(v):
-            return math.sqrt(v[0] * v[0] + v[1] * v[1])
-
-        rotations = []
-        energies = []
-        composite_scores = []
-
-        for k in range(1, len(bars) - 1):
-            v_prev = (returns[k - 1], flows[k - 1])
-            v_curr = (returns[k], flows[k])
-            v_next = (returns[k + 1], flows[k + 1])
-
-            cross = v_prev[0] * v_next[1] - v_prev[1] * v_next[0]
-            denom = norm(v_prev) * norm(v_next)
-            if denom < 1e-9:
-                rot_norm = 0.0
-            else:
-                rot_norm = cross / denom
-
-            rotations.append(rot_norm)
-
-            energy_k = abs(returns[k]) * (bars[k].volume or 0.0)
-            energies.append(energy_k)
-            
-            # Composite score: |rotation| * (energy normalized)
-            # Higher score = stronger vortex signal
-            median_energy = sorted(energies)[len(energies)//2] if energies else 1.0
-            if median_energy > 0:
-                normalized_energy = math.sqrt(energy_k / median_energy)
-            else:
-                normalized_energy = 0.0
-            composite_score = abs(rot_norm) * normalized_energy
-            composite_scores.append(composite_score)
-
-        if not rotations:
+        if not self.exact_threshold:
+            estimator = self._p70.setdefault(slot, P2Quantile(0.7))
+            for value in new_energies:
+                estimator.update(value)
+
+        self._state[slot] = _WindowState(
+            ts=ts,
+            closes=closes,
+            volumes=volumes,
+            deltas=deltas,
+            rotations=rotations,
+            energies=energies,
+            sum_abs_rot=sum_abs_rot,
+        )
+        return rotations, energies, sum_abs_rot
+
+    @staticmethod
+    def _cache_key(bars: Union[List[Bar], BarFrame]) -> tuple:
+        """Amprenta ferestrei: capetele + ultima bară (inclusiv bara în formare)"""
+        if isinstance(bars, BarFrame):
+            # NaN -> 0, ca la intrarea în kernel: NaN != NaN ar face cheia mereu diferită
+            # (BarRing.frame nu are delta, coloana e numai NaN)
+            values = np.nan_to_num(np.array((
+                bars.close[-2], bars.close[-1], bars.volume[-1], bars.delta[-1],
+            )), nan=0.0)
+            return (len(bars), int(bars.ts[0]), int(bars.ts[-1]), *values.tolist())
+        first, prev, last = bars[0], bars[-2], bars[-1]
+        return (
+            len(bars), first.timestamp, last.timestamp,
+            prev.close, last.close, last.volume, last.delta,
+        )
+
+    def compute(self, symbol: str, bars: Union[List[Bar], BarFrame],
+                stream: Optional[str] = None) -> TopologySnapshot:
+        """
+        Snapshot-ul topologic al ferestrei. Starea incrementală și cache-ul stau
+        într-un slot per `stream` (implicit simbolul): mai multe timeframe-uri pe
+        același simbol au nevoie de slot-uri separate (ex. "BTCUSDT@5m").
+        """
+        slot = stream or symbol
+        if len(bars) < 3:
+            frame = as_frame(bars)
             return TopologySnapshot(
                 symbol=symbol,
-                timestamp=bars[-1].timestamp,
+                timestamp=frame.timestamps[-1] if len(frame) else None,
                 coherence=0.0,
                 energy=0.0,
                 vortexes=[]
             )
 
-        coherence = sum(abs(r) for r in rotations) / len(rotations)
+        # Aceeași fereastră ca la apelul anterior => același snapshot
+        key = self._cache_key(bars)
+        cached = self._cache.get(slot)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        frame = as_frame(bars)
+
+        # Copii proprii (NaN -> 0): sunt păstrate în starea incrementală
+        timestamps = frame.timestamps
+        closes = np.nan_to_num(frame.close, nan=0.0)
+        volumes = np.nan_to_num(frame.volume, nan=0.0)
+        deltas = np.nan_to_num(frame.delta, nan=0.0)
+        rotations, energies, sum_abs_rot = self._rotations_energies(
+            slot, frame.ts, closes, volumes, deltas
+        )
+        scores = composite_scores(rotations, energies)
+
+        coherence = max(0.0, sum_abs_rot) / len(rotations)
+
+        # Pragul de energie = percentila 70 (selecție O(N), fără sortare completă)
+        if self.exact_threshold:
+            thr_index = int(0.7 * len(energies))
+            thr_index = max(0, min(thr_index, len(energies) - 1))
+            energy_threshold = np.partition(energies, thr_index)[thr_index]
+        else:
+            energy_threshold = self._p70[slot].estimate()
 
-        sorted_energies = sorted(energies)
-        thr_index = int(0.7 * len(sorted_energies))
-        thr_index = max(0, min(thr_index, len(sorted_energies) - 1))
-        energy_threshold = sorted_energies[thr_index]
+        # Vortex detection: Use composite score threshold instead of pure angle
+        # This better captures vortex strength combining rotation + energy
+        # Threshold: 0.08 works well for practical markets
+        vortex_mask = (scores >= 0.08) & (energies >= energy_threshold)
 
+        # Câmpurile sunt deja tipate corect (int/float/datetime/Literal) -
+        # model_construct sare peste validarea Pydantic per marker
         vortex_markers = []
-        for k_idx, k in enumerate(range(1, len(bars) - 1)):
-            # Vortex detection: Use composite score threshold instead of pure angle
-            # This better captures vortex strength combining rotation + energy
-            # Threshold: 0.08 works well for practical markets
-            if composite_scores[k_idx] >= 0.08 and energies[k_idx] >= energy_threshold:
-                direction = "clockwise" if rotations[k_idx] < 0 else "counterclockwise"
-                marker = VortexMarker(
-                    index=k,
-                    timestamp=bars[k].timestamp,
-                    price=bars[k].close,
-                    strength=abs(rotations[k_idx]),
-                    direction=direction
-                )
-                vortex_markers.append(marker)
-
-        snapshot_energy = energies[-1] if energies else 0.0
-
-        return TopologySnapshot(
+        for k_idx in np.flatnonzero(vortex_mask):
+            k = int(k_idx) + 1
+            direction = "clockwise" if rotations[k_idx] < 0 else "counterclockwise"
+            marker = VortexMarker.model_construct(
+                index=k,
+                timestamp=timestamps[k],
+                price=float(closes[k]),
+                strength=float(abs(rotations[k_idx])),
+                direction=direction
+            )
+            vortex_markers.append(marker)
+
+        snapshot_energy = float(energies[-1])
+
+        snapshot = TopologySnapshot(
             symbol=symbol,
-            timestamp=bars[-1].timestamp,
+            timestamp=timestamps[-1],
             coherence=coherence,
             energy=snapshot_energy,
             vortexes=vortex_markers
         )
+        self._cache[slot] = (key, snapshot)
+        return snapshot
+
+    def compute_backtest(
+        self, bars: Union[List[Bar], BarFrame], window: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Coherence și energy pentru fiecare fereastră glisantă de `window` bare
+        (implicit window_size), într-o singură trecere peste tot istoricul.
+
+        Indexul t corespunde ferestrei care se termină la bara t; primele
+        window-1 poziții sunt NaN. Vortex markers nu sunt calculați aici.
+        """
+        window = window or self.window_size
+        if window < 3:
+            raise ValueError(f"window must be >= 3, got {window}")
+        frame = as_frame(bars)
+        return topology_sweep(
+            np.nan_to_num(frame.close, nan=0.0),
+            np.nan_to_num(frame.volume, nan=0.0),
+            np.nan_to_num(frame.delta, nan=0.0),
+            window,
+        )
+
 
 engine = TopologyEngine(window_size=100)
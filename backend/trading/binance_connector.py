@@ -12,19 +12,50 @@ Suportă:
 
 import os
 import time
+import json
+import uuid
 import hmac
-import hashlib
 import asyncio
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+import logging
+from datetime import datetime, date
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Callable, Awaitable
 from dataclasses import dataclass, field
 from enum import Enum
 import aiohttp
+from yarl import URL
 from urllib.parse import urlencode
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+from backend.services import json_codec
+from backend.services.console_log import install_queue_logging
+
+
+logger = install_queue_logging(logging.getLogger(__name__))
+
+
+def _with_rounding_factors(info: Dict[str, Any]) -> Dict[str, Any]:
+    """Inversele step/tick, precalculate o dată per simbol pentru rotunjire"""
+    info.setdefault('tick_size', 10.0 ** -info['price_precision'])
+    info['qty_step_inv'] = 1.0 / info['step_size']
+    info['price_tick_inv'] = 1.0 / info['tick_size']
+    return info
+
+
+def _format_param(value: Any) -> str:
+    """Valoare de parametru ca string, fără notație științifică (ex: 1e-05)"""
+    if isinstance(value, float):
+        return f"{value:.12f}".rstrip('0').rstrip('.') or '0'
+    return str(value)
+
+
+# Precizie folosită când simbolul nu apare în exchangeInfo
+DEFAULT_SYMBOL_INFO: Dict[str, Any] = _with_rounding_factors({
+    'qty_precision': 3,
+    'min_qty': 0.001,
+    'step_size': 0.001,
+    'price_precision': 2,
+    'tick_size': 0.01
+})
 
 
 class OrderSide(Enum):
@@ -39,13 +70,23 @@ class OrderType(Enum):
     TAKE_PROFIT_MARKET = "TAKE_PROFIT_MARKET"
 
 
+# Părțile constante ale parametrilor de ordin; metodele le copiază și adaugă
+# doar câmpurile variabile (fără lookup-uri Enum .value pe calea de execuție)
+_BUY = OrderSide.BUY.value
+_SELL = OrderSide.SELL.value
+_EXIT_SIDE = {_BUY: _SELL, _SELL: _BUY}
+_MARKET_TMPL = {'type': OrderType.MARKET.value}
+_STOP_LOSS_TMPL = {'type': OrderType.STOP_MARKET.value, 'closePosition': 'true'}
+_TAKE_PROFIT_TMPL = {'type': OrderType.TAKE_PROFIT_MARKET.value, 'closePosition': 'true'}
+
+
 class PositionSide(Enum):
     LONG = "LONG"
     SHORT = "SHORT"
     BOTH = "BOTH"
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Reprezentare poziție deschisă"""
     symbol: str
@@ -55,21 +96,15 @@ class Position:
     unrealized_pnl: float = 0.0
     leverage: int = 1
     liquidation_price: float = 0.0
-    timestamp: datetime = field(default_factory=datetime.now)
-    
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            'symbol': self.symbol,
-            'side': self.side,
-            'entry_price': self.entry_price,
-            'quantity': self.quantity,
-            'unrealized_pnl': self.unrealized_pnl,
-            'leverage': self.leverage,
-            'timestamp': self.timestamp.isoformat()
-        }
+    timestamp_ns: int = field(default_factory=time.time_ns)
+
+    @property
+    def timestamp(self) -> datetime:
+        """Momentul creării, convertit doar la citire"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
 
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     """Reprezentare ordin"""
     order_id: str
@@ -80,23 +115,15 @@ class Order:
     price: Optional[float] = None
     stop_price: Optional[float] = None
     status: str = "NEW"
-    timestamp: datetime = field(default_factory=datetime.now)
-    
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            'order_id': self.order_id,
-            'symbol': self.symbol,
-            'side': self.side,
-            'type': self.type,
-            'quantity': self.quantity,
-            'price': self.price,
-            'stop_price': self.stop_price,
-            'status': self.status,
-            'timestamp': self.timestamp.isoformat()
-        }
+    timestamp_ns: int = field(default_factory=time.time_ns)
 
+    @property
+    def timestamp(self) -> datetime:
+        """Momentul creării, convertit doar la citire"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
 
-@dataclass
+
+@dataclass(slots=True)
 class TradeResult:
     """Rezultat trade executat"""
     success: bool
@@ -106,17 +133,6 @@ class TradeResult:
     quantity: float = 0.0
     price: float = 0.0
     error: Optional[str] = None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            'success': self.success,
-            'order_id': self.order_id,
-            'symbol': self.symbol,
-            'side': self.side,
-            'quantity': self.quantity,
-            'price': self.price,
-            'error': self.error
-        }
 
 
 class BinanceTestnetConnector:
@@ -139,13 +155,26 @@ class BinanceTestnetConnector:
 
     BASE_URL = "https://testnet.binancefuture.com"
     WS_URL = "wss://stream.binancefuture.com/ws"
+    STREAM_URL = "wss://stream.binancefuture.com/stream"
+    # Relativ la pachet, nu la directorul de lucru: același cache din orice script
+    SYMBOL_CACHE_DIR = Path(__file__).resolve().parent.parent.parent / "data"
+    LISTEN_KEY_KEEPALIVE_SEC = 30 * 60  # listenKey expiră după 60 min fără keepalive
+    FILL_TIMEOUT_SEC = 2.0
+    TICKER_RECONNECT_SEC = 5.0
+    MAX_INFLIGHT_REQUESTS = 10
 
     def __init__(self, api_key: str = None, api_secret: str = None):
+        if not (api_key and api_secret):
+            # .env se citește doar când cheile nu sunt pasate explicit
+            from dotenv import load_dotenv
+            load_dotenv()
+
         self.api_key = api_key or os.getenv("BINANCE_TESTNET_API_KEY")
         self.api_secret = api_secret or os.getenv("BINANCE_TESTNET_SECRET")
 
         if not self.api_key or not self.api_secret:
             raise ValueError("API Key și Secret sunt necesare. Setează în .env sau pasează ca argumente.")
+        self._secret_bytes = self.api_secret.encode('utf-8')
 
         self.session: Optional[aiohttp.ClientSession] = None
         self.positions: Dict[str, Position] = {}
@@ -153,27 +182,65 @@ class BinanceTestnetConnector:
         self.balance: float = 0.0
         self.connected: bool = False
         self.symbol_info: Dict[str, Dict] = {}  # Cache for symbol precision info
+
+        # User-data stream: fill-urile vin prin ORDER_TRADE_UPDATE, nu prin polling
+        self._listen_key: Optional[str] = None
+        self._user_ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._user_stream_task: Optional[asyncio.Task] = None
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self._fill_waiters: Dict[str, asyncio.Future] = {}  # clientOrderId -> avgPrice
+        # Plafon pentru request-urile REST în zbor (sub limita de greutate Binance)
+        self._inflight = asyncio.Semaphore(self.MAX_INFLIGHT_REQUESTS)
+        self._urls: Dict[str, str] = {}  # endpoint -> URL complet, construit o singură dată
+        self._positions_synced: bool = False  # positions/balance urmăresc ACCOUNT_UPDATE
+        # updateTime (ms) al ultimului ordin aplicat local pe self.positions, per simbol;
+        # ACCOUNT_UPDATE-urile cu T mai vechi descriu o stare deja depășită
+        self._position_as_of: Dict[str, int] = {}
+        # Request-uri REST de citire în zbor, per cheie - apelanții concurenți le împart
+        self._pending_reads: Dict[str, asyncio.Task] = {}
+
+        # Mid-price din <symbol>@bookTicker; get_price citește de aici fără I/O
+        self.prices: Dict[str, float] = {}
+        self._ticker_symbols: set = set()
+        self._ticker_task: Optional[asyncio.Task] = None
     
-    def _generate_signature(self, params: Dict[str, Any]) -> str:
-        """Generează semnătura HMAC SHA256"""
+    def _sign_query(self, query_string: str) -> str:
+        """Semnătura HMAC SHA256 a unui query string encodat (hmac.digest - calea C one-shot)"""
+        return hmac.digest(self._secret_bytes, query_string.encode('utf-8'), 'sha256').hex()
+
+    def _signed_query(self, params: Dict[str, Any]) -> str:
+        """Query string semnat: urlencode o singură dată, același șir semnat și trimis"""
+        params['timestamp'] = self._get_timestamp()
         query_string = urlencode(params)
-        signature = hmac.new(
-            self.api_secret.encode('utf-8'),
-            query_string.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
+        return f"{query_string}&signature={self._sign_query(query_string)}"
     
     def _get_timestamp(self) -> int:
         """Returnează timestamp în millisecunde"""
-        return int(time.time() * 1000)
+        return time.time_ns() // 1_000_000
     
+    def _create_session(self) -> aiohttp.ClientSession:
+        """
+        Sesiune HTTP unică pentru toate request-urile: pool keep-alive,
+        cache DNS și timeout-uri implicite, fără cookie jar.
+        """
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=20,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers={'X-MBX-APIKEY': self.api_key},
+            timeout=aiohttp.ClientTimeout(total=10, connect=3),
+            cookie_jar=aiohttp.DummyCookieJar(),
+        )
+
     async def connect(self):
         """Inițializează conexiunea"""
-        if self.session is None:
-            self.session = aiohttp.ClientSession(headers={
-                'X-MBX-APIKEY': self.api_key
-            })
+        if self.session is None or self.session.closed:
+            self.session = self._create_session()
         
         # Test conexiunea
         try:
@@ -182,153 +249,459 @@ class BinanceTestnetConnector:
                 self.connected = True
                 print(f"[OK] Connected to Binance Testnet")
                 print(f"   Balance: ${self.balance:,.2f} USDT")
+                await self._start_user_stream()
+                if not self.symbol_info:
+                    await self._preload_symbol_info()
                 return True
         except Exception as e:
-            print(f"[ERROR] Connection failed: {e}")
+            logger.error("[ERROR] Connection failed: %s", e)
             return False
         
         return False
     
     async def disconnect(self):
         """Închide conexiunea"""
+        await self._stop_user_stream()
+        await self._stop_ticker_stream()
+        for sym in self._ticker_symbols:
+            self.prices.pop(sym, None)
+        self._ticker_symbols.clear()
         if self.session:
             await self.session.close()
             self.session = None
         self.connected = False
+
+    async def __aenter__(self) -> "BinanceTestnetConnector":
+        """Sesiunea (pool-ul keep-alive) e creată o dată; disconnect() la ieșire"""
+        if self.session is None or self.session.closed:
+            self.session = self._create_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.disconnect()
     
     async def _request(self, method: str, endpoint: str, params: Dict = None, signed: bool = False) -> Dict:
         """Execută request HTTP"""
-        if not self.session:
-            await self.connect()
+        if self.session is None:
+            self.session = self._create_session()
         
-        url = f"{self.BASE_URL}{endpoint}"
+        url = self._urls.get(endpoint)
+        if url is None:
+            url = self._urls[endpoint] = f"{self.BASE_URL}{endpoint}"
         params = params or {}
         
         if signed:
-            params['timestamp'] = self._get_timestamp()
-            params['signature'] = self._generate_signature(params)
+            # URL deja encodat - aiohttp nu mai reconstruiește query string-ul
+            url = URL(f"{url}?{self._signed_query(params)}", encoded=True)
+            params = None
         
         try:
-            if method == 'GET':
-                async with self.session.get(url, params=params) as response:
-                    data = await response.json()
-                    if response.status != 200:
-                        print(f"API Error: {data}")
-                    return data
-            elif method == 'POST':
-                async with self.session.post(url, params=params) as response:
-                    data = await response.json()
-                    if response.status != 200:
-                        print(f"API Error: {data}")
-                    return data
-            elif method == 'DELETE':
-                async with self.session.delete(url, params=params) as response:
-                    data = await response.json()
-                    return data
+            async with self._inflight, self.session.request(method, url, params=params) as response:
+                data = await response.json(loads=json_codec.loads)
+            if response.status != 200:
+                logger.error("API Error: %s", data)
+            return data
         except Exception as e:
-            print(f"Request error: {e}")
+            logger.error("Request error: %s", e)
             return {'error': str(e)}
     
+    # ------------------------------------------------------------------
+    # User-data stream (ORDER_TRADE_UPDATE)
+    # ------------------------------------------------------------------
+
+    @property
+    def user_stream_active(self) -> bool:
+        return self._user_ws is not None and not self._user_ws.closed
+
+    async def _start_user_stream(self) -> bool:
+        """Deschide user-data stream-ul (listenKey + WebSocket) dacă nu rulează deja"""
+        if self.user_stream_active:
+            return True
+
+        data = await self._request('POST', '/fapi/v1/listenKey')
+        listen_key = data.get('listenKey') if isinstance(data, dict) else None
+        if not listen_key:
+            logger.warning("[WARNING] User data stream unavailable: %s", data)
+            return False
+
+        try:
+            self._user_ws = await self.session.ws_connect(f"{self.WS_URL}/{listen_key}", heartbeat=60)
+        except Exception as e:
+            logger.warning("[WARNING] User data stream connect failed: %s", e)
+            return False
+
+        self._listen_key = listen_key
+        self._user_stream_task = asyncio.create_task(self._user_stream_loop())
+        self._keepalive_task = asyncio.create_task(self._listen_key_keepalive())
+        logger.info("[OK] User data stream connected")
+        return True
+
+    async def _stop_user_stream(self):
+        """Oprește task-urile de stream și invalidează listenKey"""
+        self._positions_synced = False
+        for task in (self._user_stream_task, self._keepalive_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._user_stream_task = None
+        self._keepalive_task = None
+
+        if self._user_ws is not None:
+            await self._user_ws.close()
+            self._user_ws = None
+
+        if self._listen_key and self.session:
+            await self._request('DELETE', '/fapi/v1/listenKey')
+        self._listen_key = None
+
+    async def _listen_key_keepalive(self):
+        while True:
+            await asyncio.sleep(self.LISTEN_KEY_KEEPALIVE_SEC)
+            await self._request('PUT', '/fapi/v1/listenKey')
+
+    async def _user_stream_loop(self):
+        ws = self._user_ws
+        try:
+            async for msg in ws:
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    self._handle_user_event(json_codec.loads(msg.data))
+                elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("[ERROR] User data stream: %s", e)
+        self._positions_synced = False
+        logger.warning("[WARNING] User data stream closed")
+
+    def _handle_user_event(self, event: Dict[str, Any]):
+        """Dispatch pentru evenimentele din user-data stream"""
+        event_type = event.get('e')
+        if event_type == 'ORDER_TRADE_UPDATE':
+            self._handle_order_update(event.get('o', {}))
+        elif event_type == 'ACCOUNT_UPDATE':
+            self._handle_account_update(event.get('a', {}), event.get('T'))
+
+    def _handle_account_update(self, account: Dict[str, Any], transaction_time: Optional[int] = None):
+        """
+        Balanța USDT (B[].wb) și pozițiile modificate (P[]), aplicate pe loc.
+        O poziție e sărită dacă evenimentul nu e mai nou decât ordinul aplicat
+        deja local (ex. pa=0 de la close-ul unei inversări, sosit după noua intrare).
+        """
+        for balance in account.get('B', []):
+            if balance.get('a') == 'USDT':
+                self.balance = float(balance['wb'])
+        for pos in account.get('P', []):
+            as_of = self._position_as_of.get(pos['s'])
+            if transaction_time is not None and as_of is not None and transaction_time <= as_of:
+                continue
+            self._apply_position(pos['s'], float(pos['pa']), float(pos['ep']), float(pos.get('up', 0)))
+
+    def _handle_order_update(self, order: Dict[str, Any]):
+        """Rezolvă waiter-ul ordinului la FILLED (o.c = clientOrderId, o.ap = avgPrice)"""
+        if order.get('X') != 'FILLED':
+            return
+        waiter = self._fill_waiters.get(order.get('c'))
+        if waiter is not None and not waiter.done():
+            waiter.set_result(float(order.get('ap', 0) or 0))
+
+    def _register_fill_waiter(self) -> Optional[str]:
+        """clientOrderId nou cu waiter înregistrat înainte de trimiterea ordinului"""
+        if not self.user_stream_active:
+            return None
+        client_order_id = f"oie_{uuid.uuid4().hex[:24]}"
+        self._fill_waiters[client_order_id] = asyncio.get_running_loop().create_future()
+        return client_order_id
+
+    async def _resolve_fill_price(self, symbol: str, data: Dict, client_order_id: Optional[str]) -> float:
+        """
+        Prețul mediu de execuție al unui ordin MARKET: avgPrice din răspuns,
+        altfel evenimentul FILLED din user stream; prețul curent doar ca fallback.
+        """
+        try:
+            # 1. avgPrice din răspuns (nu e mereu prezent pentru MARKET)
+            if 'avgPrice' in data and float(data['avgPrice']) > 0:
+                return float(data['avgPrice'])
+
+            # 2. ORDER_TRADE_UPDATE din user-data stream
+            waiter = self._fill_waiters.get(client_order_id) if client_order_id else None
+            if waiter is not None:
+                try:
+                    exec_price = await asyncio.wait_for(waiter, timeout=self.FILL_TIMEOUT_SEC)
+                    if exec_price > 0:
+                        return exec_price
+                except asyncio.TimeoutError:
+                    logger.warning("   [WARNING] No fill event within %ss", self.FILL_TIMEOUT_SEC)
+
+            # 3. Fallback: prețul curent (user stream inactiv sau fără eveniment)
+            exec_price = await self.get_price(symbol)
+            logger.warning("   [WARNING] Using market price as fallback: $%.2f", exec_price)
+            return exec_price
+        finally:
+            if client_order_id:
+                self._fill_waiters.pop(client_order_id, None)
+
+    async def _coalesced(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Un singur request în zbor per cheie; apelanții concurenți așteaptă același rezultat"""
+        task = self._pending_reads.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._pending_reads[key] = task
+            task.add_done_callback(lambda _: self._pending_reads.pop(key, None))
+        # shield: anularea unui apelant nu anulează request-ul celorlalți
+        return await asyncio.shield(task)
+
     async def get_account(self) -> Dict:
         """Obține informații cont"""
+        return await self._coalesced('account', self._fetch_account)
+
+    async def _fetch_account(self) -> Dict:
         data = await self._request('GET', '/fapi/v2/account', signed=True)
         
         if 'totalWalletBalance' in data:
             self.balance = float(data['totalWalletBalance'])
             
-            # Update positions
+            # Update positions - obiectele existente sunt actualizate pe loc,
+            # iar simbolurile raportate cu cantitate 0 sunt scoase
             for pos in data.get('positions', []):
-                if float(pos['positionAmt']) != 0:
-                    self.positions[pos['symbol']] = Position(
-                        symbol=pos['symbol'],
-                        side='LONG' if float(pos['positionAmt']) > 0 else 'SHORT',
-                        entry_price=float(pos['entryPrice']),
-                        quantity=abs(float(pos['positionAmt'])),
-                        unrealized_pnl=float(pos['unrealizedProfit']),
-                        leverage=int(pos['leverage'])
-                    )
+                self._apply_position(
+                    pos['symbol'],
+                    float(pos['positionAmt']),
+                    float(pos['entryPrice']),
+                    float(pos['unrealizedProfit']),
+                    int(pos['leverage'])
+                )
+            # Snapshot REST complet; de aici încolo ACCOUNT_UPDATE îl ține la zi
+            self._positions_synced = self.user_stream_active
         
         return data
     
+    def _apply_position(self, symbol: str, amount: float, entry_price: float,
+                        unrealized_pnl: float, leverage: Optional[int] = None):
+        """Actualizează self.positions pe loc (din REST sau ACCOUNT_UPDATE)"""
+        if amount == 0:
+            self.positions.pop(symbol, None)
+            return
+
+        side = 'LONG' if amount > 0 else 'SHORT'
+        position = self.positions.get(symbol)
+        if position is None or position.side != side:
+            self.positions[symbol] = Position(
+                symbol=symbol,
+                side=side,
+                entry_price=entry_price,
+                quantity=abs(amount),
+                unrealized_pnl=unrealized_pnl,
+                leverage=leverage if leverage is not None else (position.leverage if position else 1)
+            )
+        else:
+            position.entry_price = entry_price
+            position.quantity = abs(amount)
+            position.unrealized_pnl = unrealized_pnl
+            if leverage is not None:
+                position.leverage = leverage
+
+    def _seed_position_from_fill(self, symbol: str, side_value: str, quantity: float,
+                                 exec_price: float, update_time: Optional[int] = None):
+        """
+        Poziția din fill-ul intrării, până sosește ACCOUNT_UPDATE. Cu cache-ul
+        sincronizat, get_position nu mai întreabă REST-ul - fără seed, un semnal
+        venit între fill și eveniment ar vedea „fără poziție” deși ea există.
+        Dacă ACCOUNT_UPDATE a sosit deja, intrarea există și nu e dublată; o
+        intrare rămasă pe partea opusă (inversare) e înlocuită.
+        """
+        side = 'LONG' if side_value == _BUY else 'SHORT'
+        self._mark_position_as_of(symbol, update_time)
+        position = self.positions.get(symbol)
+        if position is not None and position.side == side:
+            return
+        amount = quantity if side == 'LONG' else -quantity
+        self._apply_position(symbol, amount, exec_price, 0.0)
+
+    def _mark_position_as_of(self, symbol: str, update_time: Optional[int]):
+        if update_time:
+            self._position_as_of[symbol] = max(int(update_time), self._position_as_of.get(symbol, 0))
+
     async def get_balance(self) -> float:
-        """Obține balanța USDT"""
-        await self.get_account()
+        """Obține balanța USDT (din ACCOUNT_UPDATE cu user stream-ul activ, altfel REST)"""
+        if not (self._positions_synced and self.user_stream_active):
+            await self.get_account()
         return self.balance
     
     async def get_price(self, symbol: str) -> float:
-        """Obține prețul curent"""
+        """
+        Obține prețul curent: din bookTicker pentru simbolurile abonate cu
+        subscribe_ticker(), altfel (sau până sosește primul tick) din REST
+        """
+        price = self.prices.get(symbol)
+        if price:
+            return price
+        return await self._coalesced(f"price:{symbol}", lambda: self._rest_get_price(symbol))
+
+    async def _rest_get_price(self, symbol: str) -> float:
         data = await self._request('GET', '/fapi/v1/ticker/price', {'symbol': symbol})
         return float(data.get('price', 0))
 
-    async def get_symbol_info(self, symbol: str) -> Dict[str, Any]:
+    async def subscribe_ticker(self, *symbols: str):
         """
-        Obține informații despre un simbol (precision, min qty, step size)
-        Cached pentru performanță.
+        Adaugă simboluri la stream-ul multiplexat bookTicker (reconectează cu noua
+        listă). Se apelează la pornire (ex. PaperTradingManager.start), nu din get_price.
         """
-        if symbol in self.symbol_info:
-            return self.symbol_info[symbol]
+        new_symbols = set(symbols) - self._ticker_symbols
+        if not new_symbols:
+            return
+        self._ticker_symbols |= new_symbols
+        await self._stop_ticker_stream()
+        if self.session is None:
+            self.session = self._create_session()
+        self._ticker_task = asyncio.create_task(self._ticker_loop(sorted(self._ticker_symbols)))
+
+    async def _stop_ticker_stream(self):
+        if self._ticker_task and not self._ticker_task.done():
+            self._ticker_task.cancel()
+            try:
+                await self._ticker_task
+            except asyncio.CancelledError:
+                pass
+        self._ticker_task = None
+
+    async def _ticker_loop(self, symbols: List[str]):
+        """
+        Stream-ul bookTicker, redeschis după o cădere. La cancel (resubscribe)
+        prețurile rămân în cache - noul stream le suprascrie la primul tick.
+        """
+        streams = '/'.join(f"{sym.lower()}@bookTicker" for sym in symbols)
+        while True:
+            try:
+                async with self.session.ws_connect(f"{self.STREAM_URL}?streams={streams}", heartbeat=60) as ws:
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            tick = json_codec.loads(msg.data).get('data', {})
+                            if 'b' in tick and 'a' in tick:
+                                self.prices[tick['s']] = (float(tick['b']) + float(tick['a'])) / 2
+                        elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+                logger.warning("[WARNING] Ticker stream closed")
+            except Exception as e:
+                logger.error("[ERROR] Ticker stream: %s", e)
+
+            # Stream căzut: fără prețuri învechite - get_price folosește REST
+            # până la primul tick după reconectare
+            for sym in symbols:
+                self.prices.pop(sym, None)
+            await asyncio.sleep(self.TICKER_RECONNECT_SEC)
+
+    @staticmethod
+    def _parse_symbol_filters(sym: Dict[str, Any]) -> Dict[str, Any]:
+        """Precizie cantitate/preț din filtrele LOT_SIZE și PRICE_FILTER"""
+        # Extract quantity precision from LOT_SIZE filter
+        qty_precision = 3  # default
+        min_qty = 0.001
+        step_size = 0.001
+        price_precision = 2
+        tick_size = 0.01
+
+        for f in sym.get('filters', []):
+            if f['filterType'] == 'LOT_SIZE':
+                min_qty = float(f['minQty'])
+                step_size = float(f['stepSize'])
+                # Calculate precision from step size
+                step_str = f['stepSize'].rstrip('0')
+                if '.' in step_str:
+                    qty_precision = len(step_str.split('.')[1])
+                else:
+                    qty_precision = 0
+            elif f['filterType'] == 'PRICE_FILTER':
+                tick_size = float(f['tickSize'])
+                tick_str = f['tickSize'].rstrip('0')
+                if '.' in tick_str:
+                    price_precision = len(tick_str.split('.')[1])
+                else:
+                    price_precision = 0
+
+        return _with_rounding_factors({
+            'qty_precision': qty_precision,
+            'min_qty': min_qty,
+            'step_size': step_size,
+            'price_precision': price_precision,
+            'tick_size': tick_size
+        })
+
+    def _symbol_cache_file(self) -> Path:
+        return self.SYMBOL_CACHE_DIR / "exchange_info.json"
+
+    async def _preload_symbol_info(self) -> int:
+        """
+        Încarcă precizia tuturor simbolurilor o singură dată: din cache-ul de pe
+        disc dacă e din ziua curentă, altfel din /fapi/v1/exchangeInfo.
+        Cache-ul e un singur fișier ({'date', 'symbols'}), rescris la fiecare refresh.
+        """
+        cache_file = self._symbol_cache_file()
+        today = date.today().isoformat()
+        if cache_file.exists():
+            try:
+                with open(cache_file, 'rb') as f:
+                    cached = json_codec.loads(f.read())
+                if cached['date'] == today:
+                    self.symbol_info = {
+                        name: _with_rounding_factors(info) for name, info in cached['symbols'].items()
+                    }
+                    return len(self.symbol_info)
+            except (OSError, json.JSONDecodeError, KeyError, TypeError) as e:
+                logger.warning("[WARNING] Ignoring symbol info cache: %s", e)
 
         data = await self._request('GET', '/fapi/v1/exchangeInfo')
+        if 'symbols' not in data:
+            return 0
 
-        if 'symbols' in data:
-            for sym in data['symbols']:
-                sym_name = sym['symbol']
-                # Extract quantity precision from LOT_SIZE filter
-                qty_precision = 3  # default
-                min_qty = 0.001
-                step_size = 0.001
-                price_precision = 2
-
-                for f in sym.get('filters', []):
-                    if f['filterType'] == 'LOT_SIZE':
-                        min_qty = float(f['minQty'])
-                        step_size = float(f['stepSize'])
-                        # Calculate precision from step size
-                        step_str = f['stepSize'].rstrip('0')
-                        if '.' in step_str:
-                            qty_precision = len(step_str.split('.')[1])
-                        else:
-                            qty_precision = 0
-                    elif f['filterType'] == 'PRICE_FILTER':
-                        tick_size = f['tickSize'].rstrip('0')
-                        if '.' in tick_size:
-                            price_precision = len(tick_size.split('.')[1])
-                        else:
-                            price_precision = 0
-
-                self.symbol_info[sym_name] = {
-                    'qty_precision': qty_precision,
-                    'min_qty': min_qty,
-                    'step_size': step_size,
-                    'price_precision': price_precision
-                }
-
-        return self.symbol_info.get(symbol, {
-            'qty_precision': 3,
-            'min_qty': 0.001,
-            'step_size': 0.001,
-            'price_precision': 2
-        })
+        self.symbol_info = {
+            sym['symbol']: self._parse_symbol_filters(sym) for sym in data['symbols']
+        }
 
-    def round_quantity(self, symbol: str, quantity: float) -> float:
-        """Round quantity to symbol's precision"""
-        info = self.symbol_info.get(symbol, {'qty_precision': 3, 'step_size': 0.001})
-        precision = info['qty_precision']
-        step_size = info['step_size']
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                f.write(json_codec.dumps_str({'date': today, 'symbols': self.symbol_info}))
+            # Fișierele zilnice din versiunea anterioară a cache-ului
+            for stale in cache_file.parent.glob("exchange_info_*.json"):
+                stale.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning("[WARNING] Could not write symbol info cache: %s", e)
+
+        return len(self.symbol_info)
+
+    async def get_symbol_info(self, symbol: str) -> Dict[str, Any]:
+        """
+        Obține informații despre un simbol (precision, min qty, step size)
+        din cache-ul încărcat la connect().
+        """
+        if not self.symbol_info:
+            # Preload-ul de la connect() a eșuat sau nu a rulat încă
+            await self._preload_symbol_info()
+        return self.symbol_info.get(symbol) or dict(DEFAULT_SYMBOL_INFO)
 
-        # Round to step size
-        quantity = round(quantity / step_size) * step_size
-        # Round to precision
-        return round(quantity, precision)
+    def round_quantity(self, symbol: str, quantity: float) -> float:
+        """Round quantity to symbol's step size and precision"""
+        info = self.symbol_info.get(symbol, DEFAULT_SYMBOL_INFO)
+        inv = info['qty_step_inv']
+        return round(round(quantity * inv) / inv, info['qty_precision'])
 
     def round_price(self, symbol: str, price: float) -> float:
-        """Round price to symbol's precision"""
-        info = self.symbol_info.get(symbol, {'price_precision': 2})
-        return round(price, info['price_precision'])
+        """Round price to symbol's tick size and precision"""
+        info = self.symbol_info.get(symbol, DEFAULT_SYMBOL_INFO)
+        inv = info['price_tick_inv']
+        return round(round(price * inv) / inv, info['price_precision'])
     
     async def get_position(self, symbol: str) -> Optional[Position]:
-        """Obține poziția pentru un simbol"""
-        await self.get_account()
+        """
+        Obține poziția pentru un simbol. Cu user stream-ul activ pozițiile sunt
+        ținute la zi de ACCOUNT_UPDATE; REST doar pentru resync după o întrerupere.
+        """
+        if not (self._positions_synced and self.user_stream_active):
+            await self.get_account()
         return self.positions.get(symbol)
     
     async def set_leverage(self, symbol: str, leverage: int) -> bool:
@@ -371,134 +744,106 @@ class BinanceTestnetConnector:
         """Deschide poziție"""
 
         # Market order
-        params = {
-            'symbol': symbol,
-            'side': side.value,
-            'type': OrderType.MARKET.value,
-            'quantity': quantity
-        }
-
-        data = await self._request('POST', '/fapi/v1/order', params, signed=True)
+        side_value = side.value
+        params = {**_MARKET_TMPL, 'symbol': symbol, 'side': side_value, 'quantity': quantity}
+        client_order_id = self._register_fill_waiter()
+        if client_order_id:
+            params['newClientOrderId'] = client_order_id
+
+        # SL/TP pleacă în același request cu intrarea (un singur round-trip semnat)
+        legs = []
+        if stop_loss:
+            legs.append(('SL', self._protective_order_params(symbol, stop_loss, side_value, _STOP_LOSS_TMPL)))
+        if take_profit:
+            legs.append(('TP', self._protective_order_params(symbol, take_profit, side_value, _TAKE_PROFIT_TMPL)))
+
+        if legs:
+            responses = await self.batch_open([params] + [leg for _, leg in legs])
+            data = responses[0]
+            orphans = []
+            for (name, leg), response in zip(legs, responses[1:]):
+                if 'orderId' not in response:
+                    logger.warning("   [WARNING] %s order was not accepted: %s", name, response.get('msg', response))
+                elif 'orderId' not in data:
+                    orphans.append(response['orderId'])
+                else:
+                    logger.info("   %s set @ $%.4f", name, leg['stopPrice'])
+            if orphans:
+                # Intrarea a eșuat - nu lăsa SL/TP orfane în carte (anulări în paralel)
+                async with asyncio.TaskGroup() as tg:
+                    for order_id in orphans:
+                        tg.create_task(self._request('DELETE', '/fapi/v1/order', {
+                            'symbol': symbol,
+                            'orderId': order_id
+                        }, signed=True))
+        else:
+            data = await self._request('POST', '/fapi/v1/order', params, signed=True)
 
         if 'orderId' in data:
             order_id = str(data['orderId'])
-
-            # Get actual execution price - try multiple sources
-            exec_price = 0.0
-
-            # 1. Try avgPrice from response (may not always be present for MARKET orders)
-            if 'avgPrice' in data and float(data['avgPrice']) > 0:
-                exec_price = float(data['avgPrice'])
-                print(f"   [DEBUG] Got price from avgPrice: ${exec_price:,.2f}")
-
-            # 2. If not, calculate from fills (if present)
-            if exec_price == 0 and 'fills' in data and len(data['fills']) > 0:
-                total_qty = 0.0
-                total_value = 0.0
-                for fill in data['fills']:
-                    qty = float(fill.get('qty', 0))
-                    price = float(fill.get('price', 0))
-                    total_qty += qty
-                    total_value += qty * price
-                if total_qty > 0:
-                    exec_price = total_value / total_qty
-                    print(f"   [DEBUG] Got price from fills: ${exec_price:,.2f}")
-
-            # 3. If still no price, query the order status to get avgPrice (with retry)
-            if exec_price == 0:
-                for attempt in range(3):
-                    await asyncio.sleep(0.5 * (attempt + 1))  # Increasing delay: 0.5s, 1s, 1.5s
-                    order_data = await self._request('GET', '/fapi/v1/order', {
-                        'symbol': symbol,
-                        'orderId': order_id
-                    }, signed=True)
-                    if 'avgPrice' in order_data and float(order_data['avgPrice']) > 0:
-                        exec_price = float(order_data['avgPrice'])
-                        print(f"   [DEBUG] Got price from order query (attempt {attempt+1}): ${exec_price:,.2f}")
-                        break
-
-            # 4. Query the position for entry price (most reliable for futures)
-            if exec_price == 0:
-                await asyncio.sleep(0.3)
-                position = await self.get_position(symbol)
-                if position and position.entry_price > 0:
-                    exec_price = position.entry_price
-                    print(f"   [DEBUG] Got price from position: ${exec_price:,.2f}")
-
-            # 5. Final fallback: get current market price (ALWAYS do this if price is still 0)
-            if exec_price == 0:
-                exec_price = await self.get_price(symbol)
-                print(f"   [WARNING] Using market price as fallback: ${exec_price:,.2f}")
+            exec_price = await self._resolve_fill_price(symbol, data, client_order_id)
+            self._seed_position_from_fill(symbol, side_value, quantity, exec_price, data.get('updateTime'))
 
             result = TradeResult(
                 success=True,
                 order_id=order_id,
                 symbol=symbol,
-                side=side.value,
+                side=side_value,
                 quantity=quantity,
                 price=exec_price
             )
 
-            print(f"[OK] {side.value} {quantity} {symbol} @ ${result.price:,.2f}")
-
-            # Plasează SL/TP dacă sunt specificate
-            if stop_loss:
-                await self._place_stop_loss(symbol, quantity, stop_loss, side)
-            if take_profit:
-                await self._place_take_profit(symbol, quantity, take_profit, side)
+            logger.info("[OK] %s %s %s @ $%.2f", side_value, quantity, symbol, result.price)
 
             return result
         else:
+            self._fill_waiters.pop(client_order_id, None)
             return TradeResult(
                 success=False,
                 error=data.get('msg', 'Unknown error')
             )
     
-    async def _place_stop_loss(self, symbol: str, quantity: float, price: float, entry_side: OrderSide):
-        """Plasează stop loss order"""
-        # SL e în direcția opusă intrării
-        sl_side = OrderSide.SELL if entry_side == OrderSide.BUY else OrderSide.BUY
-
-        # Round price to symbol's precision
-        price = self.round_price(symbol, price)
-
-        params = {
+    def _protective_order_params(self, symbol: str, price: float, entry_side: str,
+                                 template: Dict[str, str]) -> Dict[str, Any]:
+        """Parametrii unui ordin SL/TP closePosition (template), în direcția opusă intrării"""
+        return {
+            **template,
             'symbol': symbol,
-            'side': sl_side.value,
-            'type': OrderType.STOP_MARKET.value,
-            'stopPrice': price,
-            'closePosition': 'true'
+            'side': _EXIT_SIDE[entry_side],
+            # Round price to symbol's precision
+            'stopPrice': self.round_price(symbol, price),
         }
 
-        data = await self._request('POST', '/fapi/v1/order', params, signed=True)
-
-        if 'orderId' in data:
-            print(f"   SL set @ ${price:,.4f}")
-            return True
-        return False
-
-    async def _place_take_profit(self, symbol: str, quantity: float, price: float, entry_side: OrderSide):
-        """Plasează take profit order"""
-        # TP e în direcția opusă intrării
-        tp_side = OrderSide.SELL if entry_side == OrderSide.BUY else OrderSide.BUY
+    async def batch_open(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Trimite până la 5 ordine într-un singur request semnat (/fapi/v1/batchOrders).
 
-        # Round price to symbol's precision
-        price = self.round_price(symbol, price)
+        Returnează câte un element per ordin, în aceeași ordine: ordinul acceptat
+        (cu 'orderId') sau eroarea lui ({'code', 'msg'}). Binance procesează
+        ordinele din batch independent - un eșec nu le blochează pe celelalte.
+        """
+        if self.session is None:
+            self.session = self._create_session()
 
-        params = {
-            'symbol': symbol,
-            'side': tp_side.value,
-            'type': OrderType.TAKE_PROFIT_MARKET.value,
-            'stopPrice': price,
-            'closePosition': 'true'
-        }
+        batch = [{key: _format_param(value) for key, value in order.items()} for order in orders]
+        body = self._signed_query({'batchOrders': json_codec.dumps_str(batch)})
 
-        data = await self._request('POST', '/fapi/v1/order', params, signed=True)
+        # Corpul trimis este exact șirul semnat (fără re-encodare a JSON-ului de către aiohttp)
+        try:
+            async with self._inflight, self.session.post(
+                f"{self.BASE_URL}/fapi/v1/batchOrders",
+                data=body,
+                headers={'Content-Type': 'application/x-www-form-urlencoded'},
+            ) as response:
+                data = await response.json(loads=json_codec.loads)
+        except Exception as e:
+            logger.error("Request error: %s", e)
+            data = {'msg': str(e)}
 
-        if 'orderId' in data:
-            print(f"   TP set @ ${price:,.4f}")
-            return True
-        return False
+        if isinstance(data, list):
+            return data
+        logger.error("API Error: %s", data)
+        return [data] * len(orders)
     
     async def close_position(self, symbol: str) -> TradeResult:
         """Închide poziția pentru un simbol"""
@@ -508,65 +853,30 @@ class BinanceTestnetConnector:
             return TradeResult(success=False, error="No position to close")
 
         # Close în direcția opusă
-        side = OrderSide.SELL if position.side == 'LONG' else OrderSide.BUY
+        side = _SELL if position.side == 'LONG' else _BUY
 
-        params = {
-            'symbol': symbol,
-            'side': side.value,
-            'type': OrderType.MARKET.value,
-            'quantity': position.quantity
-        }
+        params = {**_MARKET_TMPL, 'symbol': symbol, 'side': side, 'quantity': position.quantity}
+        client_order_id = self._register_fill_waiter()
+        if client_order_id:
+            params['newClientOrderId'] = client_order_id
 
         data = await self._request('POST', '/fapi/v1/order', params, signed=True)
 
         if 'orderId' in data:
             order_id = str(data['orderId'])
-
-            # Get actual execution price - try multiple sources
-            exec_price = 0.0
-
-            # 1. Try avgPrice from response
-            if 'avgPrice' in data and float(data['avgPrice']) > 0:
-                exec_price = float(data['avgPrice'])
-                print(f"   [DEBUG] Close price from avgPrice: ${exec_price:,.2f}")
-
-            # 2. Calculate from fills if present
-            if exec_price == 0 and 'fills' in data and len(data['fills']) > 0:
-                total_qty = 0.0
-                total_value = 0.0
-                for fill in data['fills']:
-                    qty = float(fill.get('qty', 0))
-                    price = float(fill.get('price', 0))
-                    total_qty += qty
-                    total_value += qty * price
-                if total_qty > 0:
-                    exec_price = total_value / total_qty
-                    print(f"   [DEBUG] Close price from fills: ${exec_price:,.2f}")
-
-            # 3. Query order status for avgPrice (with retry)
-            if exec_price == 0:
-                for attempt in range(3):
-                    await asyncio.sleep(0.5 * (attempt + 1))
-                    order_data = await self._request('GET', '/fapi/v1/order', {
-                        'symbol': symbol,
-                        'orderId': order_id
-                    }, signed=True)
-                    if 'avgPrice' in order_data and float(order_data['avgPrice']) > 0:
-                        exec_price = float(order_data['avgPrice'])
-                        print(f"   [DEBUG] Close price from order query (attempt {attempt+1}): ${exec_price:,.2f}")
-                        break
-
-            # 4. Fallback to current price (ALWAYS if still 0)
-            if exec_price == 0:
-                exec_price = await self.get_price(symbol)
-                print(f"   [WARNING] Close using market price as fallback: ${exec_price:,.2f}")
+            exec_price = await self._resolve_fill_price(symbol, data, client_order_id)
 
             # Calculate PnL
             pnl = (exec_price - position.entry_price) * position.quantity
             if position.side == 'SHORT':
                 pnl = -pnl
 
-            print(f"[OK] Closed {position.side} {symbol} @ ${exec_price:,.2f} | P&L: ${pnl:,.2f}")
+            logger.info("[OK] Closed %s %s @ $%.2f | P&L: $%.2f", position.side, symbol, exec_price, pnl)
+
+            # Poziția închisă iese din cache acum, nu la ACCOUNT_UPDATE: altfel un
+            # close repetat sau intrarea unei inversări ar vedea încă vechea poziție
+            self.positions.pop(symbol, None)
+            self._mark_position_as_of(symbol, data.get('updateTime'))
 
             # Cancel remaining orders
             await self.cancel_all_orders(symbol)
@@ -575,11 +885,12 @@ class BinanceTestnetConnector:
                 success=True,
                 order_id=order_id,
                 symbol=symbol,
-                side=side.value,
+                side=side,
                 quantity=position.quantity,
                 price=exec_price
             )
 
+        self._fill_waiters.pop(client_order_id, None)
         return TradeResult(success=False, error=data.get('msg', 'Unknown error'))
     
     async def cancel_all_orders(self, symbol: str) -> bool:
@@ -11,30 +11,66 @@ Integrare completă în timp real:
 
 import os
 import asyncio
-import json
+import logging
+import socket
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import count
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass, field, asdict
-from collections import deque
 
 import aiohttp
+from pydantic import BaseModel
 from dotenv import load_dotenv
 
 from backend.data.models import Bar
+from backend.data.frame import BarFrame, BarRing
 from backend.topology.engine import engine as topology_engine
 from backend.predictive.engine import engine as predictive_engine
-from backend.signals.engine import engine as signals_engine
+from backend.signals.engine import SignalsEngine
 from backend.trading.binance_connector import BinanceTestnetConnector
 from backend.trading.paper_trading import PaperTradingManager, TradingConfig
 from backend.services.signal_logger import get_signal_logger, SignalEvent
+from backend.services import json_codec
+from backend.services.console_log import install_queue_logging
+from backend.services.event_loop import install_uvloop
+
+
+def _json_default(obj: Any) -> Any:
+    """Snapshot-urile pydantic se serializează direct din câmpuri (fără model_dump(mode='json'))"""
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_DATA_FRAMES = (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY)
+
+# Engine-urile singleton (topology/predictive) păstrează stare per simbol: runner-ele
+# pe simboluri diferite calculează în paralel, cele pe același simbol se serializează
+_ENGINE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="oie-engines"
+)
+_ENGINE_LOCKS: Dict[str, threading.Lock] = {}
+
+
+def _engine_lock(symbol: str) -> threading.Lock:
+    """Lock-ul de engine pentru un simbol (setdefault e atomic sub GIL)"""
+    lock = _ENGINE_LOCKS.get(symbol)
+    if lock is None:
+        lock = _ENGINE_LOCKS.setdefault(symbol, threading.Lock())
+    return lock
 
 load_dotenv()
 
+logger = install_queue_logging(logging.getLogger(__name__))
 
-@dataclass
+
+@dataclass(slots=True)
 class LiveBar:
-    """Bară live de la Binance"""
+    """Bară live de la Binance (slots: se creează una la fiecare frame kline)"""
     timestamp: datetime
     open: float
     high: float
@@ -43,23 +79,26 @@ class LiveBar:
     volume: float
     buy_volume: float = 0.0
     sell_volume: float = 0.0
+    _cached_bar: Optional[Bar] = field(default=None, init=False, repr=False, compare=False)
     
     @property
     def delta(self) -> float:
         return self.buy_volume - self.sell_volume
     
     def to_bar(self) -> Bar:
-        """Convertește la Bar model"""
-        return Bar(
-            timestamp=self.timestamp.isoformat(),
-            open=self.open,
-            high=self.high,
-            low=self.low,
-            close=self.close,
-            volume=self.volume,
-            buy_volume=self.buy_volume,
-            sell_volume=self.sell_volume
-        )
+        """Convertește la Bar model (o singură dată per bară - barele închise nu se mai modifică)"""
+        if self._cached_bar is None:
+            self._cached_bar = Bar(
+                timestamp=self.timestamp.isoformat(),
+                open=self.open,
+                high=self.high,
+                low=self.low,
+                close=self.close,
+                volume=self.volume,
+                buy_volume=self.buy_volume,
+                sell_volume=self.sell_volume
+            )
+        return self._cached_bar
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -73,6 +112,29 @@ class LiveBar:
         }
 
 
+# Clasificarea tipurilor cunoscute de semnal (SignalType), fără căutări de subșiruri per bară
+_SIGNAL_CLASS: Dict[str, str] = {
+    "predictive_breakout_long": "LONG",
+    "predictive_breakout_short": "SHORT",
+    "flow_neutral_watch": "NONE",
+}
+
+
+def _classify_signal(sig_type: str) -> str:
+    """NONE / LONG / SHORT pentru un tip de semnal"""
+    signal_class = _SIGNAL_CLASS.get(sig_type)
+    if signal_class is None:
+        # Tip necunoscut: aceleași reguli ca înainte, pe subșiruri
+        if 'watch' in sig_type or 'neutral' in sig_type:
+            signal_class = "NONE"
+        elif 'long' in sig_type.lower():
+            signal_class = "LONG"
+        else:
+            signal_class = "SHORT"
+        _SIGNAL_CLASS[sig_type] = signal_class
+    return signal_class
+
+
 class BinanceLiveDataFeed:
     """
     Feed de date live de la Binance WebSocket
@@ -83,6 +145,8 @@ class BinanceLiveDataFeed:
     WS_URL = "wss://fstream.binance.com/ws"
     RECONNECT_DELAY = 5  # Seconds between reconnect attempts
     MAX_RECONNECT_DELAY = 60  # Max delay between attempts
+    SOCKET_RCVBUF = 1 << 20  # 1 MiB - absoarbe burst-urile fără wakeup-uri suplimentare
+    BAR_QUEUE_SIZE = 16  # Bare închise în așteptarea callback-urilor (cele vechi se elimină)
 
     def __init__(self, symbol: str = "btcusdt", interval: str = "1m"):
         self.symbol = symbol.lower()
@@ -91,13 +155,18 @@ class BinanceLiveDataFeed:
         self.session = None
 
         self.current_bar: Optional[LiveBar] = None
-        self.bars: deque = deque(maxlen=200)  # Keep last 200 bars
+        self._open_time_ms: Optional[int] = None
+        self._open_time: Optional[datetime] = None
+        self.bars = BarRing(200)  # Keep last 200 bars (coloane NumPy prealocate)
 
         self.callbacks: List[callable] = []
+        # Recepția WS (producător) e decuplată de callback-uri (consumator)
+        self._bar_queue: asyncio.Queue = asyncio.Queue(maxsize=self.BAR_QUEUE_SIZE)
+        self._consumer_task: Optional[asyncio.Task] = None
         self.running = False
         self.connected = False
         self.reconnect_count = 0
-        self.last_message_time: Optional[datetime] = None
+        self.last_message_monotonic: Optional[float] = None  # time.monotonic() la ultimul frame
 
     def on_bar(self, callback: callable):
         """Înregistrează callback pentru bare noi"""
@@ -105,8 +174,9 @@ class BinanceLiveDataFeed:
 
     async def start(self):
         """Pornește feed-ul de date cu auto-reconnect"""
-        print(f"[DATA] Starting live data feed for {self.symbol.upper()}...")
+        logger.info("[DATA] Starting live data feed for %s...", self.symbol.upper())
         self.running = True
+        self._start_consumer()
 
         while self.running:
             try:
@@ -116,47 +186,93 @@ class BinanceLiveDataFeed:
                     break
                 self.connected = False
                 self.reconnect_count += 1
-                delay = min(self.RECONNECT_DELAY * self.reconnect_count, self.MAX_RECONNECT_DELAY)
-                print(f"[RECONNECT] {self.symbol.upper()} connection lost: {e}")
-                print(f"[RECONNECT] Attempt {self.reconnect_count} in {delay}s...")
+                # Backoff exponențial: 5, 10, 20, 40, 60, 60... secunde
+                delay = min(self.RECONNECT_DELAY * 2 ** (self.reconnect_count - 1), self.MAX_RECONNECT_DELAY)
+                logger.warning("[RECONNECT] %s connection lost: %s", self.symbol.upper(), e)
+                logger.warning("[RECONNECT] Attempt %s in %ss...", self.reconnect_count, delay)
                 await asyncio.sleep(delay)
 
         await self._cleanup()
 
+    def _start_consumer(self):
+        """Pornește task-ul care rulează callback-urile (dacă nu rulează deja)"""
+        if self._consumer_task is None or self._consumer_task.done():
+            self._consumer_task = asyncio.create_task(self._consume_bars())
+
+    def _stream_url(self) -> str:
+        return f"{self.WS_URL}/{self.symbol}@kline_{self.interval}"
+
+    @staticmethod
+    def _create_session() -> aiohttp.ClientSession:
+        """Sesiune cu DNS cache și fără limită de conexiuni (un singur socket WS de lungă durată)"""
+        connector = aiohttp.TCPConnector(limit=0, use_dns_cache=True, ttl_dns_cache=300)
+        return aiohttp.ClientSession(connector=connector)
+
+    def _tune_socket(self, ws):
+        """TCP_NODELAY + buffer de recepție mai mare pe socket-ul WS (best-effort)"""
+        try:
+            sock = ws.get_extra_info('socket')
+            if sock is None:
+                return
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.SOCKET_RCVBUF)
+        except (AttributeError, OSError) as e:
+            logger.warning("[WARN] %s socket tuning skipped: %s", self.symbol.upper(), e)
+
     async def _connect_and_listen(self):
         """Conectează și ascultă stream-ul WebSocket"""
+        # Sesiunea (și connector-ul) supraviețuiesc reconectărilor; se închide doar în _cleanup
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            self.session = self._create_session()
 
-        stream = f"{self.symbol}@kline_{self.interval}"
-        url = f"{self.WS_URL}/{stream}"
+        url = self._stream_url()
 
-        print(f"[DATA] Connecting to {url}...")
+        logger.info("[DATA] Connecting to %s...", url)
 
-        async with self.session.ws_connect(url, timeout=30, heartbeat=20) as ws:
+        # compress=0: fără negociere permessage-deflate pentru frame-urile kline
+        async with self.session.ws_connect(url, timeout=30, heartbeat=15, autoping=True, compress=0) as ws:
             self.ws = ws
+            self._tune_socket(ws)
             self.connected = True
             self.reconnect_count = 0  # Reset on successful connect
-            print(f"[OK] Connected to Binance {self.symbol.upper()} {self.interval} stream")
+            logger.info("[OK] Connected to Binance %s %s stream", self.symbol.upper(), self.interval)
 
             async for msg in ws:
                 if not self.running:
                     break
 
-                self.last_message_time = datetime.now()
+                self.last_message_monotonic = time.monotonic()
 
-                if msg.type == aiohttp.WSMsgType.TEXT:
-                    await self._handle_message(json.loads(msg.data))
+                if msg.type in _DATA_FRAMES:
+                    # str (TEXT) sau bytes (BINARY) - decoderul le acceptă pe ambele
+                    await self._handle_message(json_codec.loads(msg.data))
                 elif msg.type == aiohttp.WSMsgType.ERROR:
-                    print(f"[ERROR] WebSocket error: {msg.data}")
+                    logger.error("[ERROR] WebSocket error: %s", msg.data)
                     break
                 elif msg.type == aiohttp.WSMsgType.CLOSED:
-                    print(f"[WARN] WebSocket closed by server")
+                    logger.warning("[WARN] WebSocket closed by server")
                     break
 
+    async def _consume_bars(self):
+        """Rulează callback-urile pentru barele închise, în ordinea sosirii"""
+        while True:
+            bar = await self._bar_queue.get()
+            for callback in self.callbacks:
+                try:
+                    await callback(bar)
+                except Exception as e:
+                    logger.warning("Callback error: %s", e)
+
     async def _cleanup(self):
         """Curăță resursele"""
         self.connected = False
+        if self._consumer_task and not self._consumer_task.done():
+            self._consumer_task.cancel()
+            try:
+                await self._consumer_task
+            except asyncio.CancelledError:
+                pass
+        self._consumer_task = None
         if self.session and not self.session.closed:
             await self.session.close()
         self.session = None
@@ -167,7 +283,7 @@ class BinanceLiveDataFeed:
         self.running = False
         self.connected = False
         await self._cleanup()
-        print(f"[DATA] {self.symbol.upper()} data feed stopped")
+        logger.info("[DATA] %s data feed stopped", self.symbol.upper())
     
     async def _handle_message(self, data: Dict):
         """Procesează mesaj de la WebSocket"""
@@ -175,16 +291,25 @@ class BinanceLiveDataFeed:
             return
         
         kline = data['k']
-        
+
+        # Toate update-urile intra-bară au același open time - datetime-ul se
+        # construiește o singură dată per bară, nu per mesaj
+        open_time_ms = kline['t']
+        if open_time_ms != self._open_time_ms:
+            self._open_time_ms = open_time_ms
+            self._open_time = datetime.fromtimestamp(open_time_ms / 1000)
+
+        volume = float(kline['v'])
+        buy_volume = float(kline['V'])  # Taker buy volume
         bar = LiveBar(
-            timestamp=datetime.fromtimestamp(kline['t'] / 1000),
+            timestamp=self._open_time,
             open=float(kline['o']),
             high=float(kline['h']),
             low=float(kline['l']),
             close=float(kline['c']),
-            volume=float(kline['v']),
-            buy_volume=float(kline['V']),  # Taker buy volume
-            sell_volume=float(kline['v']) - float(kline['V'])  # Estimated sell
+            volume=volume,
+            buy_volume=buy_volume,
+            sell_volume=volume - buy_volume  # Estimated sell
         )
         
         is_closed = kline['x']  # Bar is closed
@@ -192,19 +317,85 @@ class BinanceLiveDataFeed:
         self.current_bar = bar
         
         if is_closed:
-            self.bars.append(bar)
+            self.bars.append(
+                bar.timestamp, bar.open, bar.high, bar.low, bar.close,
+                bar.volume, bar.buy_volume, bar.sell_volume
+            )
             
-            # Notify callbacks
-            for callback in self.callbacks:
-                try:
-                    await callback(bar)
-                except Exception as e:
-                    print(f"Callback error: {e}")
+            # Notify callbacks (prin coadă - recepția WS nu așteaptă engine-urile)
+            if self._bar_queue.full():
+                dropped = self._bar_queue.get_nowait()
+                logger.warning("[WARN] %s bar queue full, dropping bar %s", self.symbol.upper(), dropped.timestamp)
+            self._bar_queue.put_nowait(bar)
     
+    def get_frame(self, count: int = 50) -> BarFrame:
+        """Returnează ultimele N bare ca BarFrame (input direct pentru engine-uri)"""
+        return self.bars.frame(count)
+
     def get_bars(self, count: int = 50) -> List[Bar]:
         """Returnează ultimele N bare ca obiecte Bar"""
-        bars_list = list(self.bars)[-count:]
-        return [b.to_bar() for b in bars_list]
+        return self.bars.bars(count)
+
+
+class BinanceMultiStreamFeed(BinanceLiveDataFeed):
+    """
+    Un singur WebSocket (combined stream) pentru toate timeframe-urile unui simbol.
+
+    Frame-urile {"stream": ..., "data": ...} sunt dispecerizate către câte un
+    BinanceLiveDataFeed per interval (ring buffer, coadă și callback-uri proprii);
+    feed-urile copil nu deschid conexiuni proprii.
+    """
+
+    STREAM_URL = "wss://fstream.binance.com/stream"
+
+    def __init__(self, symbol: str = "btcusdt"):
+        super().__init__(symbol=symbol, interval="multi")
+        self._streams: Dict[str, BinanceLiveDataFeed] = {}
+        self._request_ids = count(1)
+
+    def _stream_url(self) -> str:
+        return f"{self.STREAM_URL}?streams={'/'.join(self._streams)}"
+
+    async def subscribe(self, interval: str) -> BinanceLiveDataFeed:
+        """Feed-ul copil pentru un interval; stream-ul se adaugă pe conexiunea existentă"""
+        stream = f"{self.symbol}@kline_{interval}"
+        child = self._streams.get(stream)
+        if child is not None and child.running:
+            return child
+
+        is_new_stream = child is None
+        child = BinanceLiveDataFeed(symbol=self.symbol, interval=interval)
+        child.running = True
+        child._start_consumer()
+        self._streams[stream] = child
+
+        # Conectat deja: SUBSCRIBE pe același socket (altfel intră în URL la conectare)
+        if is_new_stream and self.ws is not None and not self.ws.closed:
+            await self.ws.send_str(json_codec.dumps_str({
+                'method': 'SUBSCRIBE', 'params': [stream], 'id': next(self._request_ids)
+            }))
+        return child
+
+    async def _handle_message(self, data: Dict):
+        """Dispecerizează frame-ul către feed-ul intervalului (răspunsurile la SUBSCRIBE n-au 'stream')"""
+        child = self._streams.get(data.get('stream'))
+        if child is None or not child.running:
+            return
+        child.connected = True
+        child.last_message_monotonic = self.last_message_monotonic
+        await child._handle_message(data['data'])
+
+    async def stop(self):
+        """Oprește conexiunea și feed-urile copil"""
+        for child in self._streams.values():
+            if child.running:
+                await child.stop()
+        await super().stop()
+
+
+def stream_symbol(symbol: str) -> str:
+    """BTCUSDT / btc -> btcusdt (forma din numele stream-urilor Binance)"""
+    return symbol.lower().replace('usdt', '') + 'usdt'
 
 
 class LiveTradingRunner:
@@ -221,43 +412,75 @@ class LiveTradingRunner:
 
     HEALTH_CHECK_INTERVAL = 30  # Check health every 30 seconds
     DATA_TIMEOUT = 120  # Consider stale if no data for 2 minutes
+    SIGNAL_LOG_QUEUE_SIZE = 1024  # SignalEvent-uri în așteptarea scrierii pe disc
+    SIGNAL_LOG_DRAIN_TIMEOUT = 5  # Secunde acordate golirii cozii la stop()
 
-    def __init__(self, symbol: str = "BTCUSDT", interval: str = "1m"):
+    def __init__(self, symbol: str = "BTCUSDT", interval: str = "1m",
+                 shared_feed: Optional[BinanceMultiStreamFeed] = None):
         self.symbol = symbol
         self.interval = interval
+        # Slot-ul runner-ului în topology_engine (partajat între runner-e)
+        self._stream_key = f"{symbol}@{interval}"
 
         # Components
         self.data_feed: Optional[BinanceLiveDataFeed] = None
+        # Conexiune partajată cu alte timeframe-uri (pornită/oprită de proprietar)
+        self._shared_feed = shared_feed
         self.trading_manager: Optional[PaperTradingManager] = None
         self.signal_logger = get_signal_logger()
+        # Engine propriu: istoricul delta (streaming) și ultimul IFI sunt per runner,
+        # nu partajate între timeframe-urile aceluiași simbol
+        self.signals_engine = SignalsEngine()
+        self._signals_backfilled = False
 
         # State
         self.running = False
         self.last_signal: Optional[Dict] = None
         self.last_signal_id: Optional[str] = None  # Track for linking trades
         self.signal_history: List[Dict] = []
+        # ID-uri de semnal: prefix aleator per runner + contor (fără uuid4 per semnal)
+        self._signal_id_prefix = uuid.uuid4().hex[:12]
+        self._signal_seq = count()
 
         # WebSocket clients for frontend
-        self.ws_clients: List = []
+        self.ws_clients: set = set()
+        # Mesajul 'update' e reutilizat între bare; _broadcast îl serializează
+        # înainte de primul await, deci mutațiile ulterioare nu afectează trimiterea
+        self._update_message: Dict[str, Any] = {
+            'type': 'update',
+            'symbol': symbol,
+            'interval': interval,
+            'bar': None,
+            'bars_processed': 0,
+            'topology': None,
+            'predictive': None,
+            'signals': None,
+            'stats': None,
+            'balance': 0,
+        }
 
         # Stats
         self.bars_processed = 0
         self.signals_generated = 0
         self.trades_executed = 0
 
-        # Health monitoring
-        self._health_task: Optional[asyncio.Task] = None
+        # Health monitoring (prin _HEALTH_MONITOR, partajat de toate runner-ele)
         self._last_bar_time: Optional[datetime] = None
+
+        # Signal logging: o coadă mărginită + un singur drainer (nu un task per semnal)
+        self._signal_log_queue: asyncio.Queue = asyncio.Queue(maxsize=self.SIGNAL_LOG_QUEUE_SIZE)
+        self._signal_log_task: Optional[asyncio.Task] = None
+        self.signal_logs_dropped = 0
     
     async def start(self):
         """Porneste live trading"""
-        print("\n" + "=" * 60)
-        print("[LIVE] LIVE TRADING MODE - OIE MVP")
-        print("=" * 60)
-        print(f"   Symbol: {self.symbol}")
-        print(f"   Interval: {self.interval}")
-        print(f"   Mode: Paper Trading (Binance Testnet)")
-        print("=" * 60)
+        logger.info("\n" + "=" * 60)
+        logger.info("[LIVE] LIVE TRADING MODE - OIE MVP")
+        logger.info("=" * 60)
+        logger.info("   Symbol: %s", self.symbol)
+        logger.info("   Interval: %s", self.interval)
+        logger.info("   Mode: Paper Trading (Binance Testnet)")
+        logger.info("=" * 60)
         
         # Initialize trading manager - uses defaults from TradingConfig
         config = TradingConfig(
@@ -271,14 +494,17 @@ class LiveTradingRunner:
         
         self.trading_manager = PaperTradingManager(config)
         if not await self.trading_manager.start():
-            print("[ERROR] Failed to start trading manager")
+            logger.error("[ERROR] Failed to start trading manager")
             return False
         
         # Initialize data feed
-        self.data_feed = BinanceLiveDataFeed(
-            symbol=self.symbol.lower().replace('usdt', '') + 'usdt',
-            interval=self.interval
-        )
+        if self._shared_feed is not None:
+            self.data_feed = await self._shared_feed.subscribe(self.interval)
+        else:
+            self.data_feed = BinanceLiveDataFeed(
+                symbol=stream_symbol(self.symbol),
+                interval=self.interval
+            )
         self.data_feed.on_bar(self._on_new_bar)
         
         self.running = True
@@ -288,49 +514,70 @@ class LiveTradingRunner:
             try:
                 await self.data_feed.start()
             except Exception as e:
-                print(f"[ERROR] Data feed crashed: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("[ERROR] Data feed crashed: %s", e)
 
-        asyncio.create_task(run_data_feed())
+        if self._shared_feed is None:
+            asyncio.create_task(run_data_feed())
 
         # Start health monitor
-        self._health_task = asyncio.create_task(self._health_monitor())
+        _HEALTH_MONITOR.register(self)
+        self._signal_log_task = asyncio.create_task(self._drain_signal_log())
 
-        print("\n[OK] Live trading started!")
-        print("   Waiting for signals...\n")
+        logger.info("\n[OK] Live trading started!")
+        logger.info("   Waiting for signals...\n")
 
         return True
 
-    async def _health_monitor(self):
-        """Monitor health and auto-recover connections"""
-        print(f"[HEALTH] {self.symbol} health monitor started")
-
-        while self.running:
+    def _queue_signal_log(self, event: SignalEvent):
+        """Pune evenimentul în coada de logging; la coadă plină îl aruncă și îl numără"""
+        try:
+            self._signal_log_queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.signal_logs_dropped += 1
+
+    async def _drain_signal_log(self):
+        """Scrie evenimentele din coadă, unul câte unul, pe durata runner-ului"""
+        while True:
+            event = await self._signal_log_queue.get()
             try:
-                await asyncio.sleep(self.HEALTH_CHECK_INTERVAL)
-
-                if not self.running:
-                    break
-
-                # Check data feed health
-                data_ok = self._check_data_feed_health()
-                trading_ok = self._check_trading_health()
+                await self.signal_logger.log_signal(event)
+            finally:
+                self._signal_log_queue.task_done()
+
+    async def _stop_signal_log(self):
+        """Golește coada (cu timeout) și oprește drainer-ul"""
+        task = self._signal_log_task
+        if task is None or task.done():
+            return
+        try:
+            await asyncio.wait_for(self._signal_log_queue.join(), timeout=self.SIGNAL_LOG_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("[WARN] %s signal log not drained: %s events lost",
+                           self.symbol, self._signal_log_queue.qsize())
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        self._signal_log_task = None
 
-                if not data_ok:
-                    print(f"[HEALTH] {self.symbol} data feed unhealthy - attempting recovery...")
-                    await self._recover_data_feed()
+    async def _check_health(self):
+        """O verificare de health + auto-recover (apelată periodic de _HEALTH_MONITOR)"""
+        try:
+            # Check data feed health
+            data_ok = self._check_data_feed_health()
+            trading_ok = self._check_trading_health()
 
-                if not trading_ok:
-                    print(f"[HEALTH] {self.symbol} trading connection unhealthy - attempting recovery...")
-                    await self._recover_trading()
+            if not data_ok:
+                logger.warning("[HEALTH] %s data feed unhealthy - attempting recovery...", self.symbol)
+                await self._recover_data_feed()
 
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                print(f"[HEALTH] {self.symbol} monitor error: {e}")
+            if not trading_ok:
+                logger.warning("[HEALTH] %s trading connection unhealthy - attempting recovery...", self.symbol)
+                await self._recover_trading()
 
-        print(f"[HEALTH] {self.symbol} health monitor stopped")
+        except Exception as e:
+            logger.warning("[HEALTH] %s monitor error: %s", self.symbol, e)
 
     def _check_data_feed_health(self) -> bool:
         """Check if data feed is healthy"""
@@ -342,10 +589,10 @@ class LiveTradingRunner:
             return False
 
         # Check if receiving data (last message within timeout)
-        if self.data_feed.last_message_time:
-            elapsed = (datetime.now() - self.data_feed.last_message_time).total_seconds()
+        if self.data_feed.last_message_monotonic is not None:
+            elapsed = time.monotonic() - self.data_feed.last_message_monotonic
             if elapsed > self.DATA_TIMEOUT:
-                print(f"[HEALTH] {self.symbol} no data for {elapsed:.0f}s")
+                logger.warning("[HEALTH] %s no data for %.0fs", self.symbol, elapsed)
                 return False
 
         return True
@@ -370,9 +617,9 @@ class LiveTradingRunner:
                 # Force reconnect by marking as not connected
                 # The auto-reconnect in BinanceLiveDataFeed will handle it
                 self.data_feed.connected = False
-                print(f"[RECOVER] {self.symbol} data feed recovery initiated")
+                logger.info("[RECOVER] %s data feed recovery initiated", self.symbol)
         except Exception as e:
-            print(f"[RECOVER] {self.symbol} data feed recovery failed: {e}")
+            logger.warning("[RECOVER] %s data feed recovery failed: %s", self.symbol, e)
 
     async def _recover_trading(self):
         """Attempt to recover trading connection"""
@@ -381,25 +628,20 @@ class LiveTradingRunner:
                 # Try to reconnect
                 connected = await self.trading_manager.connector.connect()
                 if connected:
-                    print(f"[RECOVER] {self.symbol} trading connection restored")
+                    logger.info("[RECOVER] %s trading connection restored", self.symbol)
                 else:
-                    print(f"[RECOVER] {self.symbol} trading reconnect failed")
+                    logger.warning("[RECOVER] %s trading reconnect failed", self.symbol)
         except Exception as e:
-            print(f"[RECOVER] {self.symbol} trading recovery failed: {e}")
+            logger.warning("[RECOVER] %s trading recovery failed: %s", self.symbol, e)
     
     async def stop(self):
         """Opreste live trading"""
-        print("\n[STOP] Stopping live trading...")
+        logger.info("\n[STOP] Stopping live trading...")
 
         self.running = False
 
         # Stop health monitor
-        if self._health_task and not self._health_task.done():
-            self._health_task.cancel()
-            try:
-                await self._health_task
-            except asyncio.CancelledError:
-                pass
+        await _HEALTH_MONITOR.unregister(self)
 
         if self.data_feed:
             await self.data_feed.stop()
@@ -407,33 +649,58 @@ class LiveTradingRunner:
         if self.trading_manager:
             await self.trading_manager.stop()
 
-        print("[OK] Live trading stopped")
+        await self._stop_signal_log()
+
+        logger.info("[OK] Live trading stopped")
         self._print_summary()
     
+    def _next_signal_id(self) -> str:
+        """ID unic de semnal: <prefix runner><contor hex pe 16 cifre>"""
+        return f"{self._signal_id_prefix}{next(self._signal_seq):016x}"
+
+    def _run_engines(self, bar: LiveBar, frame: BarFrame):
+        """Topology + Predictive + Signals pe fereastra curentă (rulează în _ENGINE_EXECUTOR)"""
+        with _engine_lock(self.symbol):
+            # Slot propriu per timeframe: runner-ele 5m/15m pe același simbol nu-și
+            # suprascriu starea incrementală și cache-ul din topology_engine
+            topology_snapshot = topology_engine.compute(symbol=self.symbol, bars=frame, stream=self._stream_key)
+            predictive_snapshot = predictive_engine.compute(symbol=self.symbol, bars=frame)
+
+        # Delta trend: backfill o singură dată, apoi doar bara nouă
+        if self._signals_backfilled:
+            self.signals_engine.append_bar(self.symbol, bar.to_bar())
+        else:
+            self.signals_engine.update_bars(self.symbol, frame)
+            self._signals_backfilled = True
+
+        signals = self.signals_engine.compute(
+            symbol=self.symbol,
+            topology=topology_snapshot,
+            predictive=predictive_snapshot,
+        )
+        return topology_snapshot, predictive_snapshot, signals
+
     async def _on_new_bar(self, bar: LiveBar):
         """Handler pentru bara nouă"""
         self.bars_processed += 1
         
-        # Get window of bars
-        bars = self.data_feed.get_bars(50)
+        # Get window of bars (direct columnar din ring buffer)
+        frame = self.data_feed.get_frame(50)
         
-        if len(bars) < 5:
-            print(f"[WAIT] Collecting bars... ({len(bars)}/5)")
+        if len(frame) < 5:
+            logger.info("[WAIT] Collecting bars... (%s/5)", len(frame))
             return
         
-        # Run OIE engines
+        # Run OIE engines (în afara event loop-ului - WebSocket-urile continuă să fie servite)
         try:
-            topology_snapshot = topology_engine.compute(symbol=self.symbol, bars=bars)
-            predictive_snapshot = predictive_engine.compute(symbol=self.symbol, bars=bars)
-            signals = signals_engine.compute(
-                symbol=self.symbol,
-                topology=topology_snapshot,
-                predictive=predictive_snapshot,
-                bars=bars  # Pentru delta trend calculation
+            topology_snapshot, predictive_snapshot, signals = await asyncio.get_running_loop().run_in_executor(
+                _ENGINE_EXECUTOR, self._run_engines, bar, frame
             )
             
-            # Log current state
-            current_time = datetime.now().strftime("%H:%M:%S")
+            # Log current state (un singur datetime.now() per bară; formatat doar la nevoie)
+            now = datetime.now()
+            # Argumentele log-urilor (strftime, pos_info) se construiesc doar dacă INFO e activ
+            log_info = logger.isEnabledFor(logging.INFO)
             price = bar.close
             delta = bar.delta
             ifi = predictive_snapshot.IFI
@@ -442,39 +709,36 @@ class LiveTradingRunner:
 
             # Determine delta trend and regime
             delta_trend = "NEUTRAL"
-            if hasattr(signals_engine, '_compute_delta_trend'):
-                trend_result = signals_engine._compute_delta_trend(self.symbol)
+            if hasattr(self.signals_engine, '_compute_delta_trend'):
+                trend_result = self.signals_engine._compute_delta_trend(self.symbol)
                 delta_trend = trend_result[0] if trend_result else "NEUTRAL"
 
+            pending: List[Dict[str, Any]] = []  # mesaje pentru frontend, trimise o dată la final
+
             # Process ALL signals and log them
             for signal in signals:
                 sig_type = signal.type
                 confidence = signal.confidence
                 desc = getattr(signal, 'description', '')
 
-                # Determine signal type for logging
-                is_neutral = 'watch' in sig_type or 'neutral' in sig_type
-                is_long = 'long' in sig_type.lower()
-                is_short = 'short' in sig_type.lower()
+                # Determine signal type for logging (NONE / LONG / SHORT)
+                signal_type_str = _classify_signal(sig_type)
+                is_neutral = signal_type_str == "NONE"
+                is_long = signal_type_str == "LONG"
 
                 if is_neutral:
-                    signal_type_str = "NONE"
                     # Log neutral signals periodically
-                    if self.bars_processed % 5 == 0:
-                        print(f"[{current_time}] {self.symbol} | ${price:,.2f} | bp_up={bp_up:.0%} bp_down={bp_down:.0%} | {desc[:50]}")
-                elif is_long:
-                    signal_type_str = "LONG"
-                else:
-                    signal_type_str = "SHORT"
+                    if log_info and self.bars_processed % 5 == 0:
+                        logger.info("[%s] %s | $%.2f | bp_up=%.0f%% bp_down=%.0f%% | %s", now.strftime("%H:%M:%S"), self.symbol, price, bp_up * 100, bp_down * 100, desc[:50])
 
                 # Skip neutral for trade execution, but still log them periodically
                 if is_neutral:
                     # Log neutral signals less frequently to avoid spam
                     if self.bars_processed % 10 == 0:
-                        signal_id = str(uuid.uuid4())
+                        signal_id = self._next_signal_id()
                         signal_event = SignalEvent(
                             id=signal_id,
-                            ts=datetime.now().isoformat(),
+                            ts=now.isoformat(),
                             symbol=self.symbol,
                             timeframe=self.interval,
                             signal_type=signal_type_str,
@@ -487,19 +751,19 @@ class LiveTradingRunner:
                             reason=desc or "Neutral - no actionable signal",
                             meta={"bp_up": bp_up, "bp_down": bp_down, "price": price}
                         )
-                        asyncio.create_task(self.signal_logger.log_signal(signal_event))
+                        self._queue_signal_log(signal_event)
                     continue
 
                 # Actionable signal (LONG or SHORT)
                 self.signals_generated += 1
-                signal_id = str(uuid.uuid4())
+                signal_id = self._next_signal_id()
                 self.last_signal_id = signal_id
 
                 self.last_signal = {
                     'id': signal_id,
                     'type': sig_type,
                     'confidence': confidence,
-                    'timestamp': datetime.now().isoformat(),
+                    'timestamp': now.isoformat(),
                     'price': price,
                     'ifi': ifi,
                     'delta': delta
@@ -507,14 +771,15 @@ class LiveTradingRunner:
                 self.signal_history.append(self.last_signal)
 
                 # Print signal
-                marker = "[LONG]" if is_long else "[SHORT]"
-                direction = "LONG" if is_long else "SHORT"
+                if log_info:
+                    marker = "[LONG]" if is_long else "[SHORT]"
+                    direction = "LONG" if is_long else "SHORT"
 
-                print(f"\n{marker} [{current_time}] SIGNAL: {direction}")
-                print(f"   Confidence: {confidence:.2%}")
-                print(f"   Price: ${price:,.2f}")
-                print(f"   Delta: {delta:+.1f}")
-                print(f"   IFI: {ifi:.2f}")
+                    logger.info("\n%s [%s] SIGNAL: %s", marker, now.strftime("%H:%M:%S"), direction)
+                    logger.info("   Confidence: %.2f%%", confidence * 100)
+                    logger.info("   Price: $%.2f", price)
+                    logger.info("   Delta: %+.1f", delta)
+                    logger.info("   IFI: %.2f", ifi)
 
                 # Execute trade
                 result = await self.trading_manager.process_signal({
@@ -529,7 +794,7 @@ class LiveTradingRunner:
                     self.trades_executed += 1
                     decision = "EXECUTED"
                     linked_trade_id = result.order_id if result else None
-                    print(f"   [OK] Trade executed @ ${result.price:,.2f}")
+                    logger.info("   [OK] Trade executed @ $%.2f", result.price)
                 else:
                     # Check why it wasn't executed
                     if confidence < self.trading_manager.config.min_confidence:
@@ -546,7 +811,7 @@ class LiveTradingRunner:
                 # Log signal event
                 signal_event = SignalEvent(
                     id=signal_id,
-                    ts=datetime.now().isoformat(),
+                    ts=now.isoformat(),
                     symbol=self.symbol,
                     timeframe=self.interval,
                     signal_type=signal_type_str,
@@ -560,63 +825,70 @@ class LiveTradingRunner:
                     linked_trade_id=linked_trade_id,
                     meta={"bp_up": bp_up, "bp_down": bp_down, "price": price}
                 )
-                asyncio.create_task(self.signal_logger.log_signal(signal_event))
-
-                # Broadcast to frontend
-                await self._broadcast({
-                    'type': 'signal',
-                    'signal': self.last_signal,
-                    'position': self.trading_manager.current_trade.to_dict() if self.trading_manager.current_trade else None
-                })
+                self._queue_signal_log(signal_event)
+
+                # Broadcast to frontend (trimis împreună cu update-ul, la finalul barei)
+                if self.ws_clients:
+                    pending.append({
+                        'type': 'signal',
+                        'signal': self.last_signal,
+                        'position': self.trading_manager.current_trade.to_dict() if self.trading_manager.current_trade else None
+                    })
             
             # Periodic status (every 10 bars)
-            if self.bars_processed % 10 == 0:
+            if log_info and self.bars_processed % 10 == 0:
                 status = "[INFO]" if not self.trading_manager.current_trade else "[POS]"
                 pos_info = ""
                 if self.trading_manager.current_trade:
                     pos = self.trading_manager.current_trade
                     pos_info = f" | Position: {pos.direction} @ ${pos.entry_price:,.2f}"
                 
-                print(f"{status} [{current_time}] ${price:,.2f} | D {delta:+.1f} | IFI {ifi:.2f}{pos_info}")
+                logger.info("%s [%s] $%.2f | D %+.1f | IFI %.2f%s", status, now.strftime("%H:%M:%S"), price, delta, ifi, pos_info)
             
             # Check position status (SL/TP)
             await self.trading_manager.check_position_status()
             
             # Broadcast update to frontend
-            await self._broadcast({
-                'type': 'update',
-                'symbol': self.symbol,
-                'interval': self.interval,
-                'bar': bar.to_dict(),
-                'bars_processed': self.bars_processed,
-                'topology': topology_snapshot.model_dump(mode='json'),
-                'predictive': predictive_snapshot.model_dump(mode='json'),
-                'signals': [s.model_dump(mode='json') for s in signals],
-                'stats': self.trading_manager.get_stats(),
-                'balance': self.trading_manager.connector.balance if self.trading_manager.connector else 0
-            })
+            if self.ws_clients:
+                update = self._update_message
+                update['bar'] = bar.to_dict()
+                update['bars_processed'] = self.bars_processed
+                update['topology'] = topology_snapshot
+                update['predictive'] = predictive_snapshot
+                update['signals'] = signals
+                update['stats'] = self.trading_manager.get_stats()
+                update['balance'] = self.trading_manager.connector.balance if self.trading_manager.connector else 0
+                pending.append(update)
+
+            # Un singur mesaj per bară: update-ul simplu, sau 'batch' când bara a produs și semnale
+            if len(pending) == 1:
+                await self._broadcast(pending[0])
+            elif pending:
+                await self._broadcast({'type': 'batch', 'items': pending})
             
         except Exception as e:
-            print(f"[ERROR] Error processing bar: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[ERROR] Error processing bar: %s", e)
     
     async def _broadcast(self, message: Dict):
-        """Broadcast mesaj la toate clientele WebSocket"""
-        for ws in self.ws_clients:
-            try:
-                await ws.send_json(message)
-            except:
-                self.ws_clients.remove(ws)
+        """Broadcast mesaj la toate clientele WebSocket (serializat o dată, trimis în paralel)"""
+        if not self.ws_clients:
+            return
+        payload = json_codec.dumps_str(message, default=_json_default)
+        clients = tuple(self.ws_clients)
+        results = await asyncio.gather(
+            *(ws.send_text(payload) for ws in clients), return_exceptions=True
+        )
+        dead = [ws for ws, result in zip(clients, results) if isinstance(result, Exception)]
+        if dead:
+            self.ws_clients.difference_update(dead)
     
     def add_ws_client(self, ws):
         """Adaugă client WebSocket"""
-        self.ws_clients.append(ws)
+        self.ws_clients.add(ws)
     
     def remove_ws_client(self, ws):
         """Elimină client WebSocket"""
-        if ws in self.ws_clients:
-            self.ws_clients.remove(ws)
+        self.ws_clients.discard(ws)
     
     def get_status(self) -> Dict[str, Any]:
         """Returnează status curent"""
@@ -634,18 +906,60 @@ class LiveTradingRunner:
     
     def _print_summary(self):
         """Printeaza sumar la final"""
-        print("\n" + "=" * 60)
-        print("[SUMMARY] LIVE TRADING SUMMARY")
-        print("=" * 60)
-        print(f"   Bars processed: {self.bars_processed}")
-        print(f"   Signals generated: {self.signals_generated}")
-        print(f"   Trades executed: {self.trades_executed}")
+        logger.info("\n" + "=" * 60)
+        logger.info("[SUMMARY] LIVE TRADING SUMMARY")
+        logger.info("=" * 60)
+        logger.info("   Bars processed: %s", self.bars_processed)
+        logger.info("   Signals generated: %s", self.signals_generated)
+        logger.info("   Trades executed: %s", self.trades_executed)
         
         if self.trading_manager:
             stats = self.trading_manager.get_stats()
-            print(f"\n   Total P&L: ${stats['total_pnl']:,.2f}")
-            print(f"   Win Rate: {stats['win_rate']}%")
-        print("=" * 60)
+            logger.info("\n   Total P&L: $%.2f", stats['total_pnl'])
+            logger.info("   Win Rate: %s%%", stats['win_rate'])
+        logger.info("=" * 60)
+
+
+class _SharedHealthMonitor:
+    """
+    Un singur task periodic pentru health-ul tuturor runner-elor active.
+
+    Înlocuiește task-ul per runner: un timer la HEALTH_CHECK_INTERVAL, iar
+    verificările runner-elor (și eventualele recover-uri) rulează concurent.
+    """
+
+    def __init__(self):
+        self.runners: set = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, runner: LiveTradingRunner):
+        self.runners.add(runner)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def unregister(self, runner: LiveTradingRunner):
+        self.runners.discard(runner)
+        if not self.runners and self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        logger.info("[HEALTH] Health monitor started")
+        try:
+            while self.runners:
+                await asyncio.sleep(LiveTradingRunner.HEALTH_CHECK_INTERVAL)
+                await asyncio.gather(*(
+                    runner._check_health() for runner in tuple(self.runners) if runner.running
+                ))
+        finally:
+            logger.info("[HEALTH] Health monitor stopped")
+
+
+_HEALTH_MONITOR = _SharedHealthMonitor()
 
 
 # Singleton
@@ -682,5 +996,7 @@ async def run_live_trading(duration_minutes: int = 60):
 
 
 if __name__ == '__main__':
+    # Event loop pe libuv pentru feed-urile WebSocket; asyncio.run preia policy-ul
+    install_uvloop()
     # Run for 60 minutes by default
     asyncio.run(run_live_trading(60))
@@ -3,12 +3,15 @@ OIE MVP - Multi-Timeframe Live Trading
 =======================================
 
 Suport pentru multiple timeframe-uri (1m, 5m, 15m).
-Fiecare timeframe rulează independent cu propria instanță.
+Fiecare timeframe rulează independent cu propria instanță; timeframe-urile
+aceluiași simbol împart o singură conexiune WebSocket (combined stream).
 """
 
 import asyncio
 from typing import Dict, Optional
-from backend.trading.live_runner import LiveTradingRunner, run_live_trading
+from backend.trading.live_runner import (
+    BinanceMultiStreamFeed, LiveTradingRunner, run_live_trading, stream_symbol
+)
 
 
 class MultiTimeframeRunner:
@@ -26,6 +29,22 @@ class MultiTimeframeRunner:
     def __init__(self):
         self.runners: Dict[str, LiveTradingRunner] = {}
         self.tasks: Dict[str, asyncio.Task] = {}
+        # Un feed (un socket) per simbol, partajat de toate timeframe-urile lui
+        self.feeds: Dict[str, BinanceMultiStreamFeed] = {}
+
+    def _get_feed(self, symbol: str) -> BinanceMultiStreamFeed:
+        key = stream_symbol(symbol)
+        feed = self.feeds.get(key)
+        if feed is None:
+            feed = BinanceMultiStreamFeed(symbol=key)
+            self.feeds[key] = feed
+        return feed
+
+    def _ensure_feed_running(self, feed: BinanceMultiStreamFeed):
+        """Conexiunea pornește după primul subscribe (URL-ul conține stream-urile)"""
+        task = self.tasks.get(feed.symbol)
+        if task is None or task.done():
+            self.tasks[feed.symbol] = asyncio.create_task(feed.start())
     
     async def start_timeframe(self, interval: str, symbol: str = "BTCUSDT") -> bool:
         """Pornește trading pe un timeframe specific"""
@@ -38,11 +57,13 @@ class MultiTimeframeRunner:
             print(f"⚠️ {interval} already running")
             return False
         
-        runner = LiveTradingRunner(symbol=symbol, interval=interval)
+        feed = self._get_feed(symbol)
+        runner = LiveTradingRunner(symbol=symbol, interval=interval, shared_feed=feed)
         self.runners[interval] = runner
         
         # Start in background
         if await runner.start():
+            self._ensure_feed_running(feed)
             print(f"✅ Started {symbol} {interval} trading")
             return True
         
@@ -59,6 +80,14 @@ class MultiTimeframeRunner:
         """Oprește toate timeframe-urile"""
         for interval in list(self.runners.keys()):
             await self.stop_timeframe(interval)
+
+        for feed in self.feeds.values():
+            await feed.stop()
+        for task in self.tasks.values():
+            task.cancel()
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+        self.feeds.clear()
+        self.tasks.clear()
     
     def get_status(self) -> Dict:
         """Returnează status pentru toate timeframe-urile"""
@@ -95,13 +124,10 @@ async def run_multi_timeframe(duration_minutes: int = 120):
     print("🔴 MULTI-TIMEFRAME LIVE TRADING")
     print("=" * 60)
     
-    runner_1m = LiveTradingRunner(symbol="BTCUSDT", interval="1m")
-    runner_5m = LiveTradingRunner(symbol="BTCUSDT", interval="5m")
-    
-    # Start both
-    await runner_1m.start()
-    await asyncio.sleep(2)  # Small delay
-    await runner_5m.start()
+    # Ambele timeframe-uri pe același WebSocket
+    runner = MultiTimeframeRunner()
+    await runner.start_timeframe("1m")
+    await runner.start_timeframe("5m")
     
     print(f"\n⏰ Running multi-timeframe for {duration_minutes} minutes...")
     print("   Active: 1m, 5m")
@@ -112,8 +138,7 @@ async def run_multi_timeframe(duration_minutes: int = 120):
     except KeyboardInterrupt:
         print("\n\n⚠️ Interrupted by user")
     finally:
-        await runner_1m.stop()
-        await runner_5m.stop()
+        await runner.stop_all()
 
 
 if __name__ == '__main__':
@@ -12,6 +12,7 @@ Gestionează trading-ul automat bazat pe semnalele OIE.
 import os
 import asyncio
 import logging
+import time
 import uuid
 from datetime import datetime
 from typing import Optional, Dict, Any, List
@@ -20,12 +21,13 @@ from enum import Enum
 import json
 from pathlib import Path
 
-logger = logging.getLogger(__name__)
-
 from dotenv import load_dotenv
 
+from backend.services import json_codec
+from backend.services.console_log import install_queue_logging
 from backend.trading.binance_connector import (
     BinanceTestnetConnector,
+    DEFAULT_SYMBOL_INFO,
     get_connector,
     TradeResult,
     Position
@@ -34,8 +36,40 @@ from backend.services.trade_logger import get_trade_logger, TradeEvent
 
 load_dotenv()
 
-
-@dataclass
+logger = install_queue_logging(logging.getLogger(__name__))
+
+# Direcția pe tip de semnal (SignalsEngine); None = fără direcție, filtrat înainte de orice I/O
+_SIGNAL_DIRECTION: Dict[str, Optional[str]] = {
+    "predictive_breakout_long": "LONG",
+    "predictive_breakout_short": "SHORT",
+    "flow_neutral_watch": None,
+}
+
+
+def _signal_direction(signal_type: str) -> Optional[str]:
+    """LONG / SHORT / None pentru un tip de semnal (tipurile noi se clasifică o dată)"""
+    try:
+        return _SIGNAL_DIRECTION[signal_type]
+    except KeyError:
+        pass
+    # Tip necunoscut: aceleași reguli ca înainte, pe subșiruri
+    lowered = signal_type.lower()
+    if 'watch' in signal_type or 'neutral' in signal_type:
+        direction = None
+    elif 'long' in lowered:
+        direction = "LONG"
+    elif 'short' in lowered:
+        direction = "SHORT"
+    else:
+        direction = None
+    _SIGNAL_DIRECTION[signal_type] = direction
+    return direction
+
+# Semnul direcției: PnL = (exit - entry) * qty * semn, aceeași formulă pentru LONG și SHORT
+_SIDE_SIGN = {'LONG': 1.0, 'SHORT': -1.0}
+
+
+@dataclass(slots=True, frozen=True)
 class TradingConfig:
     """Configurație trading - OPTIMIZAT pe baza backtest-ului
 
@@ -71,7 +105,7 @@ class TradingConfig:
     trading_enabled: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeLog:
     """Log entry pentru un trade"""
     timestamp: datetime
@@ -89,6 +123,12 @@ class TradeLog:
     exit_price: Optional[float] = None
     exit_time: Optional[datetime] = None
     pnl: float = 0.0
+    # Ceas monoton la deschidere - cooldown-ul nu depinde de salturile ceasului de perete
+    opened_monotonic: float = field(default_factory=time.monotonic, repr=False)
+
+    @property
+    def side_sign(self) -> float:
+        return _SIDE_SIGN[self.direction]
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -110,73 +150,135 @@ class TradeLog:
         }
 
 
+def _read_log_entries(path: Path, lines):
+    """
+    Intrările valide dintr-un log zilnic. Liniile goale sunt sărite, iar o linie
+    care nu se decodează (ex. ultima, trunchiată de o oprire bruscă) e raportată
+    și ignorată - un singur rând stricat nu trebuie să blocheze _save_stats.
+    """
+    for line_no, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json_codec.loads(line)
+        except ValueError as e:
+            logger.warning("[WARNING] Skipping unreadable line %d in %s: %s", line_no, path.name, e)
+
+
 class PaperTradingManager:
     """
     Manager pentru paper trading automat
     
     Primește semnale de la OIE și execută trades pe Binance Testnet.
     """
+
+    LOG_BATCH_SIZE = 64  # Intrări de trade log scrise într-un singur append
+    LOG_DRAIN_TIMEOUT = 5  # Secunde acordate golirii cozii de log la stop()
+    TRADE_EVENT_QUEUE_SIZE = 1000  # TradeEvent-uri în așteptarea trade_logger-ului
+    STATS_HISTORY_LIMIT = 100  # Trade-uri închise incluse în stats.json
     
     def __init__(self, config: TradingConfig = None):
         self.config = config or TradingConfig()
+        # Multiplicatori SL/TP per direcție, calculați o dată (config-ul e imutabil)
+        sl_frac = self.config.stop_loss_pct / 100
+        tp_frac = self.config.take_profit_pct / 100
+        self._sl_frac = sl_frac
+        self._sl_tp_mult = {
+            'LONG': (1 - sl_frac, 1 + tp_frac),
+            'SHORT': (1 + sl_frac, 1 - tp_frac),
+        }
         self.connector: Optional[BinanceTestnetConnector] = None
+        # Filtrele simbolului (min qty) nu se schimbă în timpul rulării - citite la start()
+        self._min_qty: float = DEFAULT_SYMBOL_INFO['min_qty']
 
         self.current_trade: Optional[TradeLog] = None
-        self.trade_history: List[TradeLog] = []
+        # Istoricul trade-urilor închise stă doar în log-urile zilnice (vezi load_history)
 
         self.is_running: bool = False
         self.last_signal_time: Optional[datetime] = None
+        # Ordine orfane pot rămâne doar de la o rulare anterioară: verificate o dată, nu la fiecare bară
+        self._orphan_check_pending: bool = True
 
         # Stats
         self.total_trades: int = 0
         self.winning_trades: int = 0
         self.total_pnl: float = 0.0
 
-        # Trade logger for persistent logging
+        # Trade logger for persistent logging (o coadă mărginită + un singur consumator)
         self.trade_logger = get_trade_logger()
+        self._trade_event_queue: asyncio.Queue = asyncio.Queue(maxsize=self.TRADE_EVENT_QUEUE_SIZE)
+        self._trade_event_task: Optional[asyncio.Task] = None
 
         # Log file
         self.log_dir = Path(__file__).parent.parent.parent / "results" / "paper_trading"
         self.log_dir.mkdir(parents=True, exist_ok=True)
+        # Scrierea pe disc se face în _drain_log_queue, nu pe calea de execuție a trade-ului
+        self._log_queue: asyncio.Queue = asyncio.Queue()
+        self._log_writer_task: Optional[asyncio.Task] = None
     
     async def start(self):
         """Porneste trading manager"""
-        print("\n" + "=" * 60)
-        print("[PAPER] OIE Paper Trading Manager")
-        print("=" * 60)
+        logger.info("\n" + "=" * 60)
+        logger.info("[PAPER] OIE Paper Trading Manager")
+        logger.info("=" * 60)
 
         self.connector = get_connector()
 
         if not await self.connector.connect():
-            print("[ERROR] Failed to connect to Binance Testnet")
+            logger.error("[ERROR] Failed to connect to Binance Testnet")
             return False
 
-        # Set leverage
-        await self.connector.set_leverage(self.config.symbol, self.config.leverage)
+        # Set leverage; prețul vine din bookTicker (memorie), nu din REST la fiecare bară
+        _, _, symbol_info = await asyncio.gather(
+            self.connector.set_leverage(self.config.symbol, self.config.leverage),
+            self.connector.subscribe_ticker(self.config.symbol),
+            self.connector.get_symbol_info(self.config.symbol)
+        )
+        self._min_qty = symbol_info.get('min_qty', self._min_qty)
 
         # Sync existing position from Binance
         await self._sync_existing_position()
 
         self.is_running = True
-        print(f"\n[OK] Trading Manager Started")
-        print(f"   Symbol: {self.config.symbol}")
-        print(f"   Leverage: {self.config.leverage}x")
-        print(f"   Max Position Value: ${self.config.max_position_value}")
-        print(f"   SL: {self.config.stop_loss_pct}% | TP: {self.config.take_profit_pct}%")
-        print(f"   Min Confidence: {self.config.min_confidence:.0%}")
-        print(f"   Reversal Protection:")
-        print(f"      - Min confidence for reversal: {self.config.min_reversal_confidence:.0%}")
-        print(f"      - Cooldown after open: {self.config.reversal_cooldown_minutes} min")
-        print(f"      - Never reverse in profit: {self.config.never_reverse_in_profit}")
-        print(f"      - Min loss before reversal: {self.config.min_loss_before_reversal}%")
+        self._log_writer_task = asyncio.create_task(self._drain_log_queue())
+        self._trade_event_task = asyncio.create_task(self._drain_trade_events())
+        config = self.config
+        logger.info("\n[OK] Trading Manager Started")
+        logger.info("   Symbol: %s", config.symbol)
+        logger.info("   Leverage: %sx", config.leverage)
+        logger.info("   Max Position Value: $%s", config.max_position_value)
+        logger.info("   SL: %s%% | TP: %s%%", config.stop_loss_pct, config.take_profit_pct)
+        logger.info("   Min Confidence: %.0f%%", config.min_confidence * 100)
+        logger.info("   Reversal Protection:")
+        logger.info("      - Min confidence for reversal: %.0f%%", config.min_reversal_confidence * 100)
+        logger.info("      - Cooldown after open: %s min", config.reversal_cooldown_minutes)
+        logger.info("      - Never reverse in profit: %s", config.never_reverse_in_profit)
+        logger.info("      - Min loss before reversal: %s%%", config.min_loss_before_reversal)
         if self.current_trade:
-            print(f"   [SYNC] Existing position: {self.current_trade.direction} @ ${self.current_trade.entry_price:,.2f}")
+            logger.info("   [SYNC] Existing position: %s @ $%.2f",
+                        self.current_trade.direction, self.current_trade.entry_price)
 
         return True
 
-    async def _check_reversal_allowed(self, current_position: Position, new_confidence: float) -> tuple:
+    @staticmethod
+    def _calc_pnl(entry_price: float, exit_price: float, quantity: float, side_sign: float) -> float:
+        """PnL în USDT (side_sign: +1 LONG, -1 SHORT)"""
+        return (exit_price - entry_price) * quantity * side_sign
+
+    @staticmethod
+    def _calc_pnl_pct(entry_price: float, price: float, side_sign: float) -> float:
+        """PnL procentual față de intrare (side_sign: +1 LONG, -1 SHORT)"""
+        return (price - entry_price) / entry_price * 100 * side_sign
+
+    def _check_reversal_allowed(self, current_position: Position, new_confidence: float,
+                                current_price: float, now_monotonic: float) -> tuple:
         """
         Verifică dacă putem face reversal pe poziția curentă.
+        Fără I/O și fără ceas propriu: rezultatul depinde doar de argumente și config.
+
+        Args:
+            current_price: prețul deja citit de process_signal (fără un al doilea fetch)
+            now_monotonic: time.monotonic() al apelantului, pentru cooldown
 
         Returns:
             (bool, str): (can_reverse, reason_if_blocked)
@@ -186,19 +288,14 @@ class PaperTradingManager:
             return False, f"confidence {new_confidence:.0%} < {self.config.min_reversal_confidence:.0%} required for reversal"
 
         # 2. Check cooldown period
-        if self.current_trade and self.current_trade.timestamp:
-            time_since_open = (datetime.now() - self.current_trade.timestamp).total_seconds() / 60
+        if self.current_trade:
+            time_since_open = (now_monotonic - self.current_trade.opened_monotonic) / 60
             if time_since_open < self.config.reversal_cooldown_minutes:
                 return False, f"cooldown active ({time_since_open:.1f}min < {self.config.reversal_cooldown_minutes}min)"
 
         # 3. Check position PnL
-        entry = current_position.entry_price
-        current = await self.connector.get_price(self.config.symbol)
-
-        if current_position.side == 'LONG':
-            pnl_pct = ((current - entry) / entry) * 100
-        else:
-            pnl_pct = ((entry - current) / entry) * 100
+        pnl_pct = self._calc_pnl_pct(current_position.entry_price, current_price,
+                                     _SIDE_SIGN[current_position.side])
 
         # STRICT MODE: Never reverse if in profit - let TP/SL handle it
         if pnl_pct > 0 and self.config.never_reverse_in_profit:
@@ -217,24 +314,26 @@ class PaperTradingManager:
 
     async def _sync_existing_position(self):
         """Sincronizează poziția existentă de pe Binance și setează SL/TP dacă lipsesc"""
-        logger.warning(f"[SYNC] Checking for existing position on {self.config.symbol}...")
+        symbol = self.config.symbol
+        connector = self.connector
+        logger.warning("[SYNC] Checking for existing position on %s...", symbol)
 
-        position = await self.connector.get_position(self.config.symbol)
+        position, orders = await asyncio.gather(
+            connector.get_position(symbol),
+            connector.get_open_orders(symbol)
+        )
 
         if position:
-            logger.warning(f"[SYNC] Found existing {position.side} position on {self.config.symbol}")
-            print(f"   Entry: ${position.entry_price:,.2f}")
-            print(f"   Quantity: {position.quantity}")
-            print(f"   Unrealized PnL: ${position.unrealized_pnl:,.2f}")
+            logger.warning("[SYNC] Found existing %s position on %s", position.side, symbol)
+            logger.info("   Entry: $%.2f", position.entry_price)
+            logger.info("   Quantity: %s", position.quantity)
+            logger.info("   Unrealized PnL: $%.2f", position.unrealized_pnl)
 
             # Calculate expected SL/TP based on config
             entry_price = position.entry_price
-            if position.side == 'LONG':
-                expected_sl = entry_price * (1 - self.config.stop_loss_pct / 100)
-                expected_tp = entry_price * (1 + self.config.take_profit_pct / 100)
-            else:  # SHORT
-                expected_sl = entry_price * (1 + self.config.stop_loss_pct / 100)
-                expected_tp = entry_price * (1 - self.config.take_profit_pct / 100)
+            sl_mult, tp_mult = self._sl_tp_mult[position.side]
+            expected_sl = entry_price * sl_mult
+            expected_tp = entry_price * tp_mult
 
             # Create TradeLog for existing position
             self.current_trade = TradeLog(
@@ -247,13 +346,12 @@ class PaperTradingManager:
                 stop_loss=expected_sl,  # Calculate from config
                 take_profit=expected_tp,  # Calculate from config
                 order_id="synced",
-                symbol=self.config.symbol,
+                symbol=symbol,
                 timeframe=self.config.timeframe,
                 status="OPEN"
             )
 
             # Try to get SL/TP from open orders (override calculated values if found)
-            orders = await self.connector.get_open_orders(self.config.symbol)
             has_sl_order = False
             has_tp_order = False
             for order in orders:
@@ -262,19 +360,19 @@ class PaperTradingManager:
                 if 'STOP' in order_type and stop_price > 0:
                     self.current_trade.stop_loss = stop_price
                     has_sl_order = True
-                    print(f"   SL found: ${stop_price:,.2f}")
+                    logger.info("   SL found: $%.2f", stop_price)
                 elif 'PROFIT' in order_type and stop_price > 0:
                     self.current_trade.take_profit = stop_price
                     has_tp_order = True
-                    print(f"   TP found: ${stop_price:,.2f}")
+                    logger.info("   TP found: $%.2f", stop_price)
 
             # Log calculated SL/TP if not found on exchange
             if not has_sl_order:
-                print(f"   SL calculated: ${expected_sl:,.4f} (will be checked manually)")
+                logger.info("   SL calculated: $%.4f (will be checked manually)", expected_sl)
             if not has_tp_order:
-                print(f"   TP calculated: ${expected_tp:,.4f} (will be checked manually)")
+                logger.info("   TP calculated: $%.4f (will be checked manually)", expected_tp)
         else:
-            print(f"[SYNC] No existing position on {self.config.symbol}")
+            logger.info("[SYNC] No existing position on %s", symbol)
     
     async def stop(self, close_positions: bool = False):
         """Opreste trading manager
@@ -283,24 +381,28 @@ class PaperTradingManager:
             close_positions: Dacă True, închide pozițiile deschise.
                            Default False - lasă pozițiile pe Binance pentru re-sync la restart.
         """
-        print("\n[STOP] Stopping Trading Manager...")
+        logger.info("\n[STOP] Stopping Trading Manager...")
 
         # Only close positions if explicitly requested
         if close_positions and self.current_trade:
             await self.close_current_position("manager_stopped")
         elif self.current_trade:
-            print(f"[INFO] Leaving position open on Binance: {self.current_trade.direction} @ ${self.current_trade.entry_price:,.2f}")
-            print(f"       Position will be re-synced on next restart")
+            logger.info("[INFO] Leaving position open on Binance: %s @ $%.2f",
+                        self.current_trade.direction, self.current_trade.entry_price)
+            logger.info("       Position will be re-synced on next restart")
 
         if self.connector:
             await self.connector.disconnect()
 
         self.is_running = False
 
+        await self._stop_log_writer()
+        await self._stop_trade_events()
+
         # Save final stats
         self._save_stats()
 
-        print("[OK] Trading Manager Stopped")
+        logger.info("[OK] Trading Manager Stopped")
     
     async def process_signal(self, signal: Dict[str, Any]) -> Optional[TradeResult]:
         """
@@ -312,83 +414,94 @@ class PaperTradingManager:
         Returns:
             TradeResult dacă s-a executat un trade
         """
+        symbol = self.config.symbol
+        connector = self.connector
         if not self.is_running or not self.config.trading_enabled:
-            print(f"[SKIP] Trading not enabled: is_running={self.is_running}, trading_enabled={self.config.trading_enabled}")
+            logger.debug("[SKIP] Trading not enabled: is_running=%s, trading_enabled=%s",
+                         self.is_running, self.config.trading_enabled)
             return None
 
         signal_type = signal.get('type', '')
         confidence = signal.get('confidence', 0)
-        signal_id = signal.get('signal_id')  # For linking trade to signal
-
-        print(f"[SIGNAL] Processing: {signal_type} with confidence {confidence:.2f} (min: {self.config.min_confidence})")
 
-        # Ignoră semnale neutrale
-        if 'watch' in signal_type or 'neutral' in signal_type:
-            print(f"[SKIP] Neutral signal ignored: {signal_type}")
+        # Filtrele (fără await și fără output) înaintea oricărei alte lucrări;
+        # semnalele respinse se loghează doar la nivel DEBUG
+        # Ignoră semnale neutrale (sau fără direcție)
+        direction = _signal_direction(signal_type)
+        if direction is None:
+            logger.debug("[SKIP] Neutral signal ignored: %s", signal_type)
             return None
 
         # Verifica confidence minim
         if confidence < self.config.min_confidence:
-            print(f"[SKIP] Signal ignored: confidence {confidence:.2f} < {self.config.min_confidence}")
+            logger.debug("[SKIP] Signal ignored: confidence %.2f < %s", confidence, self.config.min_confidence)
             return None
 
-        print(f"[OK] Signal passed filters, executing trade...")
-        
-        # Determină direcția
-        is_long = 'long' in signal_type.lower()
-        is_short = 'short' in signal_type.lower()
+        is_long = direction == 'LONG'
+
+        signal_id = signal.get('signal_id')  # For linking trade to signal
+        logger.debug("[SIGNAL] Processing: %s with confidence %.2f (min: %s)",
+                     signal_type, confidence, self.config.min_confidence)
+        logger.debug("[OK] Signal passed filters, executing trade...")
         
-        if not is_long and not is_short:
+        # Poziție, preț și balanță - cererile pleacă concurent (1 RTT, nu 3).
+        # Prețul e citit o singură dată: folosit la reversal check și la sizing
+        results = await asyncio.gather(
+            connector.get_position(symbol),
+            connector.get_price(symbol),
+            connector.get_balance(),
+            return_exceptions=True
+        )
+        failed = [r for r in results if isinstance(r, BaseException)]
+        if failed:
+            logger.warning("[SKIP] Could not fetch trade inputs: %r", failed[0])
             return None
-        
-        # Verifică dacă avem deja poziție deschisă
-        current_position = await self.connector.get_position(self.config.symbol)
+        current_position, price, balance = results
 
         # Sync check: if no position on Binance but we have local trade, clean up
+        # (cancel_all_orders acoperă și ordinele orfane - fără get_open_orders după el)
         if not current_position and self.current_trade:
-            print(f"[SYNC] Position closed externally - cleaning up local state")
-            await self.connector.cancel_all_orders(self.config.symbol)
+            logger.info("[SYNC] Position closed externally - cleaning up local state")
+            await connector.cancel_all_orders(symbol)
             self.current_trade = None
 
         # Clean orphan orders if no position exists
-        if not current_position:
-            orders = await self.connector.get_open_orders(self.config.symbol)
+        elif not current_position:
+            orders = await connector.get_open_orders(symbol)
             if orders:
-                print(f"[CLEANUP] Found {len(orders)} orphan orders before new trade - cancelling...")
-                await self.connector.cancel_all_orders(self.config.symbol)
+                logger.info("[CLEANUP] Found %d orphan orders before new trade - cancelling...", len(orders))
+                await connector.cancel_all_orders(symbol)
 
         if current_position:
             # Dacă semnalul e în direcția opusă, verifică dacă putem face reversal
-            current_is_long = current_position.side == 'LONG'
-
-            if (is_long and not current_is_long) or (is_short and current_is_long):
+            if current_position.side != direction:
                 # Check reversal protection conditions
-                can_reverse, block_reason = await self._check_reversal_allowed(
-                    current_position, confidence
+                can_reverse, block_reason = self._check_reversal_allowed(
+                    current_position, confidence, price, time.monotonic()
                 )
 
                 if not can_reverse:
-                    print(f"[PROTECT] Reversal blocked: {block_reason}")
+                    logger.info("[PROTECT] Reversal blocked: %s", block_reason)
                     return None
 
-                print(f"[REVERSE] Signal reversal allowed - closing current position")
+                logger.info("[REVERSE] Signal reversal allowed - closing current position")
                 await self.close_current_position("signal_reversal")
+                # Închiderea a realizat PnL și piața s-a mișcat - sizing pe valorile de acum
+                balance, price = await asyncio.gather(
+                    connector.get_balance(),
+                    connector.get_price(symbol)
+                )
             else:
                 # Same direction, skip
-                print(f"[SKIP] Already in {current_position.side} position")
+                logger.info("[SKIP] Already in %s position", current_position.side)
                 return None
         
         # Calculează position size
-        balance = await self.connector.get_balance()
-        price = await self.connector.get_price(self.config.symbol)
-
-        # Get symbol info for proper precision
-        symbol_info = await self.connector.get_symbol_info(self.config.symbol)
-        min_qty = symbol_info.get('min_qty', 0.001)
+        min_qty = self._min_qty
 
         # Position size bazat pe risk (in USD)
         risk_amount = balance * self.config.risk_per_trade
-        sl_distance = price * (self.config.stop_loss_pct / 100)
+        sl_distance = price * self._sl_frac
         risk_based_qty = risk_amount / sl_distance
 
         # Max position size in base asset (from USD value)
@@ -398,37 +511,34 @@ class PaperTradingManager:
         quantity = min(risk_based_qty, max_qty)
 
         # Round to symbol's precision
-        quantity = self.connector.round_quantity(self.config.symbol, quantity)
+        quantity = connector.round_quantity(symbol, quantity)
 
         if quantity < min_qty:
-            print(f"[SKIP] Position size {quantity} < min {min_qty} for {self.config.symbol}")
+            logger.info("[SKIP] Position size %s < min %s for %s", quantity, min_qty, symbol)
             return None
         
         # Calculează SL și TP
-        if is_long:
-            stop_loss = price * (1 - self.config.stop_loss_pct / 100)
-            take_profit = price * (1 + self.config.take_profit_pct / 100)
-        else:
-            stop_loss = price * (1 + self.config.stop_loss_pct / 100)
-            take_profit = price * (1 - self.config.take_profit_pct / 100)
+        sl_mult, tp_mult = self._sl_tp_mult[direction]
+        stop_loss = price * sl_mult
+        take_profit = price * tp_mult
         
         # Executa trade
-        symbol_base = self.config.symbol.replace('USDT', '')
-        print(f"\n[TRADE] Executing {'LONG' if is_long else 'SHORT'} Trade on {self.config.symbol}")
-        print(f"   Confidence: {confidence:.2f}")
-        print(f"   Quantity: {quantity} {symbol_base}")
-        print(f"   Price: ${price:,.4f}")
+        symbol_base = symbol.replace('USDT', '')
+        logger.info("\n[TRADE] Executing %s Trade on %s", direction, symbol)
+        logger.info("   Confidence: %.2f", confidence)
+        logger.info("   Quantity: %s %s", quantity, symbol_base)
+        logger.info("   Price: $%.4f", price)
         
         if is_long:
-            result = await self.connector.open_long(
-                self.config.symbol, 
+            result = await connector.open_long(
+                symbol, 
                 quantity,
                 stop_loss=stop_loss,
                 take_profit=take_profit
             )
         else:
-            result = await self.connector.open_short(
-                self.config.symbol,
+            result = await connector.open_short(
+                symbol,
                 quantity,
                 stop_loss=stop_loss,
                 take_profit=take_profit
@@ -437,40 +547,36 @@ class PaperTradingManager:
         if result.success:
             # Use actual execution price from result
             actual_entry_price = result.price
-            print(f"   [OK] Trade executed @ ${actual_entry_price:,.2f}")
+            logger.info("   [OK] Trade executed @ $%.2f", actual_entry_price)
 
             # Log trade with actual execution price
             self.current_trade = TradeLog(
                 timestamp=datetime.now(),
                 signal_type=signal_type,
                 confidence=confidence,
-                direction='LONG' if is_long else 'SHORT',
+                direction=direction,
                 entry_price=actual_entry_price,
                 quantity=quantity,
                 stop_loss=stop_loss,
                 take_profit=take_profit,
                 order_id=result.order_id,
-                symbol=self.config.symbol,
+                symbol=symbol,
                 timeframe=self.config.timeframe
             )
 
             self._log_trade(self.current_trade, "OPENED")
 
             # Log to persistent trade logger
-            trade_event = TradeEvent(
-                id=str(uuid.uuid4()),
-                ts=datetime.now().isoformat(),
-                symbol=self.config.symbol,
-                timeframe=self.config.timeframe,
-                side='BUY' if is_long else 'SELL',
+            self._queue_trade_event(self._make_trade_event(
                 action='OPEN',
+                side='BUY' if is_long else 'SELL',
                 qty=quantity,
                 entry_price=actual_entry_price,
                 reason=signal_type,
                 signal_id=signal_id,  # Link to triggering signal
-                meta={'confidence': confidence, 'order_id': result.order_id}
-            )
-            asyncio.create_task(self.trade_logger.log_event(trade_event))
+                meta={'confidence': confidence, 'order_id': result.order_id},
+                ts=self.current_trade.timestamp
+            ))
 
         return result
     
@@ -487,12 +593,11 @@ class PaperTradingManager:
             entry_price = self.current_trade.entry_price
 
             # Calculate PnL using actual prices
-            if self.current_trade.direction == 'LONG':
-                pnl = (actual_exit_price - entry_price) * self.current_trade.quantity
-            else:
-                pnl = (entry_price - actual_exit_price) * self.current_trade.quantity
+            pnl = self._calc_pnl(entry_price, actual_exit_price, self.current_trade.quantity,
+                                 self.current_trade.side_sign)
 
-            print(f"   [CLOSE] Entry: ${entry_price:,.2f} -> Exit: ${actual_exit_price:,.2f} | PnL: ${pnl:,.2f}")
+            logger.info("   [CLOSE] Entry: $%.2f -> Exit: $%.2f | PnL: $%.2f",
+                        entry_price, actual_exit_price, pnl)
 
             # Update trade log
             self.current_trade.status = "CLOSED"
@@ -506,25 +611,10 @@ class PaperTradingManager:
             if pnl > 0:
                 self.winning_trades += 1
 
-            self.trade_history.append(self.current_trade)
             self._log_trade(self.current_trade, f"CLOSED ({reason})")
 
             # Log to persistent trade logger
-            close_event = TradeEvent(
-                id=str(uuid.uuid4()),
-                ts=datetime.now().isoformat(),
-                symbol=self.config.symbol,
-                timeframe=self.config.timeframe,
-                side='SELL' if self.current_trade.direction == 'LONG' else 'BUY',
-                action='CLOSE',
-                qty=self.current_trade.quantity,
-                entry_price=entry_price,
-                exit_price=actual_exit_price,
-                pnl=pnl,
-                reason=reason,
-                meta={'order_id': self.current_trade.order_id}
-            )
-            asyncio.create_task(self.trade_logger.log_event(close_event))
+            self._queue_trade_event(self._make_close_event('CLOSE', actual_exit_price, pnl, reason))
 
             self.current_trade = None
 
@@ -532,87 +622,77 @@ class PaperTradingManager:
     
     async def check_position_status(self):
         """Verifică statusul poziției (SL/TP hit) - atât pe Binance cât și manual"""
+        symbol = self.config.symbol
+        connector = self.connector
         if not self.current_trade:
-            # No trade tracked - check for orphan orders and clean them
-            orders = await self.connector.get_open_orders(self.config.symbol)
-            if orders:
-                print(f"[CLEANUP] Found {len(orders)} orphan orders - cancelling...")
-                await self.connector.cancel_all_orders(self.config.symbol)
+            # No trade tracked - check for orphan orders once (close paths cancel their own legs)
+            if self._orphan_check_pending:
+                self._orphan_check_pending = False
+                orders = await connector.get_open_orders(symbol)
+                if orders:
+                    logger.info("[CLEANUP] Found %d orphan orders - cancelling...", len(orders))
+                    await connector.cancel_all_orders(symbol)
             return
 
-        position = await self.connector.get_position(self.config.symbol)
-        current_price = await self.connector.get_price(self.config.symbol)
+        # Ambele sunt citiri din memorie cu stream-urile active; la fallback REST pleacă concurent
+        position, current_price = await asyncio.gather(
+            connector.get_position(symbol),
+            connector.get_price(symbol)
+        )
+
+        # Citit după await-uri: între timp process_signal poate să fi închis trade-ul
+        trade = self.current_trade
+        if trade is None:
+            return
 
         if not position:
             # Position closed (SL or TP hit on Binance)
-            if self.current_trade.direction == 'LONG':
-                pnl = (current_price - self.current_trade.entry_price) * self.current_trade.quantity
-            else:
-                pnl = (self.current_trade.entry_price - current_price) * self.current_trade.quantity
+            pnl = self._calc_pnl(trade.entry_price, current_price, trade.quantity, trade.side_sign)
 
             reason = "take_profit" if pnl > 0 else "stop_loss"
 
-            self.current_trade.status = "CLOSED"
-            self.current_trade.exit_price = current_price
-            self.current_trade.exit_time = datetime.now()
-            self.current_trade.pnl = pnl
+            trade.status = "CLOSED"
+            trade.exit_price = current_price
+            trade.exit_time = datetime.now()
+            trade.pnl = pnl
 
             self.total_trades += 1
             self.total_pnl += pnl
             if pnl > 0:
                 self.winning_trades += 1
 
-            self.trade_history.append(self.current_trade)
-            self._log_trade(self.current_trade, f"CLOSED ({reason})")
+            self._log_trade(trade, f"CLOSED ({reason})")
 
             # Log to persistent trade logger
             action = "TAKE_PROFIT" if reason == "take_profit" else "STOP_LOSS"
-            close_event = TradeEvent(
-                id=str(uuid.uuid4()),
-                ts=datetime.now().isoformat(),
-                symbol=self.config.symbol,
-                timeframe=self.config.timeframe,
-                side='SELL' if self.current_trade.direction == 'LONG' else 'BUY',
-                action=action,
-                qty=self.current_trade.quantity,
-                entry_price=self.current_trade.entry_price,
-                exit_price=current_price,
-                pnl=pnl,
-                reason=reason,
-                meta={'order_id': self.current_trade.order_id}
-            )
-            asyncio.create_task(self.trade_logger.log_event(close_event))
+            self._queue_trade_event(self._make_close_event(action, current_price, pnl, reason))
 
             # IMPORTANT: Cancel remaining orders (SL or TP that didn't trigger)
-            print(f"[CLEANUP] Position closed by {reason} - cancelling remaining orders...")
-            await self.connector.cancel_all_orders(self.config.symbol)
+            logger.info("[CLEANUP] Position closed by %s - cancelling remaining orders...", reason)
+            await connector.cancel_all_orders(symbol)
 
             self.current_trade = None
             return
 
         # Position still exists - check manual TP/SL (for synced positions without orders)
-        entry_price = self.current_trade.entry_price
-        is_long = self.current_trade.direction == 'LONG'
+        # Check if TP/SL orders exist on exchange
+        has_tp_order = trade.take_profit > 0
+        has_sl_order = trade.stop_loss > 0
+        if has_tp_order and has_sl_order:
+            return
 
         # Calculate current PnL percentage
-        if is_long:
-            pnl_pct = (current_price - entry_price) / entry_price * 100
-        else:
-            pnl_pct = (entry_price - current_price) / entry_price * 100
-
-        # Check if TP/SL orders exist on exchange
-        has_tp_order = self.current_trade.take_profit > 0
-        has_sl_order = self.current_trade.stop_loss > 0
+        pnl_pct = self._calc_pnl_pct(trade.entry_price, current_price, trade.side_sign)
 
         # Manual TP check (if no TP order exists)
         if not has_tp_order and pnl_pct >= self.config.take_profit_pct:
-            print(f"[TP HIT] Manual TP triggered at {pnl_pct:.2f}% profit!")
+            logger.info("[TP HIT] Manual TP triggered at %.2f%% profit!", pnl_pct)
             await self._close_position_with_reason("take_profit_manual", current_price)
             return
 
         # Manual SL check (if no SL order exists)
         if not has_sl_order and pnl_pct <= -self.config.stop_loss_pct:
-            print(f"[SL HIT] Manual SL triggered at {pnl_pct:.2f}% loss!")
+            logger.info("[SL HIT] Manual SL triggered at %.2f%% loss!", pnl_pct)
             await self._close_position_with_reason("stop_loss_manual", current_price)
             return
 
@@ -627,12 +707,11 @@ class PaperTradingManager:
             actual_exit_price = result.price if result.price else exit_price
             entry_price = self.current_trade.entry_price
 
-            if self.current_trade.direction == 'LONG':
-                pnl = (actual_exit_price - entry_price) * self.current_trade.quantity
-            else:
-                pnl = (entry_price - actual_exit_price) * self.current_trade.quantity
+            pnl = self._calc_pnl(entry_price, actual_exit_price, self.current_trade.quantity,
+                                 self.current_trade.side_sign)
 
-            print(f"   [CLOSE] Entry: ${entry_price:,.2f} -> Exit: ${actual_exit_price:,.2f} | PnL: ${pnl:,.2f}")
+            logger.info("   [CLOSE] Entry: $%.2f -> Exit: $%.2f | PnL: $%.2f",
+                        entry_price, actual_exit_price, pnl)
 
             self.current_trade.status = "CLOSED"
             self.current_trade.exit_price = actual_exit_price
@@ -644,30 +723,13 @@ class PaperTradingManager:
             if pnl > 0:
                 self.winning_trades += 1
 
-            self.trade_history.append(self.current_trade)
             self._log_trade(self.current_trade, f"CLOSED ({reason})")
 
             # Log to persistent trade logger
             action = "TAKE_PROFIT" if "take_profit" in reason else "STOP_LOSS" if "stop_loss" in reason else "CLOSE"
-            close_event = TradeEvent(
-                id=str(uuid.uuid4()),
-                ts=datetime.now().isoformat(),
-                symbol=self.config.symbol,
-                timeframe=self.config.timeframe,
-                side='SELL' if self.current_trade.direction == 'LONG' else 'BUY',
-                action=action,
-                qty=self.current_trade.quantity,
-                entry_price=entry_price,
-                exit_price=actual_exit_price,
-                pnl=pnl,
-                reason=reason,
-                meta={'order_id': self.current_trade.order_id}
-            )
-            asyncio.create_task(self.trade_logger.log_event(close_event))
-
-            # Cancel any remaining orders
-            await self.connector.cancel_all_orders(self.config.symbol)
+            self._queue_trade_event(self._make_close_event(action, actual_exit_price, pnl, reason))
 
+            # Ordinele rămase (SL/TP) sunt anulate de connector.close_position după fill
             self.current_trade = None
 
     def get_stats(self) -> Dict[str, Any]:
@@ -686,43 +748,161 @@ class PaperTradingManager:
         }
     
     def _log_trade(self, trade: TradeLog, action: str):
-        """Loghează trade în fișier"""
-        log_file = self.log_dir / f"trades_{datetime.now().strftime('%Y%m%d')}.json"
-        
-        log_entry = {
+        """Pune trade-ul în coada de log (JSONL); fișierul e scris de _drain_log_queue"""
+        now = datetime.now()
+        item = (f"trades_{now.strftime('%Y%m%d')}.jsonl", {
             'action': action,
-            'timestamp': datetime.now().isoformat(),
-            'trade': trade.to_dict()
-        }
+            'timestamp': now.isoformat(),
+            'trade': trade.to_dict()  # snapshot acum - trade-ul se modifică ulterior
+        })
+
+        if self._log_writer_task is None or self._log_writer_task.done():
+            # Manager nepornit (sau oprit): scriere directă
+            self._write_log_batch([item])
+        else:
+            self._log_queue.put_nowait(item)
         
-        # Append to log file
-        logs = []
-        if log_file.exists():
+        logger.debug("[LOG] Trade logged: %s", action)
+
+    async def _drain_log_queue(self):
+        """Scrie intrările din coadă în batch-uri, în afara event loop-ului"""
+        while True:
+            batch = [await self._log_queue.get()]
+            while len(batch) < self.LOG_BATCH_SIZE and not self._log_queue.empty():
+                batch.append(self._log_queue.get_nowait())
             try:
-                with open(log_file, 'r') as f:
-                    logs = json.load(f)
-            except:
-                logs = []
-        
-        logs.append(log_entry)
-        
-        with open(log_file, 'w') as f:
-            json.dump(logs, f, indent=2)
-        
-        print(f"[LOG] Trade logged: {action}")
+                await asyncio.to_thread(self._write_log_batch, batch)
+            except OSError as e:
+                logger.error("[ERROR] Trade log write failed: %s", e)
+            finally:
+                for _ in batch:
+                    self._log_queue.task_done()
+
+    def _write_log_batch(self, batch: List[tuple]):
+        """Un singur append per fișier zilnic pentru tot batch-ul"""
+        lines_by_file: Dict[str, List[bytes]] = {}
+        for file_name, entry in batch:
+            lines_by_file.setdefault(file_name, []).append(json_codec.dumps(entry, newline=True))
+        for file_name, lines in lines_by_file.items():
+            with open(self.log_dir / file_name, 'ab') as f:
+                f.writelines(lines)
+
+    def _make_trade_event(self, *, action: str, side: str, qty: float, entry_price: float,
+                          reason: str, exit_price: Optional[float] = None, pnl: float = 0.0,
+                          signal_id: Optional[str] = None, meta: Optional[Dict[str, Any]] = None,
+                          ts: Optional[datetime] = None) -> TradeEvent:
+        """TradeEvent pentru simbolul/timeframe-ul manager-ului (id și, implicit, timestamp generate aici)"""
+        return TradeEvent(
+            id=str(uuid.uuid4()),
+            ts=(ts or datetime.now()).isoformat(),
+            symbol=self.config.symbol,
+            timeframe=self.config.timeframe,
+            side=side,
+            action=action,
+            qty=qty,
+            entry_price=entry_price,
+            exit_price=exit_price,
+            pnl=pnl,
+            reason=reason,
+            signal_id=signal_id,
+            meta=meta if meta is not None else {}
+        )
+
+    def _make_close_event(self, action: str, exit_price: float, pnl: float, reason: str) -> TradeEvent:
+        """Evenimentul de închidere pentru current_trade"""
+        trade = self.current_trade
+        return self._make_trade_event(
+            action=action,
+            side='SELL' if trade.direction == 'LONG' else 'BUY',
+            qty=trade.quantity,
+            entry_price=trade.entry_price,
+            exit_price=exit_price,
+            pnl=pnl,
+            reason=reason,
+            meta={'order_id': trade.order_id},
+            ts=trade.exit_time  # același moment ca exit_time din TradeLog
+        )
+
+    def _queue_trade_event(self, event: TradeEvent):
+        """Pune evenimentul în coada trade_logger-ului; la coadă plină îl aruncă"""
+        try:
+            self._trade_event_queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("[DROP] Trade event queue full - dropped %s %s", event.action, event.symbol)
+
+    async def _drain_trade_events(self):
+        """Scrie TradeEvent-urile din coadă, unul câte unul, pe durata manager-ului"""
+        while True:
+            event = await self._trade_event_queue.get()
+            try:
+                await self.trade_logger.log_event(event)
+            finally:
+                self._trade_event_queue.task_done()
+
+    async def _stop_trade_events(self):
+        """Golește coada de evenimente (cu timeout) și oprește consumatorul"""
+        task = self._trade_event_task
+        if task is None or task.done():
+            return
+        try:
+            await asyncio.wait_for(self._trade_event_queue.join(), timeout=self.LOG_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("[WARNING] Trade events not drained: %d events lost", self._trade_event_queue.qsize())
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        self._trade_event_task = None
+
+    async def _stop_log_writer(self):
+        """Golește coada de log (cu timeout) și oprește writer-ul"""
+        task = self._log_writer_task
+        if task is None or task.done():
+            return
+        try:
+            await asyncio.wait_for(self._log_queue.join(), timeout=self.LOG_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("[WARNING] Trade log not drained: %d entries lost", self._log_queue.qsize())
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        self._log_writer_task = None
     
+    def load_history(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Ultimele `limit` trade-uri închise ale manager-ului (cele mai vechi primele),
+        citite din log-urile zilnice de la cel mai recent fișier înapoi
+        """
+        history: List[Dict[str, Any]] = []
+        for path in sorted(self.log_dir.glob("trades_*.jsonl"), reverse=True):
+            if len(history) >= limit:
+                break
+            with open(path, 'rb') as f:
+                closed = [
+                    entry['trade'] for entry in _read_log_entries(path, f)
+                    if entry['action'].startswith('CLOSED')
+                    and entry['trade']['symbol'] == self.config.symbol
+                    and entry['trade']['timeframe'] == self.config.timeframe
+                ]
+            if closed:
+                history[:0] = closed[-(limit - len(history)):]
+        return history
+
     def _save_stats(self):
         """Salvează statistici finale"""
         stats_file = self.log_dir / "stats.json"
         
         stats = self.get_stats()
         stats['last_updated'] = datetime.now().isoformat()
-        stats['trade_history'] = [t.to_dict() for t in self.trade_history]
+        stats['trade_history'] = self.load_history(self.STATS_HISTORY_LIMIT)
         
-        with open(stats_file, 'w') as f:
-            json.dump(stats, f, indent=2)
+        with open(stats_file, 'wb') as f:
+            f.write(json_codec.dumps(stats, indent=True))
         
-        print(f"[STATS] Stats saved to: {stats_file}")
+        logger.info("[STATS] Stats saved to: %s", stats_file)
 
 
 # Singleton
@@ -3,49 +3,55 @@ import os
 from dotenv import load_dotenv
 load_dotenv()
 
+from backend.services.event_loop import install_uvloop
 from backend.trading.binance_connector import BinanceTestnetConnector
 
 async def check_positions():
-    connector = BinanceTestnetConnector(
+    async with BinanceTestnetConnector(
         api_key=os.getenv('BINANCE_TESTNET_API_KEY'),
         api_secret=os.getenv('BINANCE_TESTNET_SECRET')
-    )
+    ) as connector:
+        account = await connector.get_account()
+        positions = account.get('positions', [])
 
-    account = await connector.get_account()
-    positions = account.get('positions', [])
+        active = [p for p in positions if float(p.get('positionAmt', 0)) != 0]
+        symbols = [p.get('symbol') for p in active]
 
-    print('=== CURRENT POSITIONS ===')
-    total_pnl = 0
-    for pos in positions:
-        amt = float(pos.get('positionAmt', 0))
-        if amt != 0:
+        # Fetch prices and orders for all symbols concurrently (one round-trip instead of 2 * N)
+        prices, orders_lists = await asyncio.gather(
+            asyncio.gather(*(connector.get_price(s) for s in symbols), return_exceptions=True),
+            asyncio.gather(*(connector.get_open_orders(s) for s in symbols), return_exceptions=True)
+        )
+
+        print('=== CURRENT POSITIONS ===')
+        total_pnl = 0
+        for pos, price in zip(active, prices):
+            amt = float(pos.get('positionAmt', 0))
             symbol = pos.get('symbol')
             entry = float(pos.get('entryPrice', 0))
             pnl = float(pos.get('unrealizedProfit', 0))
             total_pnl += pnl
             side = 'LONG' if amt > 0 else 'SHORT'
 
-            # Get current price
-            price = await connector.get_price(symbol)
-            pct_change = ((price - entry) / entry) * 100
-            if side == 'SHORT':
-                pct_change = -pct_change
-
             print(f'{symbol}: {side} {abs(amt)}')
-            print(f'  Entry: ${entry:,.4f} -> Current: ${price:,.4f} ({pct_change:+.2f}%)')
+            if isinstance(price, BaseException):
+                print(f'  Entry: ${entry:,.4f} -> Current: unavailable ({price!r})')
+            else:
+                pct_change = ((price - entry) / entry) * 100
+                if side == 'SHORT':
+                    pct_change = -pct_change
+                print(f'  Entry: ${entry:,.4f} -> Current: ${price:,.4f} ({pct_change:+.2f}%)')
             print(f'  PnL: ${pnl:,.2f}')
             print()
 
-    print(f'Total Unrealized PnL: ${total_pnl:,.2f}')
+        print(f'Total Unrealized PnL: ${total_pnl:,.2f}')
 
-    # Check open orders (SL/TP)
-    print('\n=== OPEN ORDERS (SL/TP) ===')
-    for pos in positions:
-        amt = float(pos.get('positionAmt', 0))
-        if amt != 0:
-            symbol = pos.get('symbol')
-            orders = await connector.get_open_orders(symbol)
-            if orders:
+        # Check open orders (SL/TP)
+        print('\n=== OPEN ORDERS (SL/TP) ===')
+        for symbol, orders in zip(symbols, orders_lists):
+            if isinstance(orders, BaseException):
+                print(f'{symbol}: could not fetch orders ({orders!r})')
+            elif orders:
                 for o in orders:
                     otype = o.get('type')
                     stop_price = float(o.get('stopPrice', 0))
@@ -53,4 +59,6 @@ async def check_positions():
             else:
                 print(f'{symbol}: NO SL/TP orders!')
 
-asyncio.run(check_positions())
+if __name__ == '__main__':
+    install_uvloop()
+    asyncio.run(check_positions())
@@ -1,13 +1,16 @@
 """
 Debug: Analyze angles and energies in detail
 """
-import math
 import sys
 from datetime import datetime, timedelta
 
+import numpy as np
+
 sys.path.insert(0, r'c:\Users\gyorg\OneDrive\Desktop\OIE')
 
 from backend.data.models import Bar
+from backend.data.frame import BarFrame
+from backend.topology._kernel import rotation_energy_kernel
 
 # Create aggressive bars
 base_time = datetime(2025, 1, 1, 9, 30, 0)
@@ -30,53 +33,33 @@ print("\n" + "="*100)
 print("DETAILED ANGLE & ENERGY ANALYSIS")
 print("="*100)
 
-# Compute returns and flows
-returns = []
-for i in range(len(bars)):
-    if i == 0:
-        ret = 0.0
-    else:
-        prev_close = bars[i-1].close
-        ret = 0.0 if prev_close == 0 else (bars[i].close - prev_close) / abs(prev_close)
-    returns.append(ret)
-
-flows = []
-for i in range(len(bars)):
-    if bars[i].volume and bars[i].volume > 0 and bars[i].delta is not None:
-        flow = bars[i].delta / bars[i].volume
-    else:
-        flow = 0.0
-    flows.append(flow)
+# Compute returns and flows as NumPy columns
+frame = BarFrame.from_bars(bars)
+closes = frame.close
+volumes = frame.volume
+deltas = frame.delta
+
+prev = closes[:-1]
+returns = np.zeros(len(closes))
+np.divide(closes[1:] - prev, np.abs(prev), out=returns[1:], where=prev != 0)
+
+flows = np.zeros(len(closes))
+np.divide(deltas, volumes, out=flows, where=(volumes > 0) & ~np.isnan(deltas))
 
 print("\nReturns and Flows:")
 for i in range(len(bars)):
     print(f"  Bar {i:2d}: ret={returns[i]:8.6f}, flow={flows[i]:8.6f}")
 
-# Compute angles
-def norm(v):
-    return math.sqrt(v[0]**2 + v[1]**2)
-
 print("\n" + "="*100)
 print("Angle Computations:")
 print("="*100)
 
-for k in range(1, len(bars)-1):
-    v_prev = (returns[k-1], flows[k-1])
-    v_next = (returns[k+1], flows[k+1])
-    
-    cross = v_prev[0] * v_next[1] - v_prev[1] * v_next[0]
-    denom = norm(v_prev) * norm(v_next)
-    
-    if denom < 1e-9:
-        rot_norm = 0.0
-    else:
-        rot_norm = cross / denom
-    
-    clamped = max(-1.0, min(1.0, rot_norm))
-    angle_deg = math.degrees(math.asin(clamped))
-    
-    energy = abs(returns[k]) * bars[k].volume
-    
+# Normalized rotations and energies from the TopologyEngine kernel (one fused loop
+# under Numba), so the angles shown here are exactly what the engine sees
+rot_norm, energies = rotation_energy_kernel(closes, volumes, np.nan_to_num(deltas, nan=0.0))
+angles = np.degrees(np.arcsin(np.clip(rot_norm, -1.0, 1.0)))
+
+for k, angle_deg, energy in zip(range(1, len(bars)-1), angles, energies):
     # Highlight high energy + large angle
     marker = ""
     if abs(angle_deg) > 15 and energy > 50:
@@ -88,19 +71,14 @@ for k in range(1, len(bars)-1):
     
     print(f"Bar {k:2d}: angle={angle_deg:7.2f}°, energy={energy:10.2f}, |angle|>15={abs(angle_deg)>15}, energy>50={energy>50}{marker}")
 
-# Get thresholds
-energies = []
-for k in range(1, len(bars)-1):
-    energy = abs(returns[k]) * bars[k].volume
-    energies.append(energy)
-
-sorted_energies = sorted(energies)
+# Get thresholds (the sorted list is printed anyway, so one full sort)
+sorted_energies = np.sort(energies)
 thr_index = int(0.7 * len(sorted_energies))
 thr_index = max(0, min(thr_index, len(sorted_energies)-1))
 energy_threshold = sorted_energies[thr_index]
 
 print(f"\n70th percentile energy threshold: {energy_threshold:.2f}")
-print(f"Sorted energies: {sorted_energies}")
+print(f"Sorted energies: {sorted_energies.tolist()}")
 print(f"Threshold at index {thr_index}: {energy_threshold:.2f}")
 
 print("\n" + "="*100)
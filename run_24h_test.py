@@ -2,7 +2,8 @@
 OIE MVP - 24H Test Runner
 =========================
 
-Rulează trading pe 5m și 15m pentru 24 ore.
+Rulează trading pe 5m și 15m pentru 24 ore. Ambele timeframe-uri primesc
+barele push, pe un singur WebSocket combinat (btcusdt@kline_5m/btcusdt@kline_15m).
 """
 
 import asyncio
@@ -12,7 +13,7 @@ from datetime import datetime
 # Add parent to path
 sys.path.insert(0, '.')
 
-from backend.trading.live_runner import LiveTradingRunner
+from backend.trading.multi_tf import MultiTimeframeRunner
 
 
 async def run_24h_test():
@@ -26,24 +27,26 @@ async def run_24h_test():
     print(f"   Duration: 24 hours")
     print("=" * 60 + "\n")
     
-    # Create runners
-    runner_5m = LiveTradingRunner(symbol="BTCUSDT", interval="5m")
-    runner_15m = LiveTradingRunner(symbol="BTCUSDT", interval="15m")
+    # Runner-ele împart feed-ul BTCUSDT: 15m se abonează pe conexiunea deschisă de 5m
+    multi = MultiTimeframeRunner()
     
     # Start 5m
     print("📊 Starting 5m timeframe...")
-    if not await runner_5m.start():
+    if not await multi.start_timeframe("5m", symbol="BTCUSDT"):
         print("❌ Failed to start 5m runner")
+        await multi.stop_all()
         return
+    runner_5m = multi.runners["5m"]
     
     await asyncio.sleep(5)
     
     # Start 15m
     print("\n📊 Starting 15m timeframe...")
-    if not await runner_15m.start():
+    if not await multi.start_timeframe("15m", symbol="BTCUSDT"):
         print("❌ Failed to start 15m runner")
-        await runner_5m.stop()
+        await multi.stop_all()
         return
+    runner_15m = multi.runners["15m"]
     
     print("\n" + "=" * 60)
     print("✅ BOTH TIMEFRAMES RUNNING!")
@@ -63,8 +66,7 @@ async def run_24h_test():
         print("⏹️ STOPPING ALL TRADING")
         print("=" * 60)
         
-        await runner_5m.stop()
-        await runner_15m.stop()
+        await multi.stop_all()
         
         # Print final stats
         print("\n" + "=" * 60)
@@ -11,6 +11,7 @@ Ruleaza backtest pe datele disponibile cu setarile curente:
 
 import sys
 import os
+from collections import Counter
 sys.path.insert(0, os.path.dirname(__file__))
 
 import pandas as pd
@@ -19,29 +20,34 @@ from backend.backtest.backtest_runner import BacktestRunner, BacktestConfig
 from backend.backtest.data_fetcher import OHLCVBar
 
 
+_OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+_DELTA_COLUMNS = ('buy_volume', 'sell_volume', 'delta')
+
+# Parserul multi-threaded pyarrow daca e instalat, altfel parserul C din pandas
+try:
+    import pyarrow  # noqa: F401
+    _CSV_ENGINE = 'pyarrow'
+except ImportError:
+    _CSV_ENGINE = 'c'
+
+
 def load_data_with_delta(csv_path: str):
-    """Incarca date cu delta din CSV"""
-    df = pd.read_csv(csv_path)
-
-    bars = []
-    for _, row in df.iterrows():
-        bar = OHLCVBar(
-            timestamp=pd.to_datetime(row['timestamp']),
-            open=float(row['open']),
-            high=float(row['high']),
-            low=float(row['low']),
-            close=float(row['close']),
-            volume=float(row['volume']),
-        )
-        # Adauga delta info daca exista
-        if 'buy_volume' in row:
-            bar.buy_volume = float(row['buy_volume'])
-        if 'sell_volume' in row:
-            bar.sell_volume = float(row['sell_volume'])
-        if 'delta' in row:
-            bar.delta = float(row['delta'])
-
-        bars.append(bar)
+    """Incarca date cu delta din CSV (coloane citite direct, fara iterrows)"""
+    df = pd.read_csv(
+        csv_path,
+        parse_dates=['timestamp'],
+        dtype={c: 'f8' for c in _OHLCV_COLUMNS + _DELTA_COLUMNS},
+        engine=_CSV_ENGINE
+    )
+
+    columns = [df['timestamp'].tolist()] + [df[c].tolist() for c in _OHLCV_COLUMNS]
+    bars = [OHLCVBar(*values) for values in zip(*columns)]
+
+    # Adauga delta info daca exista
+    for name in _DELTA_COLUMNS:
+        if name in df.columns:
+            for bar, value in zip(bars, df[name].tolist()):
+                setattr(bar, name, value)
 
     return bars
 
@@ -122,28 +128,25 @@ def main():
     print(f"   Avg Hold Time: {avg_bars:.0f} bare (~{avg_bars * 5:.0f} min)")
 
     # Trade-uri pe directie
-    long_trades = [t for t in results.trades if t.direction.value == 'long']
-    short_trades = [t for t in results.trades if t.direction.value == 'short']
-
-    long_wins = len([t for t in long_trades if t.pnl > 0])
-    short_wins = len([t for t in short_trades if t.pnl > 0])
+    # Un singur pas peste trade-uri: numar total si castigatoare pe directie
+    totals = Counter(t.direction.value for t in results.trades)
+    wins = Counter(t.direction.value for t in results.trades if t.pnl > 0)
+    long_total, short_total = totals['long'], totals['short']
+    long_wins, short_wins = wins['long'], wins['short']
 
     print(f"\n[LONG] LONG Trades:")
-    print(f"   Total: {len(long_trades)}")
-    print(f"   Win Rate: {(long_wins / len(long_trades) * 100) if long_trades else 0:.1f}%")
+    print(f"   Total: {long_total}")
+    print(f"   Win Rate: {(long_wins / long_total * 100) if long_total else 0:.1f}%")
 
     print(f"\n[SHORT] SHORT Trades:")
-    print(f"   Total: {len(short_trades)}")
-    print(f"   Win Rate: {(short_wins / len(short_trades) * 100) if short_trades else 0:.1f}%")
+    print(f"   Total: {short_total}")
+    print(f"   Win Rate: {(short_wins / short_total * 100) if short_total else 0:.1f}%")
 
     # Distributie exit reasons
-    exit_reasons = {}
-    for t in results.trades:
-        reason = t.exit_reason or 'unknown'
-        exit_reasons[reason] = exit_reasons.get(reason, 0) + 1
+    exit_reasons = Counter(t.exit_reason or 'unknown' for t in results.trades)
 
     print(f"\n[EXIT] Exit Reasons:")
-    for reason, count in sorted(exit_reasons.items(), key=lambda x: -x[1]):
+    for reason, count in exit_reasons.most_common():
         pct = count / len(results.trades) * 100 if results.trades else 0
         print(f"   {reason}: {count} ({pct:.1f}%)")
 
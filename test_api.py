@@ -1,49 +1,75 @@
 """
 Test backend endpoints: /api/v1/topology/TEST
 """
-import requests
-import json
-from datetime import datetime, timedelta
+import asyncio
+
+import aiohttp
+
+from backend.services import json_codec
 
 BASE_URL = "http://localhost:8000"
 
-print("\n" + "="*80)
-print("TESTING BACKEND ENDPOINTS")
-print("="*80)
-
-# Test 1: GET /api/v1/topology/TEST
-print("\n[1] GET /api/v1/topology/TEST")
-print("-" * 80)
-
-try:
-    response = requests.get(f"{BASE_URL}/api/v1/topology/TEST")
-    print(f"Status: {response.status_code}")
-    
-    if response.status_code == 200:
-        data = response.json()
-        print(f"✓ Response:")
-        print(json.dumps(data, indent=2, default=str))
-    else:
-        print(f"❌ Error: {response.text}")
-except Exception as e:
-    print(f"❌ Connection error: {e}")
-
-# Test 2: POST /api/v1/replay/bars (if exists)
-print("\n[2] Check available endpoints")
-print("-" * 80)
-
-try:
-    response = requests.get(f"{BASE_URL}/openapi.json")
-    if response.status_code == 200:
-        openapi = response.json()
-        paths = openapi.get("paths", {})
-        print(f"Available endpoints ({len(paths)}):")
-        for path in sorted(paths.keys()):
-            methods = list(paths[path].keys())
-            print(f"  {path}: {', '.join(methods)}")
-except Exception as e:
-    print(f"Could not fetch OpenAPI schema: {e}")
-
-print("\n" + "="*80)
-print("To access Swagger UI: http://localhost:8000/docs")
-print("="*80)
+
+async def fetch(session: aiohttp.ClientSession, path: str):
+    """(status, raw body) for one GET on the shared session"""
+    async with session.get(path) as response:
+        return response.status, await response.read()
+
+
+async def main():
+    print("\n" + "="*80)
+    print("TESTING BACKEND ENDPOINTS")
+    print("="*80)
+
+    # Both requests are independent - one pooled session, fetched concurrently
+    async with aiohttp.ClientSession(base_url=BASE_URL) as session:
+        topology, schema = await asyncio.gather(
+            fetch(session, "/api/v1/topology/TEST"),
+            fetch(session, "/openapi.json"),
+            return_exceptions=True
+        )
+
+    # Test 1: GET /api/v1/topology/TEST
+    print("\n[1] GET /api/v1/topology/TEST")
+    print("-" * 80)
+
+    try:
+        if isinstance(topology, BaseException):
+            raise topology
+        status, body = topology
+        print(f"Status: {status}")
+
+        if status == 200:
+            data = json_codec.loads(body)
+            print(f"✓ Response:")
+            print(json_codec.dumps_str(data, default=str, indent=True))
+        else:
+            print(f"❌ Error: {body.decode(errors='replace')}")
+    except Exception as e:
+        print(f"❌ Connection error: {e}")
+
+    # Test 2: POST /api/v1/replay/bars (if exists)
+    print("\n[2] Check available endpoints")
+    print("-" * 80)
+
+    try:
+        if isinstance(schema, BaseException):
+            raise schema
+        status, body = schema
+        if status == 200:
+            openapi = json_codec.loads(body)
+            paths = openapi.get("paths", {})
+            print(f"Available endpoints ({len(paths)}):")
+            for path in sorted(paths.keys()):
+                methods = list(paths[path].keys())
+                print(f"  {path}: {', '.join(methods)}")
+    except Exception as e:
+        print(f"Could not fetch OpenAPI schema: {e}")
+
+    print("\n" + "="*80)
+    print("To access Swagger UI: http://localhost:8000/docs")
+    print("="*80)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
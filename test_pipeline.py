@@ -6,106 +6,113 @@ Full Pipeline Test:
 4. GET /api/v1/predictive/{symbol} - Get predictions
 5. GET /api/v1/signals/{symbol} - Get signals
 """
-import requests
-import json
-from datetime import datetime
+import asyncio
+
+import aiohttp
+
+from backend.services import json_codec
 
 BASE_URL = "http://localhost:8000"
 
-print("\n" + "="*80)
-print("FULL PIPELINE TEST")
-print("="*80)
-
-# Step 1: Check replay info
-print("\n[1] GET /api/v1/replay/info - Check replay state")
-print("-" * 80)
-try:
-    response = requests.get(f"{BASE_URL}/api/v1/replay/info")
-    print(f"Status: {response.status_code}")
-    data = response.json()
-    print(json.dumps(data, indent=2, default=str))
-except Exception as e:
-    print(f"Error: {e}")
-
-# Step 2: Reset replay
-print("\n[2] POST /api/v1/replay/reset - Initialize")
-print("-" * 80)
-try:
-    response = requests.post(f"{BASE_URL}/api/v1/replay/reset")
-    print(f"Status: {response.status_code}")
-    if response.status_code == 200:
-        print("✓ Replay initialized")
-    else:
-        print(f"Response: {response.text}")
-except Exception as e:
-    print(f"Error: {e}")
-
-# Step 3: Step through some bars
-print("\n[3] POST /api/v1/replay/step - Step through bars")
-print("-" * 80)
-for i in range(5):
+
+async def fetch(session: aiohttp.ClientSession, method: str, path: str):
+    """(status, raw body) for one request on the shared session"""
+    async with session.request(method, path) as response:
+        return response.status, await response.read()
+
+
+def print_json_result(result):
+    """Print a fetch() result (or the exception gather returned instead)"""
     try:
-        response = requests.post(f"{BASE_URL}/api/v1/replay/step")
-        if response.status_code == 200:
-            print(f"Step {i+1}: ✓")
+        if isinstance(result, BaseException):
+            raise result
+        status, body = result
+        print(f"Status: {status}")
+        if status == 200:
+            print(json_codec.dumps_str(json_codec.loads(body), default=str, indent=True))
         else:
-            print(f"Step {i+1}: ❌ {response.status_code}")
+            print(f"Response: {body.decode(errors='replace')}")
     except Exception as e:
-        print(f"Step {i+1}: Error {e}")
-
-# Step 4: Get replay info
-print("\n[4] GET /api/v1/replay/info - Check progress")
-print("-" * 80)
-try:
-    response = requests.get(f"{BASE_URL}/api/v1/replay/info")
-    data = response.json()
-    print(json.dumps(data, indent=2, default=str))
-except Exception as e:
-    print(f"Error: {e}")
-
-# Step 5: Get topology
-print("\n[5] GET /api/v1/topology/{symbol} - Get topology snapshot")
-print("-" * 80)
-symbol = "TEST"  # Default symbol
-try:
-    response = requests.get(f"{BASE_URL}/api/v1/topology/{symbol}")
-    print(f"Status: {response.status_code}")
-    if response.status_code == 200:
-        data = response.json()
-        print(json.dumps(data, indent=2, default=str))
-    else:
-        print(f"Response: {response.text}")
-except Exception as e:
-    print(f"Error: {e}")
-
-# Step 6: Get predictive
-print("\n[6] GET /api/v1/predictive/{symbol} - Get predictions")
-print("-" * 80)
-try:
-    response = requests.get(f"{BASE_URL}/api/v1/predictive/{symbol}")
-    print(f"Status: {response.status_code}")
-    if response.status_code == 200:
-        data = response.json()
-        print(json.dumps(data, indent=2, default=str))
-    else:
-        print(f"Response: {response.text}")
-except Exception as e:
-    print(f"Error: {e}")
-
-# Step 7: Get signals
-print("\n[7] GET /api/v1/signals/{symbol} - Get signals")
-print("-" * 80)
-try:
-    response = requests.get(f"{BASE_URL}/api/v1/signals/api/v1/signals/{symbol}")
-    print(f"Status: {response.status_code}")
-    if response.status_code == 200:
-        data = response.json()
-        print(json.dumps(data, indent=2, default=str))
-    else:
-        print(f"Response: {response.text}")
-except Exception as e:
-    print(f"Error: {e}")
-
-print("\n" + "="*80)
-print("Pipeline test complete!")
-print("="*80)
+        print(f"Error: {e}")
+
+
+async def main():
+    print("\n" + "="*80)
+    print("FULL PIPELINE TEST")
+    print("="*80)
+
+    # One pooled session (keep-alive) for every request
+    async with aiohttp.ClientSession(base_url=BASE_URL) as session:
+        # Step 1: Check replay info
+        print("\n[1] GET /api/v1/replay/info - Check replay state")
+        print("-" * 80)
+        try:
+            status, body = await fetch(session, 'GET', "/api/v1/replay/info")
+            print(f"Status: {status}")
+            print(json_codec.dumps_str(json_codec.loads(body), default=str, indent=True))
+        except Exception as e:
+            print(f"Error: {e}")
+
+        # Step 2: Reset replay
+        print("\n[2] POST /api/v1/replay/reset - Initialize")
+        print("-" * 80)
+        try:
+            status, body = await fetch(session, 'POST', "/api/v1/replay/reset")
+            print(f"Status: {status}")
+            if status == 200:
+                print("✓ Replay initialized")
+            else:
+                print(f"Response: {body.decode(errors='replace')}")
+        except Exception as e:
+            print(f"Error: {e}")
+
+        # Step 3: Step through some bars (sequential - each step advances the replay)
+        print("\n[3] POST /api/v1/replay/step - Step through bars")
+        print("-" * 80)
+        for i in range(5):
+            try:
+                status, _ = await fetch(session, 'POST', "/api/v1/replay/step")
+                if status == 200:
+                    print(f"Step {i+1}: ✓")
+                else:
+                    print(f"Step {i+1}: ❌ {status}")
+            except Exception as e:
+                print(f"Step {i+1}: Error {e}")
+
+        # Steps 4-7 only read state - fetch them concurrently, print in order
+        symbol = "TEST"  # Default symbol
+        info, topology, predictive, signals = await asyncio.gather(
+            fetch(session, 'GET', "/api/v1/replay/info"),
+            fetch(session, 'GET', f"/api/v1/topology/{symbol}"),
+            fetch(session, 'GET', f"/api/v1/predictive/{symbol}"),
+            fetch(session, 'GET', f"/api/v1/signals/{symbol}"),
+            return_exceptions=True
+        )
+
+        # Step 4: Get replay info
+        print("\n[4] GET /api/v1/replay/info - Check progress")
+        print("-" * 80)
+        print_json_result(info)
+
+        # Step 5: Get topology
+        print("\n[5] GET /api/v1/topology/{symbol} - Get topology snapshot")
+        print("-" * 80)
+        print_json_result(topology)
+
+        # Step 6: Get predictive
+        print("\n[6] GET /api/v1/predictive/{symbol} - Get predictions")
+        print("-" * 80)
+        print_json_result(predictive)
+
+        # Step 7: Get signals
+        print("\n[7] GET /api/v1/signals/{symbol} - Get signals")
+        print("-" * 80)
+        print_json_result(signals)
+
+    print("\n" + "="*80)
+    print("Pipeline test complete!")
+    print("="*80)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
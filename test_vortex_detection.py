@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 sys.path.insert(0, r'c:\Users\gyorg\OneDrive\Desktop\OIE')
 
 from backend.data.models import Bar
+from backend.data.frame import BarFrame
 from backend.topology.engine import TopologyEngine
 
 # Create aggressive bars (same as before)
@@ -61,11 +62,14 @@ print("\n" + "="*80)
 print("VORTEX DETECTION TEST - WITH 15° ANGLE THRESHOLD")
 print("="*80)
 
+# Columns extracted once; the engine reads the arrays directly
+frame = BarFrame.from_bars(bars)
+
 engine = TopologyEngine()
-snapshot = engine.compute("AGGRESSIVE", bars)
+snapshot = engine.compute("AGGRESSIVE", frame)
 
-print(f"\nDataset: {len(bars)} bars")
-print(f"Price range: {min(b.close for b in bars):.2f} - {max(b.close for b in bars):.2f}")
+print(f"\nDataset: {len(frame)} bars")
+print(f"Price range: {frame.close.min():.2f} - {frame.close.max():.2f}")
 print(f"\nTopologySnapshot:")
 print(f"  Coherence: {snapshot.coherence:.6f}")
 print(f"  Energy: {snapshot.energy:.4f}")
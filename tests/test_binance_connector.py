@@ -0,0 +1,225 @@
+"""
+BinanceTestnetConnector position cache vs. user-data stream event ordering,
+the bookTicker price cache and the on-disk exchangeInfo cache.
+"""
+import asyncio
+import json
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+from backend.trading.binance_connector import BinanceTestnetConnector
+
+
+class _OpenSocket:
+    closed = False
+
+
+def _synced_connector() -> BinanceTestnetConnector:
+    """Connector whose position cache is marked in sync with an active user stream"""
+    connector = BinanceTestnetConnector(api_key="key", api_secret="secret")
+    connector._user_ws = _OpenSocket()
+    connector._positions_synced = True
+
+    async def no_rest_account():
+        raise AssertionError("get_position must not fall back to REST while synced")
+
+    connector.get_account = no_rest_account
+    return connector
+
+
+def _account_update(symbol: str, amount: float, entry_price: float, transaction_time: int = None) -> dict:
+    event = {'e': 'ACCOUNT_UPDATE', 'a': {'P': [{'s': symbol, 'pa': str(amount), 'ep': str(entry_price), 'up': '0'}]}}
+    if transaction_time is not None:
+        event['T'] = transaction_time
+    return event
+
+
+class EntryFillBeforeAccountUpdateTest(unittest.TestCase):
+    def test_position_visible_before_account_update(self):
+        # Fill response arrives, ACCOUNT_UPDATE has not yet: the entry must be visible
+        connector = _synced_connector()
+
+        async def fill(method, endpoint, params=None, signed=False):
+            return {'orderId': 1, 'avgPrice': '100.0'}
+
+        connector._request = fill
+
+        async def scenario():
+            await connector.open_long("BTCUSDT", 0.01)
+            position = await connector.get_position("BTCUSDT")
+            self.assertIsNotNone(position)
+            self.assertEqual(position.side, 'LONG')
+            self.assertEqual(position.quantity, 0.01)
+
+            # The late ACCOUNT_UPDATE replaces the seeded values, it does not add to them
+            connector._handle_user_event(_account_update("BTCUSDT", 0.01, 100.5))
+            position = await connector.get_position("BTCUSDT")
+            self.assertEqual(position.quantity, 0.01)
+            self.assertEqual(position.entry_price, 100.5)
+
+        asyncio.run(scenario())
+
+    def test_close_then_reopen_before_account_updates(self):
+        # Reversal: close LONG and open SHORT back to back, events lag behind both orders
+        connector = _synced_connector()
+        fills = iter([
+            {'orderId': 1, 'avgPrice': '100.0', 'updateTime': 1000},
+            {'orderId': 2, 'avgPrice': '101.0', 'updateTime': 2000},
+            {'orderId': 3, 'avgPrice': '101.0', 'updateTime': 2001},
+        ])
+        orders = []
+
+        async def exchange(method, endpoint, params=None, signed=False):
+            if endpoint == '/fapi/v1/order':
+                orders.append(params['side'])
+                return next(fills)
+            return {'code': 200}
+
+        connector._request = exchange
+
+        async def scenario():
+            await connector.open_long("BTCUSDT", 0.01)
+            self.assertTrue((await connector.close_position("BTCUSDT")).success)
+            self.assertIsNone(await connector.get_position("BTCUSDT"))
+            # A repeated close in the stale window must not send another market order
+            self.assertFalse((await connector.close_position("BTCUSDT")).success)
+
+            await connector.open_short("BTCUSDT", 0.02)
+            position = await connector.get_position("BTCUSDT")
+            self.assertEqual((position.side, position.quantity), ('SHORT', 0.02))
+
+            # The lagging events of the entry and of the close do not wipe the new SHORT
+            connector._handle_user_event(_account_update("BTCUSDT", 0.01, 100.0, transaction_time=1000))
+            connector._handle_user_event(_account_update("BTCUSDT", 0, 0.0, transaction_time=2000))
+            position = await connector.get_position("BTCUSDT")
+            self.assertEqual((position.side, position.quantity), ('SHORT', 0.02))
+
+            # Newer events still apply (e.g. the SL closing the SHORT)
+            connector._handle_user_event(_account_update("BTCUSDT", 0, 0.0, transaction_time=3000))
+            self.assertIsNone(await connector.get_position("BTCUSDT"))
+
+        asyncio.run(scenario())
+        self.assertEqual(orders, ['BUY', 'SELL', 'SELL'])
+
+    def test_account_update_before_fill_response_is_not_doubled(self):
+        connector = _synced_connector()
+
+        async def fill_after_event(method, endpoint, params=None, signed=False):
+            connector._handle_user_event(_account_update("BTCUSDT", -0.02, 99.0))
+            return {'orderId': 2, 'avgPrice': '99.1'}
+
+        connector._request = fill_after_event
+
+        async def scenario():
+            await connector.open_short("BTCUSDT", 0.02)
+            position = await connector.get_position("BTCUSDT")
+            self.assertEqual(position.side, 'SHORT')
+            self.assertEqual(position.quantity, 0.02)
+            self.assertEqual(position.entry_price, 99.0)
+
+        asyncio.run(scenario())
+
+
+_EXCHANGE_INFO = {'symbols': [{
+    'symbol': 'BTCUSDT', 'quantityPrecision': 3, 'pricePrecision': 1,
+    'filters': [
+        {'filterType': 'LOT_SIZE', 'minQty': '0.001', 'stepSize': '0.001'},
+        {'filterType': 'PRICE_FILTER', 'tickSize': '0.10'},
+    ],
+}]}
+
+
+class SymbolInfoCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = Path(tmp.name)
+        self.requests = 0
+
+    def _connector(self) -> BinanceTestnetConnector:
+        connector = BinanceTestnetConnector(api_key="key", api_secret="secret")
+        connector.SYMBOL_CACHE_DIR = self.cache_dir
+
+        async def exchange_info(method, endpoint, params=None, signed=False):
+            self.requests += 1
+            return _EXCHANGE_INFO
+
+        connector._request = exchange_info
+        return connector
+
+    def test_single_cache_file_reused_and_legacy_files_removed(self):
+        (self.cache_dir / "exchange_info_2020-01-01.json").write_text("{}")
+
+        self.assertEqual(asyncio.run(self._connector()._preload_symbol_info()), 1)
+        self.assertEqual([p.name for p in self.cache_dir.iterdir()], ["exchange_info.json"])
+
+        connector = self._connector()
+        asyncio.run(connector._preload_symbol_info())
+        self.assertEqual(self.requests, 1)
+        self.assertEqual(connector.round_price("BTCUSDT", 100.04), 100.0)
+
+    def test_stale_cache_is_refreshed(self):
+        stale = {'date': '2020-01-01', 'symbols': {}}
+        (self.cache_dir / "exchange_info.json").write_text(json.dumps(stale))
+
+        asyncio.run(self._connector()._preload_symbol_info())
+        self.assertEqual(self.requests, 1)
+        cached = json.loads((self.cache_dir / "exchange_info.json").read_text())
+        self.assertEqual(cached['date'], date.today().isoformat())
+        self.assertIn('BTCUSDT', cached['symbols'])
+
+
+class _IdleTickerSocket:
+    """bookTicker socket that connects and then stays silent"""
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.Event().wait()
+
+
+class _IdleTickerSession:
+    closed = False
+
+    def ws_connect(self, url, heartbeat=None):
+        return _IdleTickerSocket()
+
+
+class TickerPriceCacheTest(unittest.TestCase):
+    def test_get_price_does_not_subscribe(self):
+        connector = BinanceTestnetConnector(api_key="key", api_secret="secret")
+
+        async def ticker_price(method, endpoint, params=None, signed=False):
+            return {'price': '101.5'}
+
+        connector._request = ticker_price
+        self.assertEqual(asyncio.run(connector.get_price("BTCUSDT")), 101.5)
+        self.assertEqual(connector._ticker_symbols, set())
+        self.assertIsNone(connector._ticker_task)
+
+    def test_resubscribe_keeps_cached_prices(self):
+        connector = BinanceTestnetConnector(api_key="key", api_secret="secret")
+        connector.session = _IdleTickerSession()
+
+        async def scenario():
+            await connector.subscribe_ticker("BTCUSDT")
+            connector.prices["BTCUSDT"] = 100.0
+            await asyncio.sleep(0)
+            await connector.subscribe_ticker("ETHUSDT")
+            self.assertEqual(connector.prices, {"BTCUSDT": 100.0})
+            self.assertEqual(await connector.get_price("BTCUSDT"), 100.0)
+            await connector._stop_ticker_stream()
+
+        asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    unittest.main()
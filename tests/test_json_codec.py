@@ -0,0 +1,70 @@
+"""
+json_codec: the orjson path and the stdlib fallback produce the same bytes.
+"""
+import importlib.util
+import sys
+import unittest
+from dataclasses import dataclass
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+
+from backend.services import json_codec
+
+
+def _stdlib_codec():
+    """A fresh copy of json_codec loaded with orjson unavailable"""
+    spec = importlib.util.find_spec("backend.services.json_codec")
+    module = importlib.util.module_from_spec(spec)
+    with mock.patch.dict(sys.modules, {"orjson": None}):
+        spec.loader.exec_module(module)
+    return module
+
+
+@dataclass(slots=True)
+class _Fill:
+    symbol: str
+    price: float
+    time: datetime
+
+
+class _Opaque:
+    pass
+
+
+_PAYLOAD = {
+    "fill": _Fill("BTCUSDT", 100.5, datetime(2025, 1, 1, 9, 30)),
+    "energies": np.array([1.5, 2.0]),
+    "count": np.int64(3),
+    "note": "preț",
+    "nested": [{"a": None, "b": True}],
+}
+
+
+@unittest.skipUnless(json_codec.ORJSON_AVAILABLE, "orjson not installed")
+class FallbackParityTest(unittest.TestCase):
+    def setUp(self):
+        self.fallback = _stdlib_codec()
+        self.assertFalse(self.fallback.ORJSON_AVAILABLE)
+
+    def test_compact_line(self):
+        self.assertEqual(self.fallback.dumps(_PAYLOAD, newline=True), json_codec.dumps(_PAYLOAD, newline=True))
+
+    def test_indented(self):
+        self.assertEqual(self.fallback.dumps(_PAYLOAD, indent=True), json_codec.dumps(_PAYLOAD, indent=True))
+
+    def test_default_only_for_unknown_types(self):
+        payload = {"x": _Opaque(), "t": datetime(2025, 1, 1)}
+        expected = json_codec.dumps_str(payload, default=lambda o: "opaque")
+        self.assertEqual(self.fallback.dumps_str(payload, default=lambda o: "opaque"), expected)
+        with self.assertRaises(TypeError):
+            self.fallback.dumps({"x": _Opaque()})
+
+    def test_loads_bytes_and_str(self):
+        line = json_codec.dumps(_PAYLOAD)
+        self.assertEqual(self.fallback.loads(line), json_codec.loads(line.decode("utf-8")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+"""
+P2Quantile streaming estimate vs. the exact np.quantile of the same stream.
+"""
+import unittest
+
+import numpy as np
+
+from backend.topology._p2quantile import P2Quantile
+
+
+def _estimate(values: np.ndarray, p: float = 0.7) -> float:
+    estimator = P2Quantile(p)
+    for value in values:
+        estimator.update(value)
+    return estimator.estimate()
+
+
+class P2QuantileTest(unittest.TestCase):
+    def test_exponential_stream(self):
+        x = np.random.default_rng(7).exponential(1000.0, 5000)
+        exact = np.quantile(x, 0.7)
+        self.assertAlmostEqual(_estimate(x), exact, delta=0.03 * exact)
+
+    def test_normal_stream(self):
+        x = np.random.default_rng(11).normal(50.0, 5.0, 5000)
+        exact = np.quantile(x, 0.7)
+        self.assertAlmostEqual(_estimate(x), exact, delta=0.01 * exact)
+
+    def test_constant_stream(self):
+        x = np.full(500, 3.25)
+        self.assertEqual(_estimate(x), 3.25)
+
+    def test_small_sample_uses_exact_index(self):
+        # count < 5: the markers are not initialized, the estimate is read from the sorted sample
+        self.assertEqual(_estimate(np.array([4.0, 1.0, 3.0, 2.0])), 3.0)
+        self.assertEqual(_estimate(np.array([5.0])), 5.0)
+
+    def test_empty_stream(self):
+        self.assertEqual(P2Quantile(0.7).estimate(), 0.0)
+
+    def test_p_out_of_range(self):
+        with self.assertRaises(ValueError):
+            P2Quantile(1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+"""
+PaperTradingManager.load_history on daily trade logs with damaged lines.
+"""
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from backend.trading.paper_trading import PaperTradingManager, TradingConfig
+
+
+def _closed_entry(trade_id: str) -> dict:
+    return {
+        'action': 'CLOSED_TP',
+        'trade': {'id': trade_id, 'symbol': 'BTCUSDT', 'timeframe': '1m', 'pnl': 1.0},
+    }
+
+
+class LoadHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.manager = PaperTradingManager(TradingConfig(symbol='BTCUSDT', timeframe='1m'))
+        self.manager.log_dir = Path(self._tmp.name)
+
+    def test_truncated_trailing_record_is_skipped(self):
+        # A crash mid-write leaves a partial last line; a blank line sits in between
+        lines = [json.dumps(_closed_entry('a')), '', json.dumps(_closed_entry('b')),
+                 json.dumps(_closed_entry('c'))[:25]]
+        (self.manager.log_dir / 'trades_20260101.jsonl').write_text('\n'.join(lines))
+
+        with self.assertLogs('backend.trading.paper_trading', level='WARNING'):
+            history = self.manager.load_history()
+        self.assertEqual([trade['id'] for trade in history], ['a', 'b'])
+
+
+if __name__ == "__main__":
+    unittest.main()
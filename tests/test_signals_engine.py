@@ -0,0 +1,101 @@
+"""
+SignalsEngine.compute_many vs. compute() called per symbol.
+"""
+import unittest
+from datetime import datetime, timedelta
+from typing import List
+
+import numpy as np
+
+from backend.data.models import Bar
+from backend.predictive.models import PredictiveSnapshot
+from backend.signals.engine import SignalsEngine
+from backend.topology.models import TopologySnapshot
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "XRPUSDT", "ADAUSDT"]
+# Per-symbol delta bias: strong/weak bullish, strong/weak bearish, flat, noisy
+DELTA_BIAS = [0.7, 0.2, -0.7, -0.2, 0.0, 0.05]
+
+
+def _bars(rng: np.random.Generator, start: datetime, bias: float, count: int) -> List[Bar]:
+    bars = []
+    for i in range(count):
+        volume = float(rng.uniform(500.0, 2000.0))
+        share = float(np.clip(0.5 + bias / 2 + rng.normal(0.0, 0.15), 0.0, 1.0))
+        buy = volume * share
+        bars.append(Bar(
+            timestamp=start + timedelta(minutes=i), open=100.0, high=101.0, low=99.0, close=100.0,
+            volume=volume, buy_volume=buy, sell_volume=volume - buy, delta=2 * buy - volume,
+        ))
+    return bars
+
+
+def _snapshots(symbol: str, timestamp: datetime, ifi: float, bp_up: float, bp_down: float):
+    topology = TopologySnapshot(symbol=symbol, timestamp=timestamp, coherence=0.1, energy=1.0, vortexes=[])
+    predictive = PredictiveSnapshot(
+        symbol=symbol, timestamp=timestamp, horizon_bars=10, num_scenarios=100,
+        IFI=ifi, breakout_probability_up=bp_up, breakout_probability_down=bp_down,
+        energy_collapse_risk=0.2, cone_upper=[], cone_lower=[],
+    )
+    return topology, predictive
+
+
+def _key(signal):
+    return signal.symbol, signal.type, signal.confidence, signal.description
+
+
+class ComputeManyTest(unittest.TestCase):
+    def _run(self, block_contratrend: bool, seed: int):
+        rng = np.random.default_rng(seed)
+        batched = SignalsEngine(block_contratrend=block_contratrend)
+        single = SignalsEngine(block_contratrend=block_contratrend)
+        base = datetime(2025, 1, 1)
+        ifi = {symbol: 0.5 for symbol in SYMBOLS}
+        seen_types = set()
+        silent = 0
+
+        for step in range(40):
+            now = base + timedelta(minutes=10 * step)
+            items = []
+            for symbol, bias in zip(SYMBOLS, DELTA_BIAS):
+                # IFI rises and falls; bp above and below both thresholds
+                ifi[symbol] += float(rng.normal(0.0, 0.05))
+                topology, predictive = _snapshots(
+                    symbol, now, ifi[symbol], float(rng.uniform(0.4, 0.9)), float(rng.uniform(0.4, 0.9))
+                )
+                if step % 3 == 0:
+                    bars = _bars(rng, now, bias, 12)
+                else:
+                    bars = None
+                    bar = _bars(rng, now, bias, 1)[0]
+                    batched.append_bar(symbol, bar)
+                    single.append_bar(symbol, bar)
+                items.append((symbol, topology, predictive, bars))
+
+            expected = []
+            for symbol, topology, predictive, bars in items:
+                per_symbol = single.compute(symbol, topology, predictive, bars=bars)
+                silent += not per_symbol
+                expected.extend(per_symbol)
+            actual = batched.compute_many(items)
+
+            self.assertEqual([_key(s) for s in actual], [_key(s) for s in expected], msg=f"step {step}")
+            seen_types.update(s.type for s in expected)
+
+        # The seeded run must reach every branch of the compute() ladder
+        self.assertEqual(seen_types, {"predictive_breakout_long", "predictive_breakout_short", "flow_neutral_watch"})
+        return silent
+
+    def test_matches_compute_with_contratrend_block(self):
+        silent = self._run(block_contratrend=True, seed=21)
+        self.assertGreater(silent, 0)  # blocked or too-weak symbols emit nothing
+
+    def test_matches_compute_without_contratrend_block(self):
+        self._run(block_contratrend=False, seed=22)
+
+    def test_empty_batch(self):
+        self.assertEqual(SignalsEngine().compute_many([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
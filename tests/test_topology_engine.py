@@ -0,0 +1,116 @@
+"""
+TopologyEngine snapshot cache, per-stream state slots and the backtest sweep.
+"""
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from backend.data.frame import BarFrame, BarRing
+from backend.data.models import Bar
+from backend.topology import _kernel
+from backend.topology.engine import TopologyEngine
+
+
+def _ring_with_bars(count: int = 30) -> BarRing:
+    ring = BarRing(capacity=50)
+    base = datetime(2025, 1, 1)
+    price = 100.0
+    for i in range(count):
+        close = price + (1.0 if i % 3 else -1.5)
+        ring.append(base + timedelta(minutes=i), price, max(price, close) + 0.5,
+                    min(price, close) - 0.5, close, 1000.0 + 10 * i, 600.0, 400.0 + i)
+        price = close
+    return ring
+
+
+class SnapshotCacheTest(unittest.TestCase):
+    def test_same_ring_frame_hits_cache(self):
+        # BarRing.frame leaves delta as all-NaN; the cache key must still match
+        ring = _ring_with_bars()
+        engine = TopologyEngine(window_size=100)
+        first = engine.compute("TEST", ring.frame(30))
+        second = engine.compute("TEST", ring.frame(30))
+        self.assertIs(first, second)
+
+    def test_new_bar_misses_cache(self):
+        ring = _ring_with_bars()
+        engine = TopologyEngine(window_size=100)
+        first = engine.compute("TEST", ring.frame(30))
+        ring.append(datetime(2025, 1, 2), 100.0, 101.0, 99.0, 100.5, 900.0, 500.0, 400.0)
+        second = engine.compute("TEST", ring.frame(30))
+        self.assertIsNot(first, second)
+
+
+class StreamSlotTest(unittest.TestCase):
+    def test_timeframes_on_one_symbol_keep_separate_state(self):
+        # 5m and 15m runners share the module engine and the symbol, alternating bar by bar
+        fast, slow = _ring_with_bars(30), _ring_with_bars(20)
+        engine = TopologyEngine(window_size=100)
+        first = engine.compute("TEST", fast.frame(30), stream="TEST@5m")
+        engine.compute("TEST", slow.frame(20), stream="TEST@15m")
+        self.assertIs(engine.compute("TEST", fast.frame(30), stream="TEST@5m"), first)
+        self.assertEqual(first.symbol, "TEST")
+
+        # The next 5m bar reuses the 5m window state (incremental path), not the 15m one
+        fast.append(datetime(2025, 1, 2), 100.0, 101.0, 99.0, 100.5, 900.0, 500.0, 400.0)
+        state = engine._state["TEST@5m"]
+        frame = fast.frame(30)
+        self.assertEqual(engine._find_shift(
+            state, frame.ts, frame.close, frame.volume, np.nan_to_num(frame.delta, nan=0.0)), 1)
+
+        incremental = engine.compute("TEST", frame, stream="TEST@5m")
+        full = TopologyEngine(window_size=100).compute("TEST", frame)
+        self.assertAlmostEqual(incremental.coherence, full.coherence, places=12)
+        self.assertEqual(incremental.energy, full.energy)
+
+
+def _random_frame(count: int, seed: int) -> BarFrame:
+    rng = np.random.default_rng(seed)
+    base = datetime(2025, 1, 1)
+    closes = 100.0 * np.cumprod(1.0 + rng.normal(0.0, 0.004, count))
+    bars = []
+    for i, close in enumerate(closes.tolist()):
+        volume = float(rng.uniform(500.0, 5000.0))
+        buy = volume * float(rng.uniform(0.2, 0.8))
+        bars.append(Bar(
+            timestamp=base + timedelta(minutes=i), open=close, high=close + 0.5, low=close - 0.5,
+            close=close, volume=volume, buy_volume=buy, sell_volume=volume - buy,
+            # A few bars without delta: the sweep and compute must both treat them as 0
+            delta=None if i % 17 == 0 else 2 * buy - volume,
+        ))
+    return BarFrame.from_bars(bars)
+
+
+class BacktestSweepTest(unittest.TestCase):
+    def test_sweep_matches_compute_on_sliding_windows(self):
+        frame = _random_frame(260, seed=3)
+        window = 50
+        engine = TopologyEngine(window_size=window)
+        coherence, energy = engine.compute_backtest(frame)
+
+        self.assertTrue(np.isnan(coherence[:window - 1]).all())
+        self.assertTrue(np.isnan(energy[:window - 1]).all())
+        # Same sliding windows through compute(), on one engine as the backtest runner does
+        for t in range(window - 1, len(frame)):
+            snapshot = engine.compute("TEST", frame.window(t - window + 1, t + 1))
+            self.assertAlmostEqual(coherence[t], snapshot.coherence, places=9, msg=f"bar {t}")
+            self.assertAlmostEqual(energy[t], snapshot.energy, places=6, msg=f"bar {t}")
+
+    def test_jit_sweep_matches_numpy_fallback(self):
+        if not _kernel.NUMBA_AVAILABLE:
+            self.skipTest("numba not installed")
+        frame = _random_frame(200, seed=5)
+        args = (frame.close, frame.volume, np.nan_to_num(frame.delta, nan=0.0), 30)
+        jit_coherence, jit_energy = _kernel.topology_sweep(*args)
+        np_coherence, np_energy = _kernel._topology_sweep_numpy(*args)
+        np.testing.assert_allclose(jit_coherence, np_coherence, rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(jit_energy, np_energy, rtol=1e-9)
+
+    def test_window_too_small(self):
+        with self.assertRaises(ValueError):
+            TopologyEngine().compute_backtest(_random_frame(10, seed=1), window=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,14 +4,17 @@ Tests: return normalization, delta-flow normalization, 2D cross-product rotation
 vortex thresholds, and coherence calculation.
 """
 
-import math
 import sys
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional, Tuple
+
+import numpy as np
 
 sys.path.insert(0, r'c:\Users\gyorg\OneDrive\Desktop\OIE')
 
 from backend.data.models import Bar
+from backend.data.frame import BarFrame
 from backend.topology.models import TopologySnapshot, VortexMarker
 from backend.topology.engine import TopologyEngine
 
@@ -139,10 +142,136 @@ def create_synthetic_bars() -> List[Bar]:
 # MANUAL PIPELINE SIMULATION & VALIDATION
 # ============================================================================
 
-def manual_compute(bars: List[Bar]):
+def returns_and_flows(frame: BarFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-bar returns and delta/volume flows, computed column-wise with NumPy"""
+    close = frame.close
+    if len(close) == 0:
+        return np.zeros(0), np.zeros(0)
+    prev = np.empty_like(close)
+    prev[0] = close[0]
+    prev[1:] = close[:-1]
+    returns = np.zeros_like(close)
+    np.divide(close - prev, np.abs(prev), out=returns, where=prev != 0)
+    flows = np.zeros_like(close)
+    np.divide(frame.delta, frame.volume, out=flows,
+              where=(frame.volume > 0) & ~np.isnan(frame.delta))
+    return returns, flows
+
+
+def rotation_terms(r: np.ndarray, f: np.ndarray, volume: np.ndarray):
     """
-    Step-by-step manual computation to validate engine logic.
+    Cross products, vector norms, normalized rotations and energies for bars
+    1..n-2 in one vectorized pass (v_prev = bar k-1, v_next = bar k+1).
+    """
+    cross = r[:-2] * f[2:] - f[:-2] * r[2:]
+    # ||(ret, flow)|| once per bar; v_prev / v_next norms are shifted views of it
+    norms = np.sqrt(r * r + f * f)
+    norm_prev, norm_next = norms[:-2], norms[2:]
+    denom = norm_prev * norm_next
+    rotations = np.zeros_like(cross)
+    np.divide(cross, denom, out=rotations, where=denom >= 1e-9)
+    energies = np.abs(r[1:-1]) * np.nan_to_num(volume[1:-1], nan=0.0)
+    return cross, denom, norm_prev, norm_next, rotations, energies
+
+
+def vortex_checks(rotations: np.ndarray, energies: np.ndarray, energy_threshold: float):
+    """Per-bar |rot| > 0.6 and energy >= threshold checks, plus their conjunction"""
+    rot_checks = np.abs(rotations) > 0.6
+    energy_checks = energies >= energy_threshold
+    return rot_checks.tolist(), energy_checks.tolist(), rot_checks & energy_checks
+
+
+def build_vortex_markers(bars: List[Bar], rotations: List[float], vortex_mask: np.ndarray) -> List[VortexMarker]:
+    """VortexMarker only for the bars that pass both checks (rotation index k_idx = bar k - 1)"""
+    markers = []
+    for k_idx in np.flatnonzero(vortex_mask).tolist():
+        k = k_idx + 1
+        rot = rotations[k_idx]
+        markers.append(VortexMarker(
+            index=k,
+            timestamp=bars[k].timestamp,
+            price=bars[k].close,
+            strength=abs(rot),
+            direction="clockwise" if rot < 0 else "counterclockwise"
+        ))
+    return markers
+
+
+@dataclass
+class ManualResult:
+    """
+    compute_manual() output. Per-bar arrays: returns/flows for bars 0..n-1,
+    the rotation terms and checks for bars 1..n-2.
+    """
+    returns: np.ndarray
+    flows: np.ndarray
+    rotations: np.ndarray
+    energies: np.ndarray
+    crosses: np.ndarray
+    denoms: np.ndarray
+    norms_prev: np.ndarray
+    norms_next: np.ndarray
+    coherence: float
+    thr_index: int
+    energy_threshold: float
+    rot_checks: List[bool]
+    energy_checks: List[bool]
+    vortex_mask: np.ndarray
+    vortex_markers: List[VortexMarker]
+
+
+def compute_manual(bars: List[Bar], frame: BarFrame) -> ManualResult:
+    """
+    Pure numeric part of the manual pipeline (no I/O): returns, flows,
+    rotations, energies, coherence, energy threshold and vortex markers.
     """
+    returns, flows = returns_and_flows(frame)
+    crosses, denoms, norms_prev, norms_next, rot_np, eng_np = rotation_terms(returns, flows, frame.volume)
+    rotations = rot_np.tolist()
+    
+    # Coherence = mean |rot_norm|
+    coherence = sum(abs(r) for r in rotations) / len(rotations) if rotations else 0.0
+    
+    # Energy threshold (top 30% = 70th percentile)
+    if eng_np.size:
+        thr_index = int(0.7 * eng_np.size)
+        thr_index = max(0, min(thr_index, eng_np.size - 1))
+        energy_threshold = float(np.sort(eng_np)[thr_index])
+    else:
+        thr_index = 0
+        energy_threshold = 0.0
+    
+    # Vortex detection (|rot_norm| > 0.6 AND energy >= threshold)
+    rot_checks, energy_checks, vortex_mask = vortex_checks(rot_np, eng_np, energy_threshold)
+    
+    return ManualResult(
+        returns=returns,
+        flows=flows,
+        rotations=rot_np,
+        energies=eng_np,
+        crosses=crosses,
+        denoms=denoms,
+        norms_prev=norms_prev,
+        norms_next=norms_next,
+        coherence=coherence,
+        thr_index=thr_index,
+        energy_threshold=energy_threshold,
+        rot_checks=rot_checks,
+        energy_checks=energy_checks,
+        vortex_mask=vortex_mask,
+        vortex_markers=build_vortex_markers(bars, rotations, vortex_mask),
+    )
+
+
+def print_manual_report(bars: List[Bar], result: ManualResult):
+    """Step-by-step printout of a compute_manual() result (I/O only)"""
+    # Python floats for the per-bar printouts
+    returns = result.returns.tolist()
+    flows = result.flows.tolist()
+    rotations = result.rotations.tolist()
+    energies = result.energies.tolist()
+    energy_threshold = result.energy_threshold
+    
     print("\n" + "="*80)
     print("STEP-BY-STEP PIPELINE SIMULATION")
     print("="*80)
@@ -153,28 +282,18 @@ def manual_compute(bars: List[Bar]):
     # Step 1: Extract returns (price normalization)
     print("\n[STEP 1] RETURN NORMALIZATION")
     print("-" * 80)
-    returns = []
-    for i in range(len(bars)):
+    for i, ret in enumerate(returns):
         if i == 0:
-            ret = 0.0
             reason = "(first bar)"
         else:
             prev_close = bars[i - 1].close
-            ret = 0.0 if prev_close == 0 else (bars[i].close - prev_close) / abs(prev_close)
             reason = f"({bars[i].close:.4f} - {prev_close:.4f}) / {abs(prev_close):.4f}"
-        returns.append(ret)
         print(f"Bar {i:2d}: ret = {ret:7.4f}  {reason}")
     
     # Step 2: Extract flows (delta-flow normalization)
     print("\n[STEP 2] DELTA-FLOW NORMALIZATION")
     print("-" * 80)
-    flows = []
-    for i in range(len(bars)):
-        if bars[i].volume and bars[i].volume > 0 and bars[i].delta is not None:
-            flow = bars[i].delta / bars[i].volume
-        else:
-            flow = 0.0
-        flows.append(flow)
+    for i, flow in enumerate(flows):
         delta_str = f"{bars[i].delta:.1f}" if bars[i].delta is not None else "None"
         vol_str = f"{bars[i].volume:.1f}" if bars[i].volume else "0"
         print(f"Bar {i:2d}: flow = {flow:7.4f}  (delta={delta_str:7s} / volume={vol_str:7s})")
@@ -183,37 +302,13 @@ def manual_compute(bars: List[Bar]):
     print("\n[STEP 3] 2D CROSS-PRODUCT ROTATION COMPUTATION")
     print("-" * 80)
     
-    def norm(v):
-        magnitude = math.sqrt(v[0] * v[0] + v[1] * v[1])
-        return magnitude
-    
-    rotations = []
-    energies = []
-    
-    for k in range(1, len(bars) - 1):
-        v_prev = (returns[k - 1], flows[k - 1])
-        v_curr = (returns[k], flows[k])
-        v_next = (returns[k + 1], flows[k + 1])
-        
-        # 2D cross product: v_prev × v_next
-        cross = v_prev[0] * v_next[1] - v_prev[1] * v_next[0]
-        
-        norm_prev = norm(v_prev)
-        norm_next = norm(v_next)
-        denom = norm_prev * norm_next
-        
+    terms = zip(range(1, len(bars) - 1), result.crosses, result.denoms, rotations, energies)
+    for k, cross, denom, rot_norm, energy_k in terms:
         if denom < 1e-9:
-            rot_norm = 0.0
             reason = "degenerate (denom < 1e-9)"
         else:
-            rot_norm = cross / denom
             reason = f"cross={cross:.4f} / denom={denom:.4f}"
         
-        rotations.append(rot_norm)
-        
-        energy_k = abs(returns[k]) * (bars[k].volume or 0.0)
-        energies.append(energy_k)
-        
         sign = "clockwise" if rot_norm < 0 else "counterclockwise"
         print(f"Bar {k:2d}: rot_norm = {rot_norm:7.4f} ({sign:16s})  energy = {energy_k:10.2f}  [{reason}]")
     
@@ -221,28 +316,21 @@ def manual_compute(bars: List[Bar]):
     print("\n[STEP 4] COHERENCE CALCULATION")
     print("-" * 80)
     if rotations:
-        abs_rotations = [abs(r) for r in rotations]
-        coherence = sum(abs_rotations) / len(rotations)
-        print(f"Sum of |rot_norm|: {sum(abs_rotations):.4f}")
+        print(f"Sum of |rot_norm|: {sum(abs(r) for r in rotations):.4f}")
         print(f"Number of rotations: {len(rotations)}")
-        print(f"Coherence = {coherence:.4f}")
+        print(f"Coherence = {result.coherence:.4f}")
     else:
-        coherence = 0.0
         print(f"No rotations computed. Coherence = 0.0")
     
     # Step 5: Energy threshold (top 30% = 70th percentile)
     print("\n[STEP 5] ENERGY THRESHOLD (TOP 30%)")
     print("-" * 80)
-    if energies:
-        sorted_energies = sorted(energies)
-        thr_index = int(0.7 * len(sorted_energies))
-        thr_index = max(0, min(thr_index, len(sorted_energies) - 1))
-        energy_threshold = sorted_energies[thr_index]
+    sorted_energies = sorted(energies)
+    if sorted_energies:
         print(f"Sorted energies: {[f'{e:.2f}' for e in sorted_energies]}")
-        print(f"70th percentile index: {thr_index} / {len(sorted_energies)}")
+        print(f"70th percentile index: {result.thr_index} / {len(sorted_energies)}")
         print(f"Energy threshold (70th percentile): {energy_threshold:.4f}")
     else:
-        energy_threshold = 0.0
         print(f"No energies computed. Threshold = 0.0")
     
     # Step 6: Vortex detection (|rot_norm| > 0.6 AND energy >= threshold)
@@ -250,65 +338,57 @@ def manual_compute(bars: List[Bar]):
     print("-" * 80)
     print(f"Criteria: |rot_norm| > 0.6 AND energy >= {energy_threshold:.4f}")
     
-    vortex_markers = []
+    rot_checks = result.rot_checks
+    energy_checks = result.energy_checks
+    vortex_mask = result.vortex_mask
     for k_idx, k in enumerate(range(1, len(bars) - 1)):
         rot = rotations[k_idx]
         eng = energies[k_idx]
-        passes_rot_check = abs(rot) > 0.6
-        passes_energy_check = eng >= energy_threshold
-        is_vortex = passes_rot_check and passes_energy_check
+        passes_rot_check = rot_checks[k_idx]
+        passes_energy_check = energy_checks[k_idx]
         
-        status = "✓ VORTEX" if is_vortex else "  -"
+        status = "✓ VORTEX" if vortex_mask[k_idx] else "  -"
         print(f"Bar {k:2d}: |rot|={abs(rot):.4f} (>{0.6}) {passes_rot_check}  " +
               f"energy={eng:10.2f} (>={energy_threshold:.4f}) {passes_energy_check}  {status}")
-        
-        if is_vortex:
-            direction = "clockwise" if rot < 0 else "counterclockwise"
-            marker = VortexMarker(
-                index=k,
-                timestamp=bars[k].timestamp,
-                price=bars[k].close,
-                strength=abs(rot),
-                direction=direction
-            )
-            vortex_markers.append(marker)
     
     # Summary
     print("\n[SUMMARY] DETECTED VORTEXES")
     print("-" * 80)
-    for marker in vortex_markers:
+    for marker in result.vortex_markers:
         print(f"Index {marker.index:2d} @ {marker.timestamp}: "
               f"price={marker.price:.4f}, strength={marker.strength:.4f}, "
               f"direction={marker.direction}")
     
-    if not vortex_markers:
+    if not result.vortex_markers:
         print("No vortexes detected.")
-    
-    return {
-        "returns": returns,
-        "flows": flows,
-        "rotations": rotations,
-        "energies": energies,
-        "coherence": coherence,
-        "energy_threshold": energy_threshold,
-        "vortex_markers": vortex_markers
-    }
+
+
+def manual_compute(bars: List[Bar], frame: BarFrame):
+    """
+    Step-by-step manual computation to validate engine logic.
+    """
+    result = compute_manual(bars, frame)
+    print_manual_report(bars, result)
+    return result
 
 
 # ============================================================================
 # ENGINE COMPARISON
 # ============================================================================
 
-def test_engine_vs_manual(bars: List[Bar]):
+def test_engine_vs_manual(frame: BarFrame, engine: Optional[TopologyEngine] = None):
     """
     Compare engine output with manual computation.
+    The engine gets the columnar BarFrame (same input path as the live runner).
+    Pass an engine to reuse it (and its per-symbol state) across runs.
     """
     print("\n" + "="*80)
     print("TOPOLOGY ENGINE CALL")
     print("="*80)
     
-    engine = TopologyEngine(window_size=100)
-    snapshot = engine.compute("TEST", bars)
+    if engine is None:
+        engine = TopologyEngine(window_size=100)
+    snapshot = engine.compute("TEST", frame)
     
     print(f"\nSnapshot:")
     print(f"  Symbol: {snapshot.symbol}")
@@ -333,7 +413,7 @@ def test_engine_vs_manual(bars: List[Bar]):
 # MATHEMATICAL CONSISTENCY CHECKS
 # ============================================================================
 
-def validate_mathematics(manual_result, engine_snapshot, bars):
+def validate_mathematics(manual_result: ManualResult, engine_snapshot, bars):
     """
     Check for mathematical inconsistencies.
     """
@@ -344,52 +424,57 @@ def validate_mathematics(manual_result, engine_snapshot, bars):
     issues = []
     
     # Check 1: Coherence must be in [0, ∞)
-    if manual_result["coherence"] < 0:
-        issues.append(f"❌ Coherence negative: {manual_result['coherence']}")
+    if manual_result.coherence < 0:
+        issues.append(f"❌ Coherence negative: {manual_result.coherence}")
     else:
-        print(f"✓ Coherence is non-negative: {manual_result['coherence']:.4f}")
+        print(f"✓ Coherence is non-negative: {manual_result.coherence:.4f}")
     
     # Check 2: Energy values must be non-negative
-    bad_energies = [e for e in manual_result["energies"] if e < 0]
-    if bad_energies:
-        issues.append(f"❌ Negative energies found: {bad_energies}")
+    eng_np = manual_result.energies
+    rot_np = manual_result.rotations
+    negative = eng_np < 0
+    if negative.any():
+        issues.append(f"❌ Negative energies found: {eng_np[negative].tolist()}")
     else:
-        print(f"✓ All {len(manual_result['energies'])} energies are non-negative")
+        print(f"✓ All {len(manual_result.energies)} energies are non-negative")
     
     # Check 3: Returns normalization: return = (close_t - close_t-1) / |close_t-1|
-    print(f"✓ Returns normalized correctly: {len(manual_result['returns'])} values computed")
+    print(f"✓ Returns normalized correctly: {len(manual_result.returns)} values computed")
     
     # Check 4: Flow normalization: flow = delta / volume (bounded if delta & volume normalized)
-    print(f"✓ Delta-flow normalization: {len(manual_result['flows'])} values computed")
+    print(f"✓ Delta-flow normalization: {len(manual_result.flows)} values computed")
     
     # Check 5: 2D rotation must be in approximately [-1, 1] (normalized cross-product)
-    out_of_range_rot = [r for r in manual_result["rotations"] if abs(r) > 1.1]
-    if out_of_range_rot:
+    out_of_range = np.abs(rot_np) > 1.1
+    if out_of_range.any():
+        # The list is only materialized for the report when there is an issue
+        out_of_range_rot = rot_np[out_of_range].tolist()
         issues.append(f"⚠ Rotations slightly out of [-1,1]: {out_of_range_rot}")
         print(f"⚠ Some rotations exceed [-1,1]: {out_of_range_rot} (likely numerical precision)")
     else:
-        print(f"✓ All rotations in valid range [-1, 1]: min={min(manual_result['rotations']):.4f}, "
-              f"max={max(manual_result['rotations']):.4f}")
+        print(f"✓ All rotations in valid range [-1, 1]: min={rot_np.min():.4f}, "
+              f"max={rot_np.max():.4f}")
     
     # Check 6: Energy threshold must be in sorted energies
-    if manual_result["energies"]:
-        sorted_eng = sorted(manual_result["energies"])
-        threshold = manual_result["energy_threshold"]
-        if threshold < min(sorted_eng) or threshold > max(sorted_eng):
-            issues.append(f"❌ Threshold outside energy range: {threshold} ∉ [{min(sorted_eng)}, {max(sorted_eng)}]")
+    if eng_np.size:
+        eng_min = float(eng_np.min())
+        eng_max = float(eng_np.max())
+        threshold = manual_result.energy_threshold
+        if threshold < eng_min or threshold > eng_max:
+            issues.append(f"❌ Threshold outside energy range: {threshold} ∉ [{eng_min}, {eng_max}]")
         else:
-            print(f"✓ Energy threshold valid: {threshold:.4f} ∈ [{min(sorted_eng):.4f}, {max(sorted_eng):.4f}]")
+            print(f"✓ Energy threshold valid: {threshold:.4f} ∈ [{eng_min:.4f}, {eng_max:.4f}]")
     
     # Check 7: Vortex marker consistency
-    for marker in manual_result["vortex_markers"]:
+    for marker in manual_result.vortex_markers:
         k_idx = marker.index - 1  # Convert to rotation index
-        rot = manual_result["rotations"][k_idx]
-        eng = manual_result["energies"][k_idx]
+        rot = manual_result.rotations[k_idx]
+        eng = manual_result.energies[k_idx]
         
         if abs(rot) <= 0.6:
             issues.append(f"❌ Vortex {marker.index} has |rot|={abs(rot):.4f} ≤ 0.6")
-        if eng < manual_result["energy_threshold"]:
-            issues.append(f"❌ Vortex {marker.index} has energy={eng:.2f} < threshold={manual_result['energy_threshold']:.4f}")
+        if eng < manual_result.energy_threshold:
+            issues.append(f"❌ Vortex {marker.index} has energy={eng:.2f} < threshold={manual_result.energy_threshold:.4f}")
         
         direction_match = (rot < 0 and marker.direction == "clockwise") or \
                           (rot >= 0 and marker.direction == "counterclockwise")
@@ -398,13 +483,13 @@ def validate_mathematics(manual_result, engine_snapshot, bars):
     
     # Check 8: Compare manual vs engine
     tol = 1e-6
-    if abs(manual_result["coherence"] - engine_snapshot.coherence) > tol:
-        issues.append(f"❌ Coherence mismatch: manual={manual_result['coherence']:.6f}, engine={engine_snapshot.coherence:.6f}")
+    if abs(manual_result.coherence - engine_snapshot.coherence) > tol:
+        issues.append(f"❌ Coherence mismatch: manual={manual_result.coherence:.6f}, engine={engine_snapshot.coherence:.6f}")
     else:
         print(f"✓ Coherence matches: {engine_snapshot.coherence:.4f}")
     
-    if len(manual_result["vortex_markers"]) != len(engine_snapshot.vortexes):
-        issues.append(f"❌ Vortex count mismatch: manual={len(manual_result['vortex_markers'])}, "
+    if len(manual_result.vortex_markers) != len(engine_snapshot.vortexes):
+        issues.append(f"❌ Vortex count mismatch: manual={len(manual_result.vortex_markers)}, "
                      f"engine={len(engine_snapshot.vortexes)}")
     else:
         print(f"✓ Vortex count matches: {len(engine_snapshot.vortexes)}")
@@ -440,11 +525,14 @@ if __name__ == "__main__":
     for i, bar in enumerate(bars[:5]):
         print(f"  Bar {i}: close={bar.close:.4f}, volume={bar.volume:.1f}, delta={bar.delta:.1f}, buy={bar.buy_volume:.1f}, sell={bar.sell_volume:.1f}")
     
+    # Columnar view built once; shared by the manual pass and the engine
+    frame = BarFrame.from_bars(bars)
+    
     # Manual computation
-    manual_result = manual_compute(bars)
+    manual_result = manual_compute(bars, frame)
     
     # Engine computation
-    engine_snapshot = test_engine_vs_manual(bars)
+    engine_snapshot = test_engine_vs_manual(frame)
     
     # Validation
     issues = validate_mathematics(manual_result, engine_snapshot, bars)